@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Shared helpers for the benchmark scripts.
+# MIT
+
+import os, sys, time, importlib.util
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMPORTER = os.path.join(HERE, os.pardir, "src", "COLMAP_Tracking_Importer_C4D_v1_3.py")
+STUBS = os.path.join(HERE, os.pardir, "tests", "stubs")
+
+def load_importer(allow_stub=False):
+    """
+    Import the Script Manager script as a module. It needs c4d: run under c4dpy, or pass allow_stub to
+    fall back to the tests/stubs stand-in (timings of c4d calls are then the stand-in's, not Cinema 4D's).
+    """
+    try:
+        import c4d  # noqa: F401
+    except ImportError:
+        if not allow_stub: raise
+        sys.path.insert(0, STUBS)
+    spec = importlib.util.spec_from_file_location("colmap_importer", IMPORTER)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+def c4d_backend():
+    """"c4d" under Cinema 4D / c4dpy, "stub" with the tests/stubs stand-in."""
+    import c4d
+    return "stub" if os.path.abspath(getattr(c4d, "__file__", "")).startswith(os.path.abspath(STUBS)) else "c4d"
+
+def timed(fn, *args, **kw):
+    t0 = time.perf_counter()
+    out = fn(*args, **kw)
+    return out, time.perf_counter() - t0
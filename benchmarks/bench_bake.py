@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Benchmark: per-frame bake (colmap_to_c4d_matrix + bake_keys_to_camera: SetMg, params, 7 InsertKey per frame)
+# vs the batched path (compute_camera_poses + bake_poses_to_camera: one pass per curve).
+# Needs the real c4d module for meaningful numbers:
+#   c4dpy benchmarks/bench_bake.py [--frames 20000]
+# MIT
+
+import sys, math, random, argparse
+from _common import load_importer, timed
+
+def synthetic_images(np, n, seed=0):
+    """Packed images of a drone-like orbit with a little jitter."""
+    rnd = random.Random(seed)
+    q, t = [], []
+    for i in range(n):
+        a = 0.002 * i
+        h = 0.5 * a + rnd.uniform(-1e-3, 1e-3)
+        q.append([math.cos(h / 2), 0.0, math.sin(h / 2), 0.0])
+        t.append([30.0 * math.cos(a), 2.0 * math.sin(5 * a), 30.0 * math.sin(a)])
+    return {"image_id": np.arange(1, n + 1), "q": np.array(q), "t": np.array(t),
+            "camera_id": np.ones(n, dtype=np.int64), "name": [f"{i:06d}.jpg" for i in range(n)]}
+
+def main():
+    ap = argparse.ArgumentParser(description="camera bake benchmark")
+    ap.add_argument("--frames", type=int, default=20000)
+    ap.add_argument("--fps", type=int, default=25)
+    args = ap.parse_args()
+
+    imp = load_importer()
+    c4d, np = imp.c4d, imp.np
+    if np is None:
+        sys.exit("NumPy is required for the batched path.")
+    cams = {1: {"model": "PINHOLE", "width": 3840.0, "height": 2160.0, "params": [3000.0, 3000.0, 1920.0, 1080.0]}}
+    imgs = synthetic_images(np, args.frames)
+    sensor, scale, fps = 36.0, 100.0, args.fps
+
+    def legacy():
+        cam = c4d.BaseObject(c4d.Ocamera)
+        keyframes = []
+        for i, (cid, qw, qx, qy, qz, tx, ty, tz) in enumerate(imp.iter_image_poses(imgs)):
+            m = imp.colmap_to_c4d_matrix(qw, qx, qy, qz, tx * scale, ty * scale, tz * scale)
+            keyframes.append((c4d.BaseTime(i, fps), m, imp.build_cam_params(cams[cid], sensor)))
+        imp.bake_keys_to_camera(cam, keyframes, sensor)
+        return cam
+
+    def batched():
+        cam = c4d.BaseObject(c4d.Ocamera)
+        imp.bake_poses_to_camera(cam, imp.compute_camera_poses(imgs, cams, sensor, scale), sensor, fps)
+        return cam
+
+    new_cam, t_new = timed(batched)
+    old_cam, t_old = timed(legacy)
+
+    worst = 0.0
+    for did in (imp._id_pos_x, imp._id_pos_y, imp._id_pos_z, imp._id_rot_h, imp._id_rot_p, imp._id_rot_b, imp._id_focus):
+        a, b = old_cam.FindCTrack(did()).GetCurve(), new_cam.FindCTrack(did()).GetCurve()
+        assert a.GetKeyCount() == b.GetKeyCount() == args.frames
+        for i in range(0, args.frames, max(1, args.frames // 500)):
+            worst = max(worst, abs(a.GetKey(i).GetValue() - b.GetKey(i).GetValue()))
+
+    keys = 7 * args.frames
+    print(f"{'path':34s} {'seconds':>9s} {'keys/s':>12s}")
+    print(f"{'per-frame (bake_keys_to_camera)':34s} {t_old:9.2f} {keys / t_old:12,.0f}")
+    print(f"{'batched (bake_poses_to_camera)':34s} {t_new:9.2f} {keys / t_new:12,.0f}")
+    print(f"speed-up: {t_old / t_new:.1f}x, max key difference: {worst:.3g}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Benchmark: reading a dense fused.ply into packed xyz (+ rgb), memory-mapped reader vs loading the file.
+#   mmap:     read_ply_points (structured view of the mapped vertex block, fields copied out per chunk)
+#   fromfile: np.fromfile of the whole vertex block, then the xyz / rgb columns stacked
+# Each path runs in its own process; memory is the peak RSS growth (tracemalloc peak where the resource
+# module is missing, e.g. Windows). The PLY is generated once into <tmp>/colmap_bench.
+#   python benchmarks/bench_dense_ply.py [--points 10000000] [--rgb]
+# MIT
+
+import os, sys, json, argparse, subprocess, tempfile, tracemalloc
+from _common import load_importer, timed
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+PATHS = ("mmap", "fromfile")
+
+def _peak_rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # bytes on macOS, KiB on Linux
+
+def run_path(name, ply, with_rgb):
+    """Child process: read the PLY through one path; returns seconds, peak bytes, output bytes and a checksum."""
+    imp = load_importer(allow_stub=True)
+    np = imp.np
+
+    def fromfile():
+        n, rec, offset = imp.read_ply_header(ply)
+        verts = np.fromfile(ply, rec, count=n, offset=offset)
+        out = {"xyz": np.column_stack([verts["x"], verts["y"], verts["z"]])}
+        if with_rgb: out["rgb"] = np.column_stack([verts["red"], verts["green"], verts["blue"]])
+        return out
+
+    fn = fromfile if name == "fromfile" else lambda: imp.read_ply_points(ply, with_rgb=with_rgb)
+    if resource is not None:
+        base = _peak_rss()
+        out, seconds = timed(fn)
+        peak = _peak_rss() - base
+    else:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        out, seconds = timed(fn)
+        peak = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+    return {"seconds": seconds, "peak": peak, "output": sum(a.nbytes for a in out.values()),
+            "points": len(out["xyz"]), "checksum": float(out["xyz"][::997].astype(np.float64).sum())}
+
+def main():
+    ap = argparse.ArgumentParser(description="dense PLY reader benchmark")
+    ap.add_argument("--points", type=int, default=10_000_000)
+    ap.add_argument("--rgb", action="store_true", help="also read the colours")
+    ap.add_argument("--models", default=os.path.join(tempfile.gettempdir(), "colmap_bench"), help="synthetic model cache")
+    ap.add_argument("--path", choices=PATHS, help=argparse.SUPPRESS)  # child process mode
+    ap.add_argument("--ply", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.path:
+        json.dump(run_path(args.path, args.ply, args.rgb), sys.stdout)
+        return
+    ply = os.path.join(args.models, f"fused_{args.points}.ply")
+    if not os.path.isfile(ply):
+        import synthetic_model
+        print(f"Generating {ply} ...")
+        synthetic_model.write_fused_ply(ply + ".part", args.points)
+        os.replace(ply + ".part", ply)
+    rows = []
+    for name in PATHS:
+        cmd = [sys.executable, os.path.abspath(__file__), "--path", name, "--ply", ply] + (["--rgb"] if args.rgb else [])
+        done = subprocess.run(cmd, stdout=subprocess.PIPE, cwd=os.path.dirname(os.path.abspath(__file__)))
+        if done.returncode:
+            print(f"{name}: child process failed (exit {done.returncode}; out of memory?)")
+            continue
+        rows.append((name, json.loads(done.stdout)))
+
+    if not rows: sys.exit(1)
+    print(f"{args.points:,} points, file {os.path.getsize(ply) / 1e6:,.0f} MB, output {rows[0][1]['output'] / 1e6:,.0f} MB")
+    print(f"{'path':9s} {'seconds':>9s} {'Mpts/s':>8s} {'peak MB':>9s} {'peak/output':>12s}")
+    for name, r in rows:
+        print(f"{name:9s} {r['seconds']:9.2f} {r['points'] / r['seconds'] / 1e6:8.1f} {r['peak'] / 1e6:9.0f} {r['peak'] / r['output']:12.2f}")
+    if len(rows) == 2:
+        print(f"same points: {rows[0][1]['checksum'] == rows[1][1]['checksum']}")
+
+if __name__ == "__main__":
+    main()
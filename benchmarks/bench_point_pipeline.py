@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Benchmark: point cloud from packed array to point object, v1.3 path vs the fused pipeline.
+#   v1.3:  scaled list of tuples -> apply_B_to_vec per point -> list of c4d.Vector -> SetAllPoints
+#   fused: scale_flip_points (one in-place multiply) -> import_point_cloud (SetPoint per 65,536-point chunk)
+# Each path runs in its own process; memory is the peak RSS growth over the input array (tracemalloc
+# peak where the resource module is missing, e.g. Windows).
+#   c4dpy benchmarks/bench_point_pipeline.py [--points 5000000]
+# Without c4d the tests/stubs stand-in is used; its point object stores packed doubles like the native one.
+# MIT
+
+import os, sys, json, argparse, subprocess, tracemalloc
+from _common import load_importer, c4d_backend, timed
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+PATHS = ("fused", "legacy")
+
+def _peak_rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # bytes on macOS, KiB on Linux
+
+def run_path(name, n, scale):
+    """Child process: build the object through one path; returns seconds, peak bytes and a point sample."""
+    imp = load_importer(allow_stub=True)
+    c4d, np = imp.c4d, imp.np
+    xyz = np.random.default_rng(0).uniform(-50.0, 50.0, (n, 3))
+
+    def legacy():
+        # as in v1.3: do_import's pts_scaled, then import_point_cloud's per-point axis matrix
+        pts_scaled = [(x * scale, y * scale, z * scale) for (x, y, z) in xyz.tolist()]
+        pts_c4d = [imp.apply_B_to_vec(c4d.Vector(x, y, z), imp.B_WORLD) for (x, y, z) in pts_scaled]
+        obj = c4d.PolygonObject(len(pts_c4d), 0)
+        obj.SetAllPoints(pts_c4d)
+        return obj
+
+    def fused():
+        return imp.import_point_cloud(c4d.documents.BaseDocument(), imp.scale_flip_points(xyz, scale))
+
+    fn = fused if name == "fused" else legacy
+    if resource is not None:
+        base = _peak_rss()
+        obj, seconds = timed(fn)
+        peak = _peak_rss() - base
+    else:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        obj, seconds = timed(fn)
+        peak = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+    step = max(1, n // 1000)
+    sample = [(v.x, v.y, v.z) for v in (obj.GetPoint(i) for i in range(0, n, step))]
+    return {"seconds": seconds, "peak": peak, "sample": sample, "backend": c4d_backend()}
+
+def main():
+    ap = argparse.ArgumentParser(description="point pipeline benchmark")
+    ap.add_argument("--points", type=int, default=5_000_000)
+    ap.add_argument("--scale", type=float, default=100.0)
+    ap.add_argument("--skip-legacy", action="store_true", help="only time the fused path")
+    ap.add_argument("--path", choices=PATHS, help=argparse.SUPPRESS)  # child process mode
+    args = ap.parse_args()
+
+    if args.path:
+        json.dump(run_path(args.path, args.points, args.scale), sys.stdout)
+        return
+    rows = []
+    for name in PATHS[:1] if args.skip_legacy else PATHS:
+        cmd = [sys.executable, os.path.abspath(__file__), "--path", name, "--points", str(args.points), "--scale", str(args.scale)]
+        done = subprocess.run(cmd, stdout=subprocess.PIPE, cwd=os.path.dirname(os.path.abspath(__file__)))
+        if done.returncode:
+            print(f"{name}: child process failed (exit {done.returncode}; out of memory?)")
+            continue
+        rows.append((name, json.loads(done.stdout)))
+
+    if not rows: sys.exit(1)
+    print(f"{args.points:,} points, c4d backend: {rows[0][1]['backend']}, input array {args.points * 24 / 1e6:,.0f} MB")
+    print(f"{'path':8s} {'seconds':>9s} {'Mpts/s':>8s} {'peak MB':>9s}")
+    for name, r in rows:
+        print(f"{name:8s} {r['seconds']:9.2f} {args.points / r['seconds'] / 1e6:8.2f} {r['peak'] / 1e6:9.0f}")
+    if len(rows) == 2:
+        (_, new), (_, old) = rows
+        print(f"fused vs legacy: {old['seconds'] / new['seconds']:.1f}x faster, "
+              f"{old['peak'] / max(new['peak'], 1):.1f}x less peak memory, same points: {new['sample'] == old['sample']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Benchmark: parse_points3D_txt (line split -> list of tuples) vs parse_points3D_txt_packed (NumPy blocks).
+# Writes a synthetic points3D.txt (default 10M points) and times both parsers on it.
+# The importer imports c4d at module level, so run it with c4dpy:
+#   c4dpy benchmarks/bench_points3d_txt.py [--points 10000000] [--file /tmp/points3D.txt]
+# MIT
+
+import os, sys, random, argparse, tempfile
+from _common import load_importer, timed
+
+def write_points3D_txt(path, n_points, seed=0):
+    """COLMAP-style points3D.txt: full-precision xyz/error and a 2..12 entry TRACK[] per point."""
+    rnd = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# 3D point list with one line of data per point:\n")
+        f.write("#   POINT3D_ID, X, Y, Z, R, G, B, ERROR, TRACK[] as (IMAGE_ID, POINT2D_IDX)\n")
+        f.write(f"# Number of points: {n_points}, mean track length: 7\n")
+        lines = []
+        for i in range(1, n_points + 1):
+            track = " ".join(f"{rnd.randrange(1, 5000)} {rnd.randrange(20000)}" for _ in range(rnd.randrange(2, 13)))
+            lines.append(f"{i} {rnd.uniform(-50, 50)!r} {rnd.uniform(-50, 50)!r} {rnd.uniform(-50, 50)!r} "
+                         f"{rnd.randrange(256)} {rnd.randrange(256)} {rnd.randrange(256)} {rnd.uniform(0, 2)!r} {track}\n")
+            if len(lines) == 100000:
+                f.writelines(lines); lines = []
+        f.writelines(lines)
+
+def tuples_nbytes(pts):
+    """Approximate footprint of a list of (x, y, z) float tuples."""
+    if not pts: return sys.getsizeof(pts)
+    return sys.getsizeof(pts) + len(pts) * (sys.getsizeof(pts[0]) + 3 * sys.getsizeof(pts[0][0]))
+
+def main():
+    ap = argparse.ArgumentParser(description="points3D.txt parser benchmark")
+    ap.add_argument("--points", type=int, default=10_000_000)
+    ap.add_argument("--file", default=os.path.join(tempfile.gettempdir(), "colmap_bench_points3D.txt"),
+                    help="synthetic file (reused if it already has the requested size)")
+    ap.add_argument("--skip-legacy", action="store_true", help="only time the packed parser")
+    args = ap.parse_args()
+
+    imp = load_importer()
+    if imp.np is None:
+        sys.exit("NumPy is required for parse_points3D_txt_packed.")
+
+    stamp = args.file + ".count"
+    if not (os.path.isfile(args.file) and os.path.isfile(stamp) and open(stamp).read() == str(args.points)):
+        print(f"Writing {args.points:,} points to {args.file} ...")
+        write_points3D_txt(args.file, args.points)
+        with open(stamp, 'w') as f: f.write(str(args.points))
+    size_mb = os.path.getsize(args.file) / 1e6
+    print(f"File: {size_mb:,.0f} MB")
+
+    rows = []
+    packed, t = timed(imp.parse_points3D_txt_packed, args.file)
+    rows.append(("parse_points3D_txt_packed", t, len(packed["xyz"]), packed["xyz"].nbytes))
+    packed32, t = timed(imp.parse_points3D_txt_packed, args.file, dtype=imp.np.float32)
+    rows.append(("  dtype=float32", t, len(packed32["xyz"]), packed32["xyz"].nbytes))
+    full, t = timed(imp.parse_points3D_txt_packed, args.file, with_error=True)
+    rows.append(("  with_rgb+error", t, len(full["xyz"]), sum(a.nbytes for a in full.values())))
+    if not args.skip_legacy:
+        legacy, t = timed(imp.parse_points3D_txt, args.file)
+        rows.append(("parse_points3D_txt (legacy)", t, len(legacy), tuples_nbytes(legacy)))
+        same = imp.np.array_equal(imp.np.asarray(legacy, dtype=imp.np.float64), packed["xyz"])
+        del legacy
+
+    print(f"{'parser':32s} {'seconds':>9s} {'Mpts/s':>8s} {'MB/s':>8s} {'result MB':>10s}")
+    for name, t, n, nbytes in rows:
+        print(f"{name:32s} {t:9.2f} {n / t / 1e6:8.2f} {size_mb / t:8.1f} {nbytes / 1e6:10.1f}")
+    if not args.skip_legacy:
+        print(f"xyz identical to legacy parser: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# Benchmark: undistort / redistort ST-maps at plate resolution for each supported distortion model.
+# Reports seconds per map and the redistort accuracy (re-distorting the map's positions, in pixels,
+# for pixels that land within a plate's size of the plate).
+#   python benchmarks/bench_stmaps.py [--width 4096 --height 2160] [--write OUT_DIR]
+# MIT
+
+import os, argparse
+from _common import load_importer, timed
+
+def cameras(width, height):
+    """One camera per model, focal lengths scaled with the plate width (a ~65 degree lens, a wide fisheye)."""
+    f, cx, cy = 0.73 * width, width / 2.0, height / 2.0
+    return {
+        "SIMPLE_RADIAL":  [f, cx, cy, -0.08],
+        "OPENCV":         [f, f, cx, cy, -0.12, 0.05, 1e-3, -5e-4],
+        "FULL_OPENCV":    [f, f, cx, cy, -0.12, 0.05, 1e-3, -5e-4, 0.01, 0.02, 3e-3, 1e-3],
+        "OPENCV_FISHEYE": [0.54 * width, 0.54 * width, cx, cy, 0.05, -0.01, 2e-3, -3e-4],
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="ST-map benchmark")
+    ap.add_argument("--width", type=int, default=4096)
+    ap.add_argument("--height", type=int, default=2160)
+    ap.add_argument("--write", help="also time writing the maps (EXR) into this folder")
+    args = ap.parse_args()
+    imp = load_importer(allow_stub=True)
+    np, w, h = imp.np, args.width, args.height
+
+    print(f"{w} x {h}")
+    print(f"{'model':15s} {'undistort s':>12s} {'redistort s':>12s} {'max err px':>11s}" + (f" {'write s':>8s}" if args.write else ""))
+    for model, params in cameras(w, h).items():
+        cdef = {"model": model, "width": w, "height": h, "params": params}
+        lens = imp.lens_from_camera(cdef)
+        _, t_und = timed(imp.stmap, lens, w, h, "undistort")
+        red, t_red = timed(imp.stmap, lens, w, h, "redistort")
+        px, py = red[::5, ::5, 0].astype(np.float64) * w, (1.0 - red[::5, ::5, 1].astype(np.float64)) * h
+        bx, by = imp.distort_points((px - lens["cx"]) / lens["fx"], (py - lens["cy"]) / lens["fy"], lens)
+        err = np.maximum(np.abs(bx * lens["fx"] + lens["cx"] - (np.arange(0, w, 5) + 0.5)),
+                         np.abs(by * lens["fy"] + lens["cy"] - (np.arange(0, h, 5) + 0.5)[:, None]))
+        sane = (np.abs(px - w / 2.0) < 1.5 * w) & (np.abs(py - h / 2.0) < 1.5 * h)
+        row = f"{model:15s} {t_und:12.3f} {t_red:12.3f} {err[sane].max():11.5f}"
+        if args.write:
+            for f in os.listdir(args.write) if os.path.isdir(args.write) else []:
+                if f.startswith("stmap_"): os.remove(os.path.join(args.write, f))
+            row += f" {timed(imp.write_stmaps, {1: cdef}, args.write)[1]:8.3f}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Benchmark suite: per-stage throughput of the importer on synthetic models of several sizes, with an
+# optional baseline check that fails (exit 1) when a stage gets slower than the tolerance allows.
+#   python benchmarks/run_benchmarks.py [--sizes small,medium] [--repeat 3] [--json results.json]
+#   python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+#   python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json [--tolerance 0.25]
+# Without Cinema 4D the tests/stubs c4d stand-in is used, so scene stages (bake, point cloud) measure the
+# importer's own Python overhead; baselines are only compared against runs with the same backend.
+# Models are generated once per size into <tmp>/colmap_bench and reused.
+# MIT
+
+import os, sys, json, math, argparse, platform, tempfile
+from _common import load_importer, c4d_backend, timed
+
+SIZES = {  # name: (images, points, POINTS2D per image)
+    "small":  (100, 10000, 1000),
+    "medium": (500, 100000, 4000),
+    "large":  (2000, 1000000, 8000),
+}
+OUTLIER_MAX_POINTS = 200000  # the k-NN stage is skipped above this (tens of seconds per million points)
+MIN_SECONDS = 0.2            # short stages are looped until a measurement takes at least this long
+
+def best_time(fn, repeat):
+    """Best per-call time over 'repeat' measurements, each looping fn for at least MIN_SECONDS."""
+    best = float("inf")
+    for _ in range(repeat):
+        calls, total = 0, 0.0
+        while total < MIN_SECONDS:
+            total += timed(fn)[1]
+            calls += 1
+        best = min(best, total / calls)
+    return best
+
+def model_folder(size, root):
+    """Generate (or reuse) the synthetic model for a size preset; returns its folder."""
+    import synthetic_model
+    n_img, n_pts, n_obs = SIZES[size]
+    folder = os.path.join(root, f"{size}_{n_img}_{n_pts}_{n_obs}")
+    stamp = os.path.join(folder, ".complete")
+    if not os.path.isfile(stamp):
+        print(f"Generating {size} model ({n_img} images, {n_pts:,} points, {n_obs} obs/image) ...")
+        synthetic_model.write_model(folder, n_img, n_pts, n_obs)
+        open(stamp, "w").close()
+    return folder
+
+def stages(imp, folder):
+    """(name, callable, item count, unit) for one model; each callable does the full stage once."""
+    c4d, np = imp.c4d, imp.np
+    path = lambda name: os.path.join(folder, name)
+    cams = imp.parse_cameras_txt(path("cameras.txt"))
+    imgs = imp.read_images_bin(path("images.bin"))
+    pts = imp.read_points3D_bin(path("points3D.bin"))
+    n_img, n_pts = len(imgs["name"]), len(pts["xyz"])
+    sensor, scale, fps = 36.0, 100.0, 25
+    poses = imp.compute_camera_poses(imgs, cams, sensor, scale)
+    legacy_imgs = imp.parse_images_txt(path("images.txt"))
+    scaled = (pts["xyz"] * scale).tolist()
+
+    def pose_legacy():
+        prev, out = None, []
+        for cid, qw, qx, qy, qz, tx, ty, tz in imp.iter_image_poses(legacy_imgs):
+            m = imp.colmap_to_c4d_matrix(qw, qx, qy, qz, tx * scale, ty * scale, tz * scale)
+            hpb, prev = imp._unwrap_hpb(prev, imp.utils.MatrixToHPB(m, c4d.ROTATIONORDER_DEFAULT))
+            out.append((c4d.BaseTime(len(out), fps), m, imp.build_cam_params(cams[cid], sensor)))
+        return out
+    keyframes = pose_legacy()
+
+    yield "parse images.txt (legacy)", lambda: imp.parse_images_txt(path("images.txt")), n_img, "images"
+    yield "parse images.txt (packed)", lambda: imp.parse_images_txt_packed(path("images.txt")), n_img, "images"
+    yield "read images.bin", lambda: imp.read_images_bin(path("images.bin")), n_img, "images"
+    yield "parse points3D.txt (legacy)", lambda: imp.parse_points3D_txt(path("points3D.txt")), n_pts, "points"
+    yield "parse points3D.txt (packed)", lambda: imp.parse_points3D_txt_packed(path("points3D.txt")), n_pts, "points"
+    yield "read points3D.bin", lambda: imp.read_points3D_bin(path("points3D.bin")), n_pts, "points"
+    yield "poses (legacy, per frame)", pose_legacy, n_img, "frames"
+    yield "poses (batched)", lambda: imp.compute_camera_poses(imgs, cams, sensor, scale), n_img, "frames"
+    yield "key reduction", lambda: imp.reduce_camera_keys(poses, 0.1, math.radians(0.05), 0.01), 7 * n_img, "keys"
+    yield "bake (legacy, per frame)", lambda: imp.bake_keys_to_camera(c4d.BaseObject(c4d.Ocamera), keyframes, sensor), 7 * n_img, "keys"
+    yield "bake (batched)", lambda: imp.bake_poses_to_camera(c4d.BaseObject(c4d.Ocamera), poses, sensor, fps), 7 * n_img, "keys"
+    yield "decimate (budget n/4)", lambda: imp.decimate_points(pts, budget=max(1, n_pts // 4)), n_pts, "points"
+    if n_pts <= OUTLIER_MAX_POINTS:
+        yield "outlier removal (k=8)", lambda: imp.statistical_outlier_mask(pts["xyz"], 8, 2.0), n_pts, "points"
+    yield "point cloud object", lambda: imp.import_point_cloud(c4d.documents.BaseDocument(), scaled), n_pts, "points"
+
+def run(imp, sizes, repeat, root):
+    results = {}
+    for size in sizes:
+        folder = model_folder(size, root)
+        print(f"\n== {size}: {SIZES[size][0]} images, {SIZES[size][1]:,} points, {SIZES[size][2]} obs/image ==")
+        print(f"{'stage':30s} {'best s':>9s} {'items/s':>14s}")
+        for name, fn, items, unit in stages(imp, folder):
+            best = best_time(fn, repeat)
+            rate = items / best if best > 0 else float("inf")
+            results[f"{size}/{name}"] = {"seconds": best, "items": items, "unit": unit, "rate": rate}
+            print(f"{name:30s} {best:9.3f} {rate:14,.0f} {unit}/s")
+    return results
+
+def compare(results, baseline, tolerance):
+    """Stages whose throughput fell below (1 - tolerance) of the baseline: [(key, rate, base_rate)]."""
+    slower = []
+    for key, base in baseline.get("results", {}).items():
+        cur = results.get(key)
+        if cur is not None and cur["rate"] < base["rate"] * (1.0 - tolerance):
+            slower.append((key, cur["rate"], base["rate"]))
+    return slower
+
+def main():
+    ap = argparse.ArgumentParser(description="importer benchmark suite")
+    ap.add_argument("--sizes", default="small,medium", help=f"comma-separated presets: {', '.join(SIZES)}")
+    ap.add_argument("--repeat", type=int, default=3, help="measurements per stage; the best is kept")
+    ap.add_argument("--models", default=os.path.join(tempfile.gettempdir(), "colmap_bench"), help="synthetic model cache")
+    ap.add_argument("--json", help="write the results here")
+    ap.add_argument("--save-baseline", help="write the results as a baseline file")
+    ap.add_argument("--baseline", help="compare against this baseline and exit 1 on regressions")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput loss vs. the baseline (0.25 = 25%%)")
+    args = ap.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        sys.exit(f"Unknown size preset(s): {', '.join(unknown)}")
+    imp = load_importer(allow_stub=True)
+    if imp.np is None:
+        sys.exit("NumPy is required for the benchmark suite.")
+
+    report = {"backend": c4d_backend(), "python": platform.python_version(), "numpy": imp.np.__version__,
+              "machine": platform.machine(), "results": run(imp, sizes, max(1, args.repeat), args.models)}
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f: baseline = json.load(f)
+        if baseline.get("backend") != report["backend"]:
+            sys.exit(f"Baseline was recorded with backend '{baseline.get('backend')}', this run uses '{report['backend']}'.")
+        slower = compare(report["results"], baseline, args.tolerance)
+        for key, rate, base in slower:
+            print(f"REGRESSION {key}: {rate:,.0f}/s vs baseline {base:,.0f}/s ({rate / base - 1.0:+.0%})")
+        if slower:
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+# Synthetic COLMAP model writer (cameras / images / points3D, TXT and BIN) for tests and benchmarks.
+# A camera orbits a ground plane with a few boxes on it; each point is seen by a run of consecutive
+# frames around the one facing it, so tracks (points3D) and POINTS2D (images) reference each other
+# consistently and image coordinates are real projections plus noise. Needs NumPy.
+#   python benchmarks/synthetic_model.py OUT_DIR [--images 500] [--points 100000] [--obs 4000] [--format both]
+# MIT
+
+import os, argparse
+import numpy as np
+
+CAMERA_MODELS = {  # name: (BIN model id, params for a 1920x1080 image)
+    "SIMPLE_PINHOLE": (0, [1600.0, 960.0, 540.0]),
+    "PINHOLE":        (1, [1600.0, 1590.0, 960.0, 540.0]),
+    "SIMPLE_RADIAL":  (2, [1600.0, 960.0, 540.0, -0.02]),
+    "OPENCV":         (4, [1600.0, 1590.0, 960.0, 540.0, -0.05, 0.01, 1e-4, -2e-4]),
+}
+WIDTH, HEIGHT = 1920, 1080
+
+def _look_at_quats(centres, target):
+    """World-to-camera rotations (COLMAP: x right, y down, z forward; world up = -Y) as w-first quaternions."""
+    z = target - centres
+    z /= np.linalg.norm(z, axis=1, keepdims=True)
+    x = np.cross(z, [0.0, -1.0, 0.0])
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    y = np.cross(z, x)
+    R = np.stack([x, y, z], axis=1)  # rows = camera axes
+    w = np.sqrt(np.maximum(0.0, 1.0 + R[:, 0, 0] + R[:, 1, 1] + R[:, 2, 2])) / 2.0
+    q = np.stack([w, (R[:, 2, 1] - R[:, 1, 2]), (R[:, 0, 2] - R[:, 2, 0]), (R[:, 1, 0] - R[:, 0, 1])], axis=1)
+    q[:, 1:] /= np.maximum(4.0 * w, 1e-12)[:, None]
+    return q / np.linalg.norm(q, axis=1, keepdims=True), R
+
+def synthesize(n_images=500, n_points=100000, obs_per_image=4000, model="OPENCV", seed=0):
+    """
+    Model as arrays: cams (dict), images (q, t, names, per-image observations) and points (xyz, rgb,
+    error, tracks in CSR form). obs_per_image is the POINTS2D count; about 70% of it is triangulated.
+    """
+    rnd = np.random.default_rng(seed)
+    n_images, n_points = max(2, int(n_images)), max(1, int(n_points))
+
+    # Orbit with a little height wobble and handheld jitter, looking at the scene centre
+    a = np.linspace(0.0, 2.0 * np.pi, n_images, endpoint=False)
+    centres = np.stack([12.0 * np.cos(a), -3.0 + 0.5 * np.sin(3 * a), 12.0 * np.sin(a)], axis=1)
+    centres += rnd.normal(0.0, 0.02, centres.shape)
+    q, R = _look_at_quats(centres, np.array([0.0, -0.5, 0.0]))
+    t = -np.einsum("nij,nj->ni", R, centres)
+
+    # Points: ground plane (y = 0, up is -Y) plus box surfaces, with noise
+    xyz = rnd.uniform(-8.0, 8.0, (n_points, 3))
+    xyz[:, 1] = 0.0
+    on_box = rnd.random(n_points) < 0.4
+    nb = int(on_box.sum())
+    box_c = rnd.uniform(-5.0, 5.0, (6, 3)); box_c[:, 1] = -1.0
+    face = rnd.integers(0, 3, nb)
+    local = rnd.uniform(-1.0, 1.0, (nb, 3))
+    local[np.arange(nb), face] = np.sign(rnd.uniform(-1.0, 1.0, nb))
+    xyz[on_box] = box_c[rnd.integers(0, 6, nb)] + local
+    xyz += rnd.normal(0.0, 0.01, xyz.shape)
+    rgb = np.clip(90 + 60 * np.stack([np.sin(xyz[:, 0]), np.cos(xyz[:, 2]), -xyz[:, 1]], axis=1)
+                  + rnd.normal(0, 20, (n_points, 3)), 0, 255).astype(np.uint8)
+
+    # Tracks: runs of consecutive frames starting near the frame that faces the point
+    tri_per_image = max(2, int(0.7 * obs_per_image))
+    mean_len = float(np.clip(tri_per_image * n_images / n_points, 2.0, n_images))
+    length = np.minimum(2 + rnd.poisson(mean_len - 2.0, n_points), n_images)
+    azimuth = np.mod(np.arctan2(xyz[:, 2], xyz[:, 0]), 2.0 * np.pi)
+    first = (np.round(azimuth / (2.0 * np.pi) * n_images).astype(np.int64) - length // 2) % n_images
+    track_start = np.concatenate([[0], np.cumsum(length)])
+    owner = np.repeat(np.arange(n_points), length)
+    obs_img = (first[owner] + np.arange(len(owner)) - np.repeat(track_start[:-1], length)) % n_images
+
+    # Observations per image: triangulated first (in point order), then untriangulated keypoints
+    order = np.argsort(obs_img, kind="stable")
+    tri_count = np.bincount(obs_img, minlength=n_images)
+    n_kp = np.maximum(tri_count, int(obs_per_image))
+    kp_start = np.concatenate([[0], np.cumsum(n_kp)])
+    slot = np.empty(len(owner), np.int64)  # POINTS2D index of each track entry
+    slot[order] = np.arange(len(order)) - np.repeat(np.concatenate([[0], np.cumsum(tri_count)])[:-1], tri_count)
+    kp_pid = np.full(kp_start[-1], -1, np.int64)
+    kp_pid[kp_start[obs_img] + slot] = owner + 1
+
+    # Image coordinates: projections with pixel noise (clipped into the frame), random for untriangulated
+    fx, cx, cy = CAMERA_MODELS[model][1][0], WIDTH / 2.0, HEIGHT / 2.0
+    kp_img = np.repeat(np.arange(n_images), n_kp)
+    kp_xy = np.stack([rnd.uniform(0, WIDTH, len(kp_pid)), rnd.uniform(0, HEIGHT, len(kp_pid))], axis=1)
+    tri = kp_pid >= 0
+    pc = np.einsum("nij,nj->ni", R[kp_img[tri]], xyz[kp_pid[tri] - 1]) + t[kp_img[tri]]
+    z = np.maximum(pc[:, 2], 1e-3)
+    proj = np.stack([fx * pc[:, 0] / z + cx, fx * pc[:, 1] / z + cy], axis=1) + rnd.normal(0.0, 0.5, (int(tri.sum()), 2))
+    kp_xy[tri] = np.clip(proj, 0.0, [WIDTH - 1.0, HEIGHT - 1.0])
+    error = rnd.gamma(2.0, 0.35, n_points)
+
+    return {
+        "camera": {"id": 1, "model": model, "width": WIDTH, "height": HEIGHT, "params": CAMERA_MODELS[model][1]},
+        "q": q, "t": t, "names": [f"frame_{i + 1:06d}.jpg" for i in range(n_images)],
+        "kp_start": kp_start, "kp_xy": kp_xy, "kp_pid": kp_pid,
+        "xyz": xyz, "rgb": rgb, "error": error,
+        "track_start": track_start, "track_img": obs_img + 1, "track_idx": slot,
+    }
+
+def _write_txt(m, folder):
+    cam = m["camera"]
+    with open(os.path.join(folder, "cameras.txt"), "w") as f:
+        f.write("# Camera list with one line of data per camera:\n#   CAMERA_ID, MODEL, WIDTH, HEIGHT, PARAMS[]\n")
+        f.write(f"# Number of cameras: 1\n{cam['id']} {cam['model']} {cam['width']} {cam['height']} "
+                + " ".join(repr(float(p)) for p in cam["params"]) + "\n")
+    ks = m["kp_start"]
+    with open(os.path.join(folder, "images.txt"), "w") as f:
+        f.write("# Image list with two lines of data per image:\n"
+                "#   IMAGE_ID, QW, QX, QY, QZ, TX, TY, TZ, CAMERA_ID, NAME\n"
+                "#   POINTS2D[] as (X, Y, POINT3D_ID)\n"
+                f"# Number of images: {len(m['names'])}, mean observations per image: {ks[-1] / len(m['names']):.1f}\n")
+        for i, name in enumerate(m["names"]):
+            pose = " ".join(repr(float(v)) for v in np.concatenate([m["q"][i], m["t"][i]]))
+            xy, pid = m["kp_xy"][ks[i]:ks[i + 1]].tolist(), m["kp_pid"][ks[i]:ks[i + 1]].tolist()
+            f.write(f"{i + 1} {pose} {cam['id']} {name}\n")
+            f.write(" ".join(f"{x:.2f} {y:.2f} {p}" for (x, y), p in zip(xy, pid)) + "\n")
+    ts = m["track_start"]
+    with open(os.path.join(folder, "points3D.txt"), "w") as f:
+        f.write("# 3D point list with one line of data per point:\n"
+                "#   POINT3D_ID, X, Y, Z, R, G, B, ERROR, TRACK[] as (IMAGE_ID, POINT2D_IDX)\n"
+                f"# Number of points: {len(m['xyz'])}, mean track length: {ts[-1] / len(m['xyz']):.2f}\n")
+        xyz, rgb, err = m["xyz"].tolist(), m["rgb"].tolist(), m["error"].tolist()
+        pairs = np.stack([m["track_img"], m["track_idx"]], axis=1).astype(str)
+        flat = [" ".join(p) for p in pairs.tolist()]
+        lines = []
+        for i in range(len(xyz)):
+            x, y, z = xyz[i]
+            r, g, b = rgb[i]
+            lines.append(f"{i + 1} {x!r} {y!r} {z!r} {r} {g} {b} {err[i]!r} " + " ".join(flat[ts[i]:ts[i + 1]]) + "\n")
+            if len(lines) == 100000:
+                f.writelines(lines); lines = []
+        f.writelines(lines)
+
+def _variable_records(head, body_bytes, body_len):
+    """Concatenate fixed-size headers (structured array) with per-record variable-size byte bodies."""
+    hsize = head.dtype.itemsize
+    sizes = hsize + body_len
+    start = np.concatenate([[0], np.cumsum(sizes)])
+    out = np.empty(start[-1], np.uint8)
+    out[(start[:-1, None] + np.arange(hsize)).ravel()] = head.view(np.uint8).ravel()
+    body_start = np.repeat(start[:-1] + hsize, body_len) + np.arange(body_len.sum()) - np.repeat(
+        np.concatenate([[0], np.cumsum(body_len)])[:-1], body_len)
+    out[body_start] = body_bytes
+    return out
+
+def _write_bin(m, folder):
+    cam = m["camera"]
+    with open(os.path.join(folder, "cameras.bin"), "wb") as f:
+        f.write(np.array([1], "<u8").tobytes())
+        f.write(np.array([(cam["id"], CAMERA_MODELS[cam["model"]][0], cam["width"], cam["height"])],
+                         [("id", "<i4"), ("model", "<i4"), ("w", "<u8"), ("h", "<u8")]).tobytes())
+        f.write(np.asarray(cam["params"], "<f8").tobytes())
+    ks = m["kp_start"]
+    with open(os.path.join(folder, "images.bin"), "wb") as f:
+        f.write(np.array([len(m["names"])], "<u8").tobytes())
+        kp = np.empty(ks[-1], [("x", "<f8"), ("y", "<f8"), ("id", "<i8")])
+        kp["x"], kp["y"], kp["id"] = m["kp_xy"][:, 0], m["kp_xy"][:, 1], m["kp_pid"]
+        head = np.empty(1, [("id", "<u4"), ("q", "<f8", 4), ("t", "<f8", 3), ("cam", "<u4")])
+        for i, name in enumerate(m["names"]):
+            head["id"], head["q"], head["t"], head["cam"] = i + 1, m["q"][i], m["t"][i], cam["id"]
+            f.write(head.tobytes() + name.encode() + b"\0")
+            f.write(np.array([ks[i + 1] - ks[i]], "<u8").tobytes() + kp[ks[i]:ks[i + 1]].tobytes())
+    n, ts = len(m["xyz"]), m["track_start"]
+    length = np.diff(ts)
+    head = np.empty(n, [("id", "<u8"), ("xyz", "<f8", 3), ("rgb", "u1", 3), ("err", "<f8"), ("len", "<u8")])
+    head["id"], head["xyz"], head["rgb"], head["err"], head["len"] = np.arange(1, n + 1), m["xyz"], m["rgb"], m["error"], length
+    track = np.stack([m["track_img"], m["track_idx"]], axis=1).astype("<i4")
+    with open(os.path.join(folder, "points3D.bin"), "wb") as f:
+        f.write(np.array([n], "<u8").tobytes())
+        f.write(_variable_records(head, track.view(np.uint8).ravel(), 8 * length).tobytes())
+
+def write_model(folder, n_images=500, n_points=100000, obs_per_image=4000, fmt="both", model="OPENCV", seed=0):
+    """Write a synthetic model into folder (fmt: "txt", "bin" or "both"); returns the synthesize() arrays."""
+    os.makedirs(folder, exist_ok=True)
+    m = synthesize(n_images, n_points, obs_per_image, model, seed)
+    if fmt in ("txt", "both"): _write_txt(m, folder)
+    if fmt in ("bin", "both"): _write_bin(m, folder)
+    return m
+
+def write_scene(scene_folder, fmt="both", dense_points=0, **kw):
+    """
+    scene_folder/sparse/0 layout, as produced by COLMAP/GLoMap (plus dense/fused.ply with dense_points);
+    returns the synthesize() arrays.
+    """
+    if dense_points: write_fused_ply(os.path.join(scene_folder, "dense", "fused.ply"), dense_points, kw.get("seed", 0))
+    return write_model(os.path.join(scene_folder, "sparse", "0"), fmt=fmt, **kw)
+
+def write_fused_ply(path, n_points, seed=0, chunk=1 << 20):
+    """
+    Dense cloud as COLMAP's stereo fusion writes it (binary PLY: x y z nx ny nz float, red green blue uchar):
+    ground plane and box surfaces like synthesize(), written in chunks so large counts fit in memory.
+    """
+    rnd = np.random.default_rng(seed)
+    box_c = rnd.uniform(-5.0, 5.0, (6, 3)); box_c[:, 1] = -1.0
+    vertex = np.dtype([("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("nx", "<f4"), ("ny", "<f4"), ("nz", "<f4"),
+                       ("red", "u1"), ("green", "u1"), ("blue", "u1")])
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(("ply\nformat binary_little_endian 1.0\n" f"element vertex {int(n_points)}\n"
+                 + "".join(f"property {'float' if vertex[k].kind == 'f' else 'uchar'} {k}\n" for k in vertex.names)
+                 + "end_header\n").encode())
+        for lo in range(0, int(n_points), chunk):
+            n = min(chunk, int(n_points) - lo)
+            rec = np.zeros(n, vertex)
+            xyz = rnd.uniform(-8.0, 8.0, (n, 3)); xyz[:, 1] = 0.0
+            normal = np.zeros((n, 3)); normal[:, 1] = -1.0
+            on_box = rnd.random(n) < 0.4
+            nb = int(on_box.sum())
+            face, side = rnd.integers(0, 3, nb), np.sign(rnd.uniform(-1.0, 1.0, nb))
+            local = rnd.uniform(-1.0, 1.0, (nb, 3))
+            local[np.arange(nb), face] = side
+            xyz[on_box] = box_c[rnd.integers(0, 6, nb)] + local
+            normal[on_box] = 0.0
+            normal[np.flatnonzero(on_box), face] = side
+            for k, name in enumerate("xyz"):
+                rec[name], rec["n" + name] = xyz[:, k], normal[:, k]
+            for k, name in enumerate(("red", "green", "blue")):
+                rec[name] = np.clip(110 + 60 * np.sin(xyz[:, k] + k) + rnd.normal(0, 15, n), 0, 255)
+            f.write(rec.tobytes())
+
+def main():
+    ap = argparse.ArgumentParser(description="write a synthetic COLMAP model")
+    ap.add_argument("out", help="model folder (cameras/images/points3D files are written here)")
+    ap.add_argument("--images", type=int, default=500)
+    ap.add_argument("--points", type=int, default=100000)
+    ap.add_argument("--obs", type=int, default=4000, help="POINTS2D entries per image")
+    ap.add_argument("--format", choices=("txt", "bin", "both"), default="both")
+    ap.add_argument("--model", choices=sorted(CAMERA_MODELS), default="OPENCV")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    m = write_model(args.out, args.images, args.points, args.obs, args.format, args.model, args.seed)
+    print(f"{len(m['names'])} images, {len(m['xyz'])} points, {m['kp_start'][-1]} observations -> {args.out}")
+
+if __name__ == "__main__":
+    main()
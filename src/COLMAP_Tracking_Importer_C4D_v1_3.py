@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
-# COLMAP/GLoMap (TXT) -> Redshift Camera + Matrix-on-Vertices (no Cloner/TP) in Cinema 4D
-# Version: V1.3.2 (Compact UI only; same functionality as V1.3)
-# - Imports COLMAP TXT from scene/sparse[/model_id].
+# COLMAP/GLoMap (BIN/TXT) -> Redshift Camera + Matrix-on-Vertices (no Cloner/TP) in Cinema 4D
+# Version: V1.4 (unreleased; see CHANGELOG.md)
+# - Imports COLMAP BIN (preferred, memory-mapped) or TXT from scene/sparse[/model_id], one or several models;
+#   optional dense/fused.ply, parse cache and in-place updates of an earlier import.
 # - Builds Redshift Camera with baked PSR+focal keys.
 # - Fixed axes:
 #     * World basis (COLMAP -> C4D): Flip Y
@@ -10,31 +11,175 @@
 # - Duplicates RS Camera to root, adds Constraint Tag (Transform Targets via B-family IDs; PSR fallback).
 # - Sets timeline & preview range; render output resolution and Film Aspect = Custom.
 # - Final concise success message with resolution, duration, and Matrix distribution note.
+# - Batch mode under c4dpy: c4dpy COLMAP_Tracking_Importer_C4D_v1_3.py --batch <scene folders> --out <dir>.
 # MIT
 
-import os, math, c4d
+import os, sys, math, time, glob, mmap, struct, json, hashlib, argparse, tempfile, threading, tracemalloc, c4d
+from contextlib import contextmanager
+from array import array
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 from c4d import gui, utils
 
+try:
+    import numpy as np
+except ImportError:  # Cinema 4D ships without NumPy: binary models are skipped, TXT parsing still works
+    np = None
+
+# ------------------------ Instrumentation ------------------------
+# ImportStats records wall time, item counts and (optionally) the tracemalloc peak of each pipeline stage.
+# A stage is one `with import_stage("name") as st:` block (set st["count"]) or an @instrumented function;
+# both are no-ops unless an ImportStats is active on the current thread (`with stats:`).
+
+_active_stats = threading.local()
+
+class ImportStats(object):
+    """Per-stage records: {"name", "seconds", "count"[, "peak_mb"]}, in completion order."""
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = []
+        self._stack = []
+        self._started_tracing = False
+
+    def __enter__(self):
+        self._outer = getattr(_active_stats, "stats", None)
+        _active_stats.stats = self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc):
+        _active_stats.stats = self._outer
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    @contextmanager
+    def stage(self, name, count=None):
+        rec = {"name": name, "seconds": 0.0, "count": count}
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:  # fold the parent's peak so far into its frame, then measure this stage from here
+            cur, peak = tracemalloc.get_traced_memory()
+            if self._stack: self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            if hasattr(tracemalloc, "reset_peak"): tracemalloc.reset_peak()
+            self._stack.append({"start": cur, "peak": cur})
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["seconds"] = time.perf_counter() - t0
+            if tracing:
+                frame = self._stack.pop()
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                rec["peak_mb"] = (peak - frame["start"]) / 1e6
+                if self._stack: self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            self.stages.append(rec)
+
+    def totals(self):
+        """Stages merged by name (first-seen order): seconds and counts summed, peak maximised."""
+        merged = {}
+        for rec in self.stages:
+            m = merged.setdefault(rec["name"], {"name": rec["name"], "seconds": 0.0, "count": None})
+            m["seconds"] += rec["seconds"]
+            if rec.get("count") is not None: m["count"] = (m["count"] or 0) + rec["count"]
+            if "peak_mb" in rec: m["peak_mb"] = max(m.get("peak_mb", 0.0), rec["peak_mb"])
+        return list(merged.values())
+
+    def breakdown(self, top=5):
+        """Short text for the success dialog: the slowest stages, one per line."""
+        rows = sorted(self.totals(), key=lambda r: -r["seconds"])
+        lines = []
+        for r in rows[:top]:
+            extra = [f"{r['count']:,}"] if r["count"] is not None else []
+            if "peak_mb" in r: extra.append(f"{r['peak_mb']:.0f} MB")
+            lines.append(f"  {r['name']}: {r['seconds']:.2f}s" + (f" ({', '.join(extra)})" if extra else ""))
+        return lines
+
+    def write_json(self, path, **extra):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(dict(extra, trace_memory=self.trace_memory, stages=self.stages, totals=self.totals()), f, indent=2)
+        return path
+
+@contextmanager
+def import_stage(name, count=None):
+    """Record a stage on this thread's active ImportStats (yields a throwaway dict when none is active)."""
+    stats = getattr(_active_stats, "stats", None)
+    if stats is None:
+        yield {"name": name, "count": count}
+        return
+    with stats.stage(name, count) as rec:
+        yield rec
+
+def instrumented(name, count=None):
+    """Decorator form of import_stage; count(result) -> item count for the record."""
+    def wrap(fn):
+        def inner(*args, **kw):
+            with import_stage(name) as rec:
+                result = fn(*args, **kw)
+                if count is not None: rec["count"] = count(result)
+                return result
+        inner.__name__, inner.__doc__, inner.__wrapped__ = fn.__name__, fn.__doc__, fn
+        return inner
+    return wrap
+
 # ------------------------ Filesystem helpers ------------------------
 
-def find_sparse_txt_folder(scene_folder):
+_MODEL_FILES = ("cameras", "images", "points3D")
+
+def _model_format(path):
+    """'bin' or 'txt' if 'path' holds a complete COLMAP model (binary preferred), else None."""
+    for ext in ("bin", "txt"):
+        if ext == "bin" and np is None: continue
+        if all(os.path.isfile(os.path.join(path, f"{name}.{ext}")) for name in _MODEL_FILES):
+            return ext
+    return None
+
+DENSE_MODELS = (os.path.join("dense", "fused.ply"), os.path.join("dense", "*", "fused.ply"), "fused.ply")
+
+def scene_folder_of(model_folder):
+    """The scene folder a sparse model belongs to (scene/sparse or scene/sparse/<model_id>)."""
+    scene = os.path.dirname(os.path.normpath(model_folder))
+    return scene if os.path.basename(os.path.normpath(model_folder)) == "sparse" else os.path.dirname(scene)
+
+def find_dense_model(model_folder):
+    """The fused.ply of the scene a sparse model belongs to (scene/sparse[/model_id]), or None."""
+    scene = scene_folder_of(model_folder)
+    for pattern in DENSE_MODELS:
+        hits = sorted(glob.glob(os.path.join(glob.escape(scene), pattern)))
+        if hits: return hits[0]
+    return None
+
+def _model_sort_key(name):
+    return (0, int(name), "") if name.isdigit() else (1, 0, name)
+
+def find_sparse_models(scene_folder):
+    """Every complete model under scene/sparse: [(model_folder, 'bin'|'txt')], sparse itself or sparse/<id> by id."""
     sparse = os.path.join(scene_folder, "sparse")
     if not os.path.isdir(sparse):
-        return None
-    def has_txt(path):
-        return (os.path.isfile(os.path.join(path, "cameras.txt")) and
-                os.path.isfile(os.path.join(path, "images.txt")) and
-                os.path.isfile(os.path.join(path, "points3D.txt")))
-    if has_txt(sparse):
-        return sparse
+        return []
+    fmt = _model_format(sparse)
+    if fmt:
+        return [(sparse, fmt)]
+    out = []
     try:
-        for name in sorted(os.listdir(sparse)):
+        for name in sorted(os.listdir(sparse), key=_model_sort_key):
             p = os.path.join(sparse, name)
-            if os.path.isdir(p) and has_txt(p):
-                return p
+            if os.path.isdir(p):
+                fmt = _model_format(p)
+                if fmt: out.append((p, fmt))
     except Exception:
         pass
-    return None
+    return out
+
+def find_sparse_model(scene_folder):
+    """Return (model_folder, 'bin'|'txt') of the best sub-model under scene/sparse (scan_sparse_models), or (None, None)."""
+    models = find_sparse_models(scene_folder)
+    if len(models) > 1:
+        ranked = scan_sparse_models(scene_folder, models)
+        if ranked: return ranked[0]["folder"], ranked[0]["fmt"]
+    return models[0] if models else (None, None)
 
 # ------------------------ COLMAP parsers ------------------------
 
@@ -74,18 +219,652 @@ def parse_images_txt(path):
     imgs.sort(key=lambda d: d["image_id"])
     return imgs
 
-def parse_points3D_txt(path):
+def parse_points3D_txt(path, max_error=None, min_track_len=None, progress=None):
     pts = []
     if not os.path.isfile(path): return pts
+    size, done = max(1, os.path.getsize(path)), 0
     with open(path, 'r', encoding='utf-8') as f:
-        for line in f:
+        for i, line in enumerate(f):
+            if progress is not None:
+                done += len(line)
+                if not i & 0xFFFF: progress(done / size)
             s = line.strip()
             if not s or s.startswith('#'): continue
             p = line.split()
             if len(p) < 4: continue
+            if max_error is not None and not (len(p) > 7 and float(p[7]) <= max_error): continue
+            if min_track_len and (len(p) - 8) // 2 < min_track_len: continue
             pts.append((float(p[1]), float(p[2]), float(p[3])))
     return pts
 
+# ------------------------ Vectorized TXT column decoding ------------------------
+# Text files are read in large blocks. For every data line only a fixed window of its first bytes is
+# gathered into a (lines, window) byte matrix, the wanted columns are cut out of it with array ops and
+# converted in one np.fromstring call per block. Whatever follows those columns (e.g. the TRACK[] list
+# of points3D.txt) is never split or decoded.
+
+_TXT_BLOCK      = 1 << 24   # bytes per read
+_TOKEN_MAX_LEN  = 26        # widest column expected in the window (COLMAP writes %.17g)
+
+def _iter_line_blocks(path, block_size=_TXT_BLOCK):
+    """Yield bytes blocks of 'path' that always end on a line boundary."""
+    with open(path, 'rb') as f:
+        rest = b""
+        while True:
+            block = f.read(block_size)
+            if not block:
+                if rest: yield rest + b"\n"
+                return
+            block = rest + block
+            cut = block.rfind(b"\n") + 1
+            rest = block[cut:]
+            if cut: yield block[:cut]
+
+def _decode_head_columns(block, lo, hi, count_tokens=False):
+    """
+    Columns lo..hi of every data line in 'block' -> (lines, hi-lo+1) float64, decoded from a window of each
+    line's first bytes ('#' / blank lines dropped, misfits via split()); count_tokens adds per-line token counts.
+    """
+    window = _TOKEN_MAX_LEN * (hi + 1)
+    nbytes = len(block)
+    b = np.frombuffer(block + b"\n" * window, np.uint8)
+    ends = np.flatnonzero(b[:nbytes] == 10)
+    starts = np.empty_like(ends); starts[:1] = 0; starts[1:] = ends[:-1] + 1
+    first = b[starts]
+    data = (ends > starts) & (first != 35)
+    starts, ends, first = starts[data], ends[data], first[data]
+    n, k = len(starts), hi - lo + 1
+    out = np.empty((n, k))
+    keep = np.ones(n, bool)
+    if count_tokens:
+        word = b[:nbytes] > 32
+        word[1:] &= b[:nbytes - 1] <= 32
+        tok = np.flatnonzero(word)
+        ntok = np.searchsorted(tok, ends) - np.searchsorted(tok, starts)
+
+    # delimiter positions inside each line's window; d[:, j + 1] closes column j (d[:, 0] = -1)
+    M = np.lib.stride_tricks.sliding_window_view(b, window)[starts]
+    row, col = np.divmod(np.flatnonzero(M <= 32), window)
+    count = np.bincount(row, minlength=n)
+    fast = (count > hi) & (first > 32)
+    first_delim = np.cumsum(count) - count
+    rows = np.flatnonzero(fast)
+    if len(rows):
+        d = np.full((len(rows), hi + 2), -1, np.int64)
+        d[:, 1:] = col[first_delim[rows, None] + np.arange(hi + 1)]
+        lens = np.diff(d, axis=1) - 1
+        fast[rows] = (lens > 0).all(1) & (d[:, -1] <= (ends - starts)[rows])
+        d, rows = d[fast[rows]], rows[fast[rows]]
+    if len(rows):
+        # columns lo..hi are contiguous and single-space separated: cut them out, blank the rest
+        head = starts[rows] + d[:, lo] + 1
+        head_len = d[:, -1] - d[:, lo] - 1
+        H = np.lib.stride_tricks.sliding_window_view(b, int(head_len.max()) + 1)[head]
+        H[np.arange(H.shape[1]) >= head_len[:, None]] = 32
+        try:
+            vals = np.fromstring(H.tobytes(), sep=' ')
+        except ValueError:  # e.g. 'nan' somewhere in the block
+            vals = None
+        if vals is not None and vals.size == len(rows) * k:
+            out[rows] = vals.reshape(-1, k)
+        else:
+            fast[rows] = False
+    for i in np.flatnonzero(~fast).tolist():
+        p = block[starts[i]:ends[i]].split()
+        if not p or p[0].startswith(b'#') or len(p) <= hi:
+            keep[i] = False
+            continue
+        out[i] = [float(x) for x in p[lo:hi + 1]]
+    if not keep.all():
+        out = out[keep]
+        if count_tokens: ntok = ntok[keep]
+    return (out, ntok) if count_tokens else out
+
+def _track_images_txt(block, hi):
+    """
+    IMAGE_ID of every TRACK[] entry of the data lines _decode_head_columns keeps (more than hi tokens)
+    -> (track_len per line, image ids (M,) int32), from one np.fromstring over the whole block.
+    """
+    b = np.frombuffer(block, np.uint8)
+    ends = np.flatnonzero(b == 10)
+    starts = np.r_[0, ends[:-1] + 1]
+    comment = (ends > starts) & (b[np.minimum(starts, len(b) - 1)] == 35)
+    if comment.any():  # header lines (first block only): blanked so they hold no tokens
+        b = b.copy()
+        for a, e in zip(starts[comment].tolist(), ends[comment].tolist()): b[a:e] = 32
+    word = b > 32
+    word[1:] &= b[:-1] <= 32
+    tok = np.flatnonzero(word)
+    first = np.searchsorted(tok, starts)
+    ntok = np.searchsorted(tok, ends) - first
+    try:
+        vals = np.fromstring(b.tobytes(), sep=' ')
+    except ValueError:
+        vals = None
+    if vals is None or vals.size != len(tok):
+        vals = np.array([float(t) for t in b.tobytes().split()])
+    data = ntok > hi
+    tl = (ntok[data] - 8) // 2
+    at = np.repeat(first[data] + 8, tl) + 2 * _csr_expand(np.zeros(len(tl), np.int64), tl)
+    return tl, vals[at].astype(np.int32)
+
+def parse_points3D_txt_packed(path, dtype=None, with_rgb=False, with_error=False, with_track_len=False,
+                              max_error=None, min_track_len=None, with_tracks=False, progress=None):
+    """
+    points3D.txt -> packed {"xyz", "rgb", "error", "track_len"[, "track_image" with_tracks]} (NumPy required).
+    TRACK[] lists are only tokenized with_tracks; max_error / min_track_len are applied block by block.
+    """
+    dtype = dtype or np.float64
+    with_track_len = with_track_len or with_tracks
+    need_tl = with_track_len or bool(min_track_len)
+    hi = 7 if (with_error or max_error is not None) else (6 if with_rgb else 3)
+    parts, tls, tracks = [], [], []
+    size, done = (max(1, os.path.getsize(path)), 0) if os.path.isfile(path) else (1, 0)
+    for block in (_iter_line_blocks(path) if os.path.isfile(path) else ()):
+        done += len(block)
+        if progress is not None: progress(done / size)
+        vals, tl = _decode_head_columns(block, 1, hi, True) if need_tl else (_decode_head_columns(block, 1, hi), None)
+        if tl is not None: tl = (tl - 8) // 2
+        keep = _quality_mask(vals[:, 6] if max_error is not None else None, tl, max_error, min_track_len)
+        if with_tracks:
+            images = _track_images_txt(block, hi)[1]
+            tracks.append(images if keep is None else images[np.repeat(keep, tl)])
+        if keep is not None:
+            vals = vals[keep]
+            if tl is not None: tl = tl[keep]
+        parts.append(vals); tls.append(tl)
+    vals = np.concatenate(parts) if parts else np.empty((0, hi))
+    out = {"xyz": np.ascontiguousarray(vals[:, 0:3], dtype=dtype)}
+    if with_rgb or with_error:
+        out["rgb"] = vals[:, 3:6].astype(np.uint8)
+    if with_error:
+        out["error"] = np.ascontiguousarray(vals[:, 6], dtype=dtype)
+    if with_track_len:
+        out["track_len"] = np.concatenate(tls).astype(np.int64) if tls else np.empty(0, np.int64)
+    if with_tracks:
+        out["track_image"] = np.concatenate(tracks) if tracks else np.empty(0, np.int32)
+    return out
+
+# ------------------------ COLMAP binary readers ------------------------
+# The .bin files are memory-mapped; fixed-width record fields are gathered straight into packed
+# NumPy arrays, so no per-record dicts/tuples are built for images or points.
+#   images -> {"image_id": (N,), "q": (N,4) wxyz, "t": (N,3), "camera_id": (N,), "name": [str]}
+#   points -> {"id": (N,), "xyz": (N,3), "rgb": (N,3) uint8, "error": (N,), "track_len": (N,)[, "track_image"]}
+
+# COLMAP camera model id -> (model name, number of params)
+CAMERA_MODELS_BIN = {
+    0: ("SIMPLE_PINHOLE", 3), 1: ("PINHOLE", 4), 2: ("SIMPLE_RADIAL", 4), 3: ("RADIAL", 5),
+    4: ("OPENCV", 8), 5: ("OPENCV_FISHEYE", 8), 6: ("FULL_OPENCV", 12), 7: ("FOV", 5),
+    8: ("SIMPLE_RADIAL_FISHEYE", 4), 9: ("RADIAL_FISHEYE", 5), 10: ("THIN_PRISM_FISHEYE", 12),
+    11: ("RAD_TAN_THIN_PRISM_FISHEYE", 16),
+}
+
+_U64 = struct.Struct('<Q')
+_IMAGE_BIN_DTYPE  = [('id', '<u4'), ('q', '<f8', 4), ('t', '<f8', 3), ('camera_id', '<u4')]  # 64 bytes, then name
+_POINT_BIN_DTYPE  = [('id', '<u8'), ('xyz', '<f8', 3), ('rgb', 'u1', 3), ('error', '<f8'), ('track_len', '<u8')]  # 51 bytes, then track
+_GATHER_CHUNK = 1 << 18
+
+def _map_file(path):
+    """Read-only mmap of 'path' (b'' for an empty file, which mmap cannot map)."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0: return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _gather_records(buf, starts, dtype):
+    """Copy the fixed-width record found at each byte offset in 'starts' into a structured array."""
+    dt = np.dtype(dtype)
+    out = np.empty(len(starts), dt)
+    raw = out.view(np.uint8).reshape(len(starts), dt.itemsize)
+    cols = np.arange(dt.itemsize, dtype=np.int64)
+    for a in range(0, len(starts), _GATHER_CHUNK):
+        s = starts[a:a + _GATHER_CHUNK]
+        raw[a:a + len(s)] = buf[s[:, None] + cols]
+    return out
+
+def _packed_images(ids, q, t, cam_ids, names, points2d):
+    """Packed image poses dict, sorted by image_id. points2d: number of 2D observations per image."""
+    order = np.argsort(ids, kind='stable')
+    return {
+        "image_id": ids[order], "q": q[order], "t": t[order],
+        "camera_id": cam_ids[order], "name": [names[i] for i in order.tolist()], "points2d": points2d[order],
+    }
+
+def read_cameras_bin(path):
+    """cameras.bin -> same dict layout as parse_cameras_txt."""
+    cams = {}
+    if not os.path.isfile(path): return cams
+    mm = _map_file(path)
+    if len(mm) < 8: return cams
+    off = 8
+    for _ in range(_U64.unpack_from(mm, 0)[0]):
+        cid, mid, w, h = struct.unpack_from('<iiQQ', mm, off); off += 24
+        if mid not in CAMERA_MODELS_BIN:
+            raise ValueError(f"Unknown COLMAP camera model id {mid} in {path}")
+        model, n_params = CAMERA_MODELS_BIN[mid]
+        cams[cid] = {
+            "model": model, "width": float(w), "height": float(h),
+            "params": list(struct.unpack_from(f'<{n_params}d', mm, off))
+        }
+        off += 8 * n_params
+    return cams
+
+def read_images_bin(path, progress=None):
+    """images.bin -> packed image poses sorted by image_id. The 2D observations are skipped by offset (only counted)."""
+    ids = np.empty(0, np.int64)
+    out = {"image_id": ids, "q": np.empty((0, 4)), "t": np.empty((0, 3)), "camera_id": ids, "name": [], "points2d": ids}
+    if not os.path.isfile(path): return out
+    mm = _map_file(path)
+    if len(mm) < 8: return out
+    n = _U64.unpack_from(mm, 0)[0]
+    starts, names, n2d = array('q'), [], array('q')
+    off = 8
+    for i in range(n):
+        if progress is not None and not i & 0xFFF: progress(off / len(mm))
+        starts.append(off)
+        end = mm.find(b'\0', off + 64)
+        names.append(mm[off + 64:end].decode('utf-8'))
+        n2d.append(_U64.unpack_from(mm, end + 1)[0])
+        off = end + 9 + 24 * n2d[-1]  # x, y (f64) + point3D_id (i64)
+    rec = _gather_records(np.frombuffer(mm, np.uint8), np.frombuffer(starts, np.int64), _IMAGE_BIN_DTYPE)
+    return _packed_images(rec['id'].astype(np.int64), rec['q'], rec['t'], rec['camera_id'].astype(np.int64), names,
+                          np.frombuffer(n2d, np.int64).copy())
+
+def _track_images_bin(buf, starts, track_len):
+    """IMAGE_ID of every track entry of the point records at 'starts' -> (sum(track_len),) int32, CSR by record."""
+    out = np.empty(int(track_len.sum()), '<i4')
+    raw, done = out.view(np.uint8).reshape(-1, 4), 0
+    for a in range(0, len(starts), _GATHER_CHUNK):
+        tl = track_len[a:a + _GATHER_CHUNK]
+        at = np.repeat(starts[a:a + _GATHER_CHUNK] + 51, tl) + 8 * _csr_expand(np.zeros(len(tl), np.int64), tl)
+        raw[done:done + len(at)] = buf[at[:, None] + np.arange(4)]
+        done += len(at)
+    return out.astype(np.int32, copy=False)
+
+def read_points3D_bin(path, max_error=None, min_track_len=None, with_tracks=False, progress=None):
+    """
+    points3D.bin -> packed points; tracks are only decoded with_tracks ("track_image", CSR by "track_len").
+    max_error / min_track_len are applied per gathered chunk.
+    """
+    out = {"id": np.empty(0, np.int64), "xyz": np.empty((0, 3)), "rgb": np.empty((0, 3), np.uint8),
+           "error": np.empty(0), "track_len": np.empty(0, np.int64)}
+    if with_tracks: out["track_image"] = np.empty(0, np.int32)
+    if not os.path.isfile(path): return out
+    mm = _map_file(path)
+    if len(mm) < 8: return out
+    n = _U64.unpack_from(mm, 0)[0]
+    starts = array('q'); add = starts.append; unpack = _U64.unpack_from
+    off = 8
+    for i in range(n):
+        if progress is not None and not i & 0xFFFF: progress(0.9 * off / len(mm))
+        add(off)
+        off += 51 + 8 * unpack(mm, off + 43)[0]  # image_id (i32) + point2D_idx (i32) per track entry
+    buf, starts = np.frombuffer(mm, np.uint8), np.frombuffer(starts, np.int64)
+    if max_error is None and not min_track_len:
+        rec = _gather_records(buf, starts, _POINT_BIN_DTYPE)
+    else:
+        parts, kept = [], []
+        for a in range(0, len(starts), _GATHER_CHUNK):
+            r = _gather_records(buf, starts[a:a + _GATHER_CHUNK], _POINT_BIN_DTYPE)
+            keep = _quality_mask(r['error'], r['track_len'], max_error, min_track_len)
+            parts.append(r[keep]); kept.append(starts[a:a + _GATHER_CHUNK][keep])
+        rec = np.concatenate(parts) if parts else np.empty(0, _POINT_BIN_DTYPE)
+        starts = np.concatenate(kept) if kept else starts[:0]
+    out = {
+        "id": rec['id'].astype(np.int64), "xyz": rec['xyz'].copy(), "rgb": rec['rgb'].copy(),
+        "error": rec['error'].copy(), "track_len": rec['track_len'].astype(np.int64),
+    }
+    if with_tracks: out["track_image"] = _track_images_bin(buf, starts, out["track_len"])
+    return out
+
+def parse_images_txt_packed(path, progress=None):
+    """
+    images.txt -> packed image poses (as read_images_bin), sorted by image_id. Memory-mapped; POINTS2D lines
+    are skipped to their newline, their observations counted from the separators.
+    """
+    heads, n2d = [], []
+    if os.path.isfile(path):
+        mm = _map_file(path)
+        size, pos = len(mm), 0
+        while pos < size:
+            end = mm.find(b'\n', pos)
+            if end < 0: end = size
+            s = mm[pos:end].strip()
+            pos = end + 1
+            if not s or s.startswith(b'#'): continue
+            p = s.split()
+            if len(p) < 10: continue
+            heads.append(p)
+            if progress is not None and not len(heads) & 0xFFF: progress(pos / size)
+            end = mm.find(b'\n', pos)  # skip 2D points line: X Y POINT3D_ID per observation
+            if end < 0: end = size
+            line = mm[pos:end].strip()
+            n2d.append((line.count(b' ') + 1) // 3 if line else 0)
+            pos = end + 1
+    n = len(heads)
+    pose = np.array([p[1:8] for p in heads], dtype=np.float64).reshape(n, 7)
+    ids = np.array([int(p[0]) for p in heads], dtype=np.int64)
+    cam_ids = np.array([int(p[8]) for p in heads], dtype=np.int64)
+    names = [b" ".join(p[9:]).decode('utf-8') for p in heads]
+    return _packed_images(ids, pose[:, 0:4], pose[:, 4:7], cam_ids, names, np.array(n2d, dtype=np.int64))
+
+# ------------------------ Dense model (PLY) ------------------------
+# COLMAP's stereo fusion writes dense/fused.ply: one binary little-endian vertex record per point
+# (x, y, z, nx, ny, nz, red, green, blue). The vertex block is memory-mapped as a structured array and
+# only the wanted fields are copied out chunk by chunk, so the peak stays close to the output arrays.
+
+_PLY_TYPES = {"char": "i1", "uchar": "u1", "short": "<i2", "ushort": "<u2", "int": "<i4", "uint": "<u4",
+              "float": "<f4", "double": "<f8", "int8": "i1", "uint8": "u1", "int16": "<i2", "uint16": "<u2",
+              "int32": "<i4", "uint32": "<u4", "float32": "<f4", "float64": "<f8"}
+
+def read_ply_header(path):
+    """
+    fused.ply header -> (vertex count, structured dtype of one vertex record, byte offset of the vertex
+    data). Binary little-endian only; elements stored before the vertices must have fixed-size records.
+    """
+    name = os.path.basename(path)
+    fmt, elements = None, []  # [(element, count, [(property, dtype) | None for list properties])]
+    with open(path, "rb") as f:
+        if f.readline().strip() != b"ply": raise ValueError(f"{name} is not a PLY file.")
+        while True:
+            line = f.readline()
+            if not line: raise ValueError(f"{name}: truncated PLY header.")
+            tok = line.split()
+            if not tok: continue
+            if tok[0] == b"format": fmt = tok[1].decode()
+            elif tok[0] == b"element": elements.append((tok[1].decode(), int(tok[2]), []))
+            elif tok[0] == b"property" and elements:
+                if tok[1] == b"list": elements[-1][2].append(None)
+                elif tok[1].decode() in _PLY_TYPES: elements[-1][2].append((tok[2].decode(), _PLY_TYPES[tok[1].decode()]))
+                else: raise ValueError(f"{name}: unknown PLY property type {tok[1].decode()}.")
+            elif tok[0] == b"end_header": break
+        offset = f.tell()
+    if fmt != "binary_little_endian":
+        raise ValueError(f"{name}: only binary little-endian PLY is supported (found {fmt}).")
+    for element, count, props in elements:
+        if element == "vertex":
+            if None in props: raise ValueError(f"{name}: list properties in the vertex element are not supported.")
+            return count, np.dtype(props), offset
+        if not count: continue
+        if None in props: raise ValueError(f"{name}: variable-size '{element}' records before the vertices.")
+        offset += count * np.dtype(props).itemsize
+    raise ValueError(f"{name} has no vertex element.")
+
+def _release_pages(mm, end):
+    """Drop the mapped pages before byte 'end' from the resident set (they stay in the OS file cache)."""
+    end -= end % mmap.PAGESIZE
+    if end > 0 and hasattr(mm, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+        try: mm.madvise(mmap.MADV_DONTNEED, 0, end)
+        except (OSError, ValueError): pass
+
+def _ply_colour(col):
+    """A PLY colour channel as uint8 (uchar as is, ushort scaled down, float 0..1 scaled up)."""
+    if col.dtype == np.uint8: return col
+    if col.dtype.kind == "f": return np.clip(np.rint(col * 255.0), 0, 255).astype(np.uint8)
+    return (col >> (8 * (col.dtype.itemsize - 1))).astype(np.uint8)
+
+def read_ply_points(path, with_rgb=False, progress=None):
+    """
+    fused.ply -> packed points {"xyz": (N,3) in the file's float type[, "rgb": (N,3) uint8]}.
+    Normals and any other vertex fields are skipped without being read into memory.
+    """
+    n, rec, offset = read_ply_header(path)
+    if not {"x", "y", "z"} <= set(rec.names): raise ValueError(f"{os.path.basename(path)}: vertices have no x/y/z.")
+    if os.path.getsize(path) < offset + n * rec.itemsize: raise ValueError(f"{os.path.basename(path)}: truncated vertex data.")
+    mm = _map_file(path)
+    verts = np.frombuffer(mm, rec, count=n, offset=offset) if n else np.empty(0, rec)
+    xyz_type = np.result_type(rec["x"], rec["y"], rec["z"], np.float32)
+    out = {"xyz": np.empty((n, 3), xyz_type)}
+    rgb = with_rgb and {"red", "green", "blue"} <= set(rec.names)
+    if rgb: out["rgb"] = np.empty((n, 3), np.uint8)
+    for lo in range(0, n, _GATHER_CHUNK):
+        chunk = verts[lo:lo + _GATHER_CHUNK]
+        for k, field in enumerate("xyz"): out["xyz"][lo:lo + len(chunk), k] = chunk[field]
+        if rgb:
+            for k, field in enumerate(("red", "green", "blue")): out["rgb"][lo:lo + len(chunk), k] = _ply_colour(chunk[field])
+        _release_pages(mm, offset + (lo + len(chunk)) * rec.itemsize)
+        if progress is not None: progress(lo / n)
+    return out
+
+# ------------------------ Parsed-model cache ------------------------
+# Parsed models are kept as .npz files in a user cache folder so re-importing the same solve (to tweak
+# sensor width, FPS or scale) skips parsing. An entry is valid while the source files keep their
+# size/mtime. Each folder keeps one entry per variant (no points / points / points with tracks), so
+# toggling those options does not evict the others. Least recently used entries are evicted once the
+# folder grows past CACHE_MAX_BYTES.
+
+CACHE_VERSION   = 3  # 2: TXT points carry rgb, 3: and error
+CACHE_MAX_BYTES = 4 << 30
+
+def cache_dir():
+    """Cache folder: Cinema 4D's prefs folder when available, else the system temp folder."""
+    base = None
+    try: base = c4d.storage.GeGetC4DPath(c4d.C4D_PATH_PREFS)
+    except Exception: pass
+    return os.path.join(base or tempfile.gettempdir(), "colmap_importer_cache")
+
+def _source_signature(folder, fmt, point_filter=None):
+    sig = [CACHE_VERSION, fmt]
+    for name in _MODEL_FILES:
+        path = os.path.join(folder, f"{name}.{fmt}")
+        st = os.stat(path)
+        sig.append([name, st.st_size, st.st_mtime_ns])
+    if point_filter: sig.append(sorted(point_filter.items()))  # other thresholds invalidate the entry
+    return json.dumps(sig)
+
+def _cache_path(folder, fmt, with_points=True, with_tracks=False):
+    variant = int(with_points) + int(with_points and with_tracks)  # 0 no points, 1 points, 2 points + tracks
+    key = hashlib.sha1(f"{os.path.abspath(folder)}|{fmt}|{variant}".encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir(), key + ".npz")
+
+def cache_load(folder, fmt, with_points=True, point_filter=None, with_tracks=False):
+    """(cams, imgs, pts) from the cache, or None on a miss/stale entry."""
+    path = _cache_path(folder, fmt, with_points, with_tracks)
+    if not os.path.isfile(path): return None
+    with np.load(path, allow_pickle=False) as z:
+        if str(z["signature"]) != _source_signature(folder, fmt, point_filter): return None
+        if with_points and not bool(z["has_points"]): return None
+        if with_points and with_tracks and not {"pts_track_image", "pts_error"} <= set(z.files): return None
+        if "img_points2d" not in z.files: return None  # written before the observations were counted
+        cams = {int(k): v for k, v in json.loads(str(z["cameras"])).items()}
+        imgs = {k[4:]: z[k] for k in z.files if k.startswith("img_")}
+        imgs["name"] = imgs["name"].tolist()
+        pts = {k[4:]: z[k] for k in z.files if k.startswith("pts_") and (with_tracks or k != "pts_track_image")} if with_points else None
+    os.utime(path)  # LRU stamp
+    return cams, imgs, pts
+
+def cache_store(folder, fmt, cams, imgs, pts, compress=False, point_filter=None, with_tracks=False):
+    """Write a parsed (packed) model to the cache, then evict old entries."""
+    path = _cache_path(folder, fmt, pts is not None, with_tracks)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    arrays = {
+        "signature": np.array(_source_signature(folder, fmt, point_filter)),
+        "cameras": np.array(json.dumps(cams)),
+        "has_points": np.array(pts is not None),
+    }
+    arrays.update({"img_" + k: np.asarray(v) for k, v in imgs.items()})
+    if pts is not None:
+        arrays.update({"pts_" + k: v for k, v in pts.items()})
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        (np.savez_compressed if compress else np.savez)(f, **arrays)
+    os.replace(tmp, path)
+    cache_evict(keep=path)
+
+def cache_evict(max_bytes=CACHE_MAX_BYTES, keep=None):
+    """Delete least recently used cache entries until the folder fits in max_bytes."""
+    root = cache_dir()
+    try:
+        entries = [os.path.join(root, n) for n in os.listdir(root) if n.endswith(".npz")]
+    except OSError:
+        return
+    entries = sorted((os.stat(p).st_mtime, os.path.getsize(p), p) for p in entries)
+    total = sum(size for _, size, _ in entries)
+    for _, size, p in entries:
+        if total <= max_bytes: break
+        if p == keep: continue
+        try:
+            os.remove(p); total -= size
+        except OSError:
+            pass
+
+# ------------------------ Model loading ------------------------
+
+def _model_readers(folder, fmt, with_points, point_filter=None, with_tracks=False):
+    """[(name, path, reader, kwargs)] for the files of a model, cheapest first. Packed points always carry errors; with_tracks: NumPy readers only."""
+    qual = dict(point_filter or {}, with_tracks=True) if with_tracks else (point_filter or {})
+    join = lambda name: os.path.join(folder, f"{name}.{fmt}")
+    if fmt == "bin":
+        out = [("cameras", join("cameras"), read_cameras_bin, {}), ("images", join("images"), read_images_bin, {})]
+        if with_points: out.append(("points3D", join("points3D"), read_points3D_bin, qual))
+    elif np is not None:
+        out = [("cameras", join("cameras"), parse_cameras_txt, {}), ("images", join("images"), parse_images_txt_packed, {})]
+        if with_points: out.append(("points3D", join("points3D"), parse_points3D_txt_packed, dict(qual, with_rgb=True, with_error=True)))
+    else:
+        out = [("cameras", join("cameras"), parse_cameras_txt, {}), ("images", join("images"), parse_images_txt, {})]
+        if with_points: out.append(("points3D", join("points3D"), parse_points3D_txt, qual))
+    return out
+
+def _read_model_file(reader, path, kw):
+    out = reader(path, **kw)
+    if kw.get("progress"): kw["progress"](1.0)
+    return out
+
+def _parse_sparse_model(folder, fmt, with_points, point_filter=None, report=None, pool=None, with_tracks=False):
+    """
+    Read the model files, one after another or, with a thread 'pool', one task per file.
+    report (ImportProgress) gets one stage per file, weighted by file size, and can cancel the parse.
+    """
+    readers = _model_readers(folder, fmt, with_points, point_filter, with_tracks)
+    calls = {}
+    for name, path, reader, kw in readers:
+        kw = dict(kw)
+        if report is not None and name != "cameras":
+            kw["progress"] = report.stage(name, os.path.getsize(path) if os.path.isfile(path) else 1)
+        calls[name] = (reader, path, kw)
+    if pool is None:
+        out = {name: _read_model_file(reader, path, kw) for name, (reader, path, kw) in calls.items()}
+    else:
+        futures = {name: pool.submit(_read_model_file, reader, path, kw)
+                   for name, (reader, path, kw) in calls.items()}
+        pending = set(futures.values())
+        while pending:
+            _, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            if report is not None and report.cancelled:
+                for f in pending: f.cancel()
+                raise ImportCancelled()
+        out = {name: f.result() for name, f in futures.items()}
+    return out["cameras"], out["images"], out.get("points3D")
+
+def load_sparse_model(folder, fmt, with_points=True, use_cache=False, point_filter=None,
+                      report=None, pool=None, with_tracks=False):
+    """
+    Parse a COLMAP model folder -> (cams, imgs, pts), packed with NumPy; point_filter drops points while parsing,
+    with_tracks adds pts["track_image"], use_cache reads / stores the parse cache (see _parse_sparse_model).
+    """
+    point_filter = {k: v for k, v in (point_filter or {}).items() if v} if with_points else {}
+    use_cache, with_tracks = use_cache and np is not None, with_tracks and with_points and np is not None
+    if use_cache:
+        try:
+            hit = cache_load(folder, fmt, with_points, point_filter=point_filter, with_tracks=with_tracks)
+            if hit: return hit
+        except Exception:
+            pass  # unreadable entry: parse again and overwrite it
+    cams, imgs, pts = _parse_sparse_model(folder, fmt, with_points, point_filter, report, pool, with_tracks)
+    if use_cache and cams and image_count(imgs):
+        try: cache_store(folder, fmt, cams, imgs, pts, point_filter=point_filter, with_tracks=with_tracks)
+        except Exception: pass
+    return cams, imgs, pts
+
+# ------------------------ Sub-model discovery ------------------------
+# Registration splits leave sparse/0, sparse/1, …; the largest is often not 0. Headers are enough to
+# rank them: the counts at the start of the BIN files, the "# Number of …" comments of the TXT files.
+
+_TXT_COUNT = {"images": b"# Number of images:", "points3D": b"# Number of points:"}
+
+def model_id(folder):
+    return os.path.basename(os.path.normpath(folder))
+
+def _txt_count(path, kind):
+    """Record count of images.txt / points3D.txt from its header comment; None when the comment is missing."""
+    with open(path, "rb") as f:
+        head = f.read(4096)
+    at = head.find(_TXT_COUNT[kind])
+    if at < 0: return None
+    digits = head[at + len(_TXT_COUNT[kind]):].split(b",")[0].strip()
+    return int(digits) if digits.isdigit() else None
+
+def _count_text(n):
+    return "?" if n is None else f"{n:,}"
+
+def _bin_count(path):
+    """Record count at the start of a COLMAP .bin file."""
+    with open(path, "rb") as f:
+        return _U64.unpack(f.read(8).ljust(8, b"\0"))[0]
+
+def scan_model_header(folder, fmt):
+    """{"folder", "fmt", "id", "images", "points", "cameras": [camera ids]} without parsing the records."""
+    join = lambda name: os.path.join(folder, f"{name}.{fmt}")
+    if fmt == "bin":
+        count = lambda name: _bin_count(join(name))
+        cams, images, points = read_cameras_bin(join("cameras")), count("images"), count("points3D")
+    else:
+        cams, images, points = parse_cameras_txt(join("cameras")), _txt_count(join("images"), "images"), _txt_count(join("points3D"), "points3D")
+    return {"folder": folder, "fmt": fmt, "id": model_id(folder), "images": images, "points": points, "cameras": sorted(cams)}
+
+def scan_sparse_models(scene_folder, models=None):
+    """
+    Header scan of every sub-model (find_sparse_models), concurrently, ranked by registered images, then
+    points (unknown TXT counts last); each entry gets its "rank". Models whose headers cannot be read are left out.
+    """
+    models = find_sparse_models(scene_folder) if models is None else models
+    if not models: return []
+    with ThreadPoolExecutor(max_workers=min(8, len(models)), thread_name_prefix="COLMAP scan") as pool:
+        futures = [pool.submit(scan_model_header, folder, fmt) for folder, fmt in models]
+    found = []
+    for f in futures:
+        try: found.append(f.result())
+        except (OSError, ValueError, struct.error): pass
+    known = lambda n: -1 if n is None else n
+    found.sort(key=lambda m: (-known(m["images"]), -known(m["points"]), _model_sort_key(m["id"])))
+    for rank, m in enumerate(found): m["rank"] = rank
+    return found
+
+def select_models(scene_folder, which="best"):
+    """[(folder, fmt)] of the sub-models to import: "best", "all", or comma-separated model ids ("0,2")."""
+    ranked = scan_sparse_models(scene_folder)
+    if which == "all": picked = ranked
+    elif which in (None, "", "best"): picked = ranked[:1]
+    else:
+        ids = [i.strip() for i in str(which).split(",")]
+        picked = sorted((m for m in ranked if m["id"] in ids), key=lambda m: m["rank"])
+    return [(m["folder"], m["fmt"]) for m in picked]
+
+def image_count(imgs):
+    return len(imgs["name"]) if isinstance(imgs, dict) else len(imgs)
+
+def point_count(pts):
+    if not pts: return 0
+    return len(pts["xyz"]) if isinstance(pts, dict) else len(pts)
+
+def first_camera_id(imgs):
+    return int(imgs["camera_id"][0]) if isinstance(imgs, dict) else imgs[0]["camera_id"]
+
+def iter_image_poses(imgs):
+    """Yield (camera_id, qw, qx, qy, qz, tx, ty, tz) from parsed or packed images, in image_id order."""
+    if isinstance(imgs, dict):
+        q, t = imgs["q"].tolist(), imgs["t"].tolist()
+        for cid, (qw, qx, qy, qz), (tx, ty, tz) in zip(imgs["camera_id"].tolist(), q, t):
+            yield cid, qw, qx, qy, qz, tx, ty, tz
+    else:
+        for im in imgs:
+            yield im["camera_id"], im["qw"], im["qx"], im["qy"], im["qz"], im["tx"], im["ty"], im["tz"]
+
+def iter_points_xyz(pts):
+    """(x, y, z) tuples from parsed or packed points."""
+    if isinstance(pts, dict):
+        return map(tuple, pts["xyz"].tolist())
+    return iter(pts)
+
 # ------------------------ Math / transforms ------------------------
 
 def quat_to_matrix(qw,qx,qy,qz):
@@ -186,6 +965,746 @@ def _unwrap_hpb(prev_hpb, curr_hpb):
     unwrapped = c4d.Vector(h, p, b)
     return unwrapped, unwrapped
 
+# ------------------------ Batched pose engine (NumPy) ------------------------
+# Same math as colmap_to_c4d_matrix + MatrixToHPB + _unwrap_hpb, for all frames at once.
+# Rotations are (N,3,3) with the C4D axes v1, v2, v3 as columns.
+
+_FLIP_Y = (1.0, -1.0, 1.0)  # B_WORLD on the left, Flip Y camera fix on the right
+
+def quats_to_matrices(q):
+    """(N,4) wxyz quaternions -> (N,3,3) rotation matrices (quat_to_matrix for every row)."""
+    q = np.asarray(q, dtype=np.float64)
+    n = np.sqrt((q * q).sum(1))
+    q = np.where(n[:, None] == 0.0, (1.0, 0.0, 0.0, 0.0), q / np.where(n == 0.0, 1.0, n)[:, None])
+    w, x, y, z = q.T
+    R = np.empty((len(q), 3, 3))
+    R[:, 0, 0] = 1.0 - 2.0*(y*y + z*z); R[:, 0, 1] = 2.0*(x*y - w*z);       R[:, 0, 2] = 2.0*(x*z + w*y)
+    R[:, 1, 0] = 2.0*(x*y + w*z);       R[:, 1, 1] = 1.0 - 2.0*(x*x + z*z); R[:, 1, 2] = 2.0*(y*z - w*x)
+    R[:, 2, 0] = 2.0*(x*z - w*y);       R[:, 2, 1] = 2.0*(y*z + w*x);       R[:, 2, 2] = 1.0 - 2.0*(x*x + y*y)
+    return R
+
+def colmap_to_c4d_arrays(q, t):
+    """(N,4) quats + (N,3) world->camera translations -> (rot (N,3,3), pos (N,3)) camera-to-world in C4D axes."""
+    R = quats_to_matrices(q)
+    Rt = R.transpose(0, 2, 1)
+    C = -np.einsum('nij,nj->ni', Rt, np.asarray(t, dtype=np.float64))
+    s = np.array(_FLIP_Y)
+    return Rt * s[None, :, None] * s[None, None, :], C * s
+
+def matrices_to_hpb(rot):
+    """(N,3,3) -> (N,3) HPB radians, as utils.MatrixToHPB(m, ROTATIONORDER_DEFAULT)."""
+    v1, v2, v3 = (rot[:, :, k] / np.linalg.norm(rot[:, :, k], axis=1)[:, None] for k in range(3))
+    l = np.hypot(v3[:, 0], v3[:, 2])
+    gimbal = l < 1e-7
+    hpb = np.empty((len(rot), 3))
+    hpb[:, 0] = np.where(gimbal, 0.0, np.arctan2(v3[:, 0], v3[:, 2]))
+    hpb[:, 1] = np.arctan2(-v3[:, 1], l)
+    hpb[:, 2] = np.where(gimbal, np.arctan2(-v2[:, 0], v1[:, 0]), np.arctan2(v1[:, 1], v2[:, 1]))
+    return hpb
+
+def unwrap_angles(a):
+    """Unwrap along axis 0 exactly like chaining _unwrap_angle: every step lands in (-pi, pi]."""
+    a = np.asarray(a, dtype=np.float64)
+    if len(a) < 2: return a.copy()
+    twopi = 2.0 * math.pi
+    d = np.diff(a, axis=0)
+    d -= twopi * np.ceil((d - math.pi) / twopi)
+    cont = np.concatenate([a[:1], a[:1] + np.cumsum(d, axis=0)])
+    return a + twopi * np.rint((cont - a) / twopi)  # whole turns only, no drift from the cumsum
+
+def compute_camera_poses(imgs, cams, sensor_mm, scale):
+    """
+    Packed images -> per-frame "frame", "rot" (N,3,3), "pos", unwrapped "hpb" (radians) and "focal" (mm) arrays.
+    Images whose camera_id is missing from cams are dropped.
+    """
+    focal_by_cam = {cid: build_cam_params(cdef, sensor_mm) for cid, cdef in cams.items()}
+    cam_ids = imgs["camera_id"]
+    known = np.array([cid in focal_by_cam for cid in cam_ids.tolist()], dtype=bool)
+    frame = np.flatnonzero(known)
+    rot, pos = colmap_to_c4d_arrays(imgs["q"][frame], imgs["t"][frame] * scale)
+    return {
+        "frame": frame, "rot": rot, "pos": pos,
+        "hpb": unwrap_angles(matrices_to_hpb(rot)),
+        "focal": np.array([focal_by_cam[cid] for cid in cam_ids[frame].tolist()], dtype=np.float64),
+    }
+
+def pose_to_c4d_matrix(rot, pos):
+    m = c4d.Matrix()
+    m.v1 = c4d.Vector(*rot[:, 0].tolist())
+    m.v2 = c4d.Vector(*rot[:, 1].tolist())
+    m.v3 = c4d.Vector(*rot[:, 2].tolist())
+    m.off = c4d.Vector(*pos.tolist())
+    return m
+
+# ------------------------ Lens distortion / ST-maps (NumPy) ------------------------
+# COLMAP distortion models on normalized image coordinates, evaluated over whole pixel grids. ST-maps
+# follow the Nuke STMap convention (R = s, G = t, t measured from the bottom) at plate resolution:
+#   undistort: per pixel of the undistorted image, where to sample the plate (forward distortion)
+#   redistort: per pixel of the plate, where to sample the undistorted image (iterative inverse)
+# Both images share the camera's fx, fy, cx, cy. Maps are named by a hash of the intrinsics, so cameras
+# with the same lens share them and unchanged intrinsics are never recomputed.
+
+STMAP_VERSION = 1
+STMAP_DIR     = "stmaps"
+STMAP_INDEX   = "stmaps.json"
+_STMAP_ROWS   = 256    # image rows per vectorized block
+_INVERSE_STEPS, _INVERSE_TOL = 20, 1e-10
+_INVERSE_GRID = 8        # initial lattice spacing (pixels) of the inverse map
+_INVERSE_MIN_GRID = 2    # finest lattice when the lens has no inverse past some radius
+_STMAP_MAX_ERROR = 1e-3  # pixels
+
+# model -> (kind, param index of fx, fy (None: = fx), cx, cy, then the distortion coefficients)
+LENS_MODELS = {
+    "SIMPLE_PINHOLE": ("pinhole", 0, None, 1, 2), "PINHOLE": ("pinhole", 0, 1, 2, 3),
+    "SIMPLE_RADIAL": ("radial", 0, None, 1, 2), "RADIAL": ("radial", 0, None, 1, 2),
+    "OPENCV": ("opencv", 0, 1, 2, 3), "FULL_OPENCV": ("full_opencv", 0, 1, 2, 3),
+    "OPENCV_FISHEYE": ("fisheye", 0, 1, 2, 3), "SIMPLE_RADIAL_FISHEYE": ("fisheye", 0, None, 1, 2),
+    "RADIAL_FISHEYE": ("fisheye", 0, None, 1, 2),
+}
+
+def lens_from_camera(cdef):
+    """Camera dict -> {"kind", "fx", "fy", "cx", "cy", "k": coefficients} or None for unsupported models."""
+    spec = LENS_MODELS.get(cdef["model"].upper())
+    if spec is None: return None
+    kind, ifx, ify, icx, icy = spec
+    p = [float(v) for v in cdef["params"]]
+    return {"kind": kind, "fx": p[ifx], "fy": p[ifx if ify is None else ify], "cx": p[icx], "cy": p[icy],
+            "k": p[max(i for i in (ifx, ify, icx, icy) if i is not None) + 1:]}
+
+def lens_hash(cdef):
+    """Intrinsics hash naming a camera's ST-maps (model, resolution and every parameter)."""
+    key = json.dumps([STMAP_VERSION, cdef["model"].upper(), int(cdef["width"]), int(cdef["height"]), [float(v) for v in cdef["params"]]])
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+def _coeffs(k, n):
+    return list(k[:n]) + [0.0] * (n - len(k[:n]))
+
+def _radial_tangential(x, y, lens, jacobian=False):
+    """OPENCV-family distortion of normalized points; with jacobian also d(xd, yd)/d(x, y) as (a, b, c)
+    = (dxd/dx, dxd/dy = dyd/dx, dyd/dy)."""
+    k = lens["k"]
+    k1, k2, p1, p2, k3, k4, k5, k6 = _coeffs(k, 2) + [0.0] * 6 if lens["kind"] == "radial" else _coeffs(k, 8)
+    x2, y2, xy = x * x, y * y, x * y
+    r2 = x2 + y2
+    num = 1.0 + r2 * (k1 + r2 * (k2 + r2 * k3))
+    den = 1.0 + r2 * (k4 + r2 * (k5 + r2 * k6)) if lens["kind"] == "full_opencv" else 1.0
+    radial = num / den
+    xd = x * radial + 2.0 * p1 * xy + p2 * (r2 + 2.0 * x2)
+    yd = y * radial + p1 * (r2 + 2.0 * y2) + 2.0 * p2 * xy
+    if not jacobian: return xd, yd
+    dnum = k1 + r2 * (2.0 * k2 + r2 * 3.0 * k3)
+    dradial = dnum / den if lens["kind"] != "full_opencv" else (dnum - radial * (k4 + r2 * (2.0 * k5 + r2 * 3.0 * k6))) / den
+    a = radial + 2.0 * x2 * dradial + 2.0 * p1 * y + 6.0 * p2 * x
+    b = 2.0 * xy * dradial + 2.0 * p1 * x + 2.0 * p2 * y
+    c = radial + 2.0 * y2 * dradial + 6.0 * p1 * y + 2.0 * p2 * x
+    return xd, yd, a, b, c
+
+def _fisheye_theta(theta, k, derivative=False):
+    k1, k2, k3, k4 = _coeffs(k, 4)
+    t2 = theta * theta
+    td = theta * (1.0 + t2 * (k1 + t2 * (k2 + t2 * (k3 + t2 * k4))))
+    if not derivative: return td
+    return td, 1.0 + t2 * (3.0 * k1 + t2 * (5.0 * k2 + t2 * (7.0 * k3 + t2 * 9.0 * k4)))
+
+def distort_points(x, y, lens):
+    """Normalized undistorted -> distorted coordinates (arrays of any shape)."""
+    if lens["kind"] == "pinhole": return x, y
+    if lens["kind"] == "fisheye":
+        r = np.hypot(x, y)
+        scale = np.divide(_fisheye_theta(np.arctan(r), lens["k"]), r, out=np.ones_like(r), where=r > 1e-12)
+        return x * scale, y * scale
+    return _radial_tangential(x, y, lens)
+
+def undistort_points(xd, yd, lens):
+    """
+    Normalized distorted -> undistorted coordinates by Newton iteration (fisheye: on theta_d(theta); otherwise on
+    the 2x2 system, iterating only the points whose last step was not below _INVERSE_TOL).
+    """
+    if lens["kind"] == "pinhole": return xd, yd
+    if lens["kind"] == "fisheye":
+        rd = np.hypot(xd, yd)
+        theta = rd.copy()
+        for _ in range(_INVERSE_STEPS):
+            f, df = _fisheye_theta(theta, lens["k"], derivative=True)
+            step = (f - rd) / df
+            theta -= step
+            if np.abs(step).max(initial=0.0) < _INVERSE_TOL: break
+        scale = np.divide(np.tan(np.clip(theta, 0.0, 0.5 * np.pi - 1e-6)), rd, out=np.ones_like(rd), where=rd > 1e-12)
+        return xd * scale, yd * scale
+    shape = np.broadcast(xd, yd).shape
+    xd, yd = np.broadcast_to(xd, shape).ravel(), np.broadcast_to(yd, shape).ravel()
+    x, y = np.array(xd, np.float64), np.array(yd, np.float64)
+    live = np.arange(len(x))  # points that can't be inverted no longer keep the converged ones iterating
+    for _ in range(_INVERSE_STEPS):
+        px, py = x[live], y[live]
+        fx, fy, a, b, c = _radial_tangential(px, py, lens, jacobian=True)
+        fx -= xd[live]; fy -= yd[live]
+        det = a * c - b * b
+        sx, sy = (c * fx - b * fy) / det, (a * fy - b * fx) / det
+        x[live], y[live] = px - sx, py - sy
+        live = live[~(np.maximum(np.abs(sx), np.abs(sy)) < _INVERSE_TOL)]
+        if not len(live): break
+    return x.reshape(shape), y.reshape(shape)
+
+def _upsample(coarse, rows, cols, at_rows, at_cols, dtype=np.float32 if np else None):
+    """Bilinear (separable) interpolation of values on the rows x cols lattice at the at_rows x at_cols pixels."""
+    def weights(knots, at):
+        i = np.clip(np.searchsorted(knots, at, side="right") - 1, 0, len(knots) - 2)
+        return i, ((at - knots[i]) / (knots[i + 1] - knots[i])).astype(dtype)
+    (ci, cw), (ri, rw) = weights(cols, at_cols), weights(rows, at_rows)
+    coarse = coarse.astype(dtype, copy=False)
+    across = coarse[:, ci] * (1 - cw)
+    across += coarse[:, ci + 1] * cw
+    out = across[ri] * (1 - rw)[:, None]
+    out += across[ri + 1] * rw[:, None]
+    return out
+
+def _no_inverse(ux, uy, tx, ty, lens):
+    """
+    Undistorted pixels that do not map back onto their plate pixel (tx, ty): Newton did not converge, or converged on
+    a branch past the radius where the distortion stops being monotonic.
+    """
+    fx, fy, cx, cy = lens["fx"], lens["fy"], lens["cx"], lens["cy"]
+    x, y = (ux - cx) / fx, (uy - cy) / fy
+    bx, by = distort_points(x, y, lens)
+    lost = ~(np.maximum(np.abs(bx * fx + cx - tx), np.abs(by * fy + cy - ty)) <= _STMAP_MAX_ERROR)  # NaN included
+    if lens["kind"] != "fisheye":
+        _, _, a, b, c = _radial_tangential(x, y, lens, jacobian=True)
+        lost |= ~(a * c - b * b > 0) | (x * bx + y * by < 0)  # folded back, or mirrored through the centre
+    return lost
+
+def _inverse_pixels(lens, width, height):
+    """
+    Undistorted position of every plate pixel centre: undistort_points on a lattice, bilinearly interpolated and refined
+    until re-distorted samples land within _STMAP_MAX_ERROR px; a lens with no inverse past some radius stops at
+    _INVERSE_MIN_GRID and is solved per pixel wherever the interpolation misses.
+    -> (ux, uy, unresolved): the pixels with no inverse, whose values are extrapolated from their neighbours.
+    """
+    fx, fy, cx, cy = lens["fx"], lens["fy"], lens["cx"], lens["cy"]
+    step = _INVERSE_GRID
+    while True:
+        cols = np.unique(np.r_[np.arange(0, width, step), width - 1])
+        rows = np.unique(np.r_[np.arange(0, height, step), height - 1])
+        ux, uy = np.empty((len(rows), len(cols))), np.empty((len(rows), len(cols)))
+        xd = (cols + 0.5 - cx) / fx
+        for r0 in range(0, len(rows), _STMAP_ROWS):
+            yd = (rows[r0:r0 + _STMAP_ROWS] + 0.5 - cy) / fy
+            gx, gy = undistort_points(*np.meshgrid(xd, yd), lens)
+            ux[r0:r0 + len(yd)], uy[r0:r0 + len(yd)] = gx * fx + cx, gy * fy + cy
+        lost = _no_inverse(ux, uy, cols + 0.5, (rows + 0.5)[:, None], lens).astype(np.float32)
+        if step == 1: return ux.astype(np.float32), uy.astype(np.float32), 0  # only invertible lenses get here
+        sx, sy = np.arange(0, width, 7), np.arange(0, height, 7)
+        px, py = _upsample(ux, rows, cols, sy, sx, np.float64), _upsample(uy, rows, cols, sy, sx, np.float64)
+        bx, by = distort_points((px - cx) / fx, (py - cy) / fy, lens)
+        err = np.maximum(np.abs(bx * fx + cx - (sx + 0.5)), np.abs(by * fy + cy - (sy + 0.5)[:, None]))
+        # pixels that undistort far off the plate (fisheye corners near 90 degrees) or next to a lost knot are left out
+        sane = (np.abs(px - width / 2.0) < 1.5 * width) & (np.abs(py - height / 2.0) < 1.5 * height)
+        sane &= _upsample(lost, rows, cols, sy, sx) == 0
+        missed = sane & (err > _STMAP_MAX_ERROR)
+        if missed.any() and (step > _INVERSE_MIN_GRID or not lost.any()):
+            step //= 2
+            continue
+        at_x, at_y = np.arange(width), np.arange(height)
+        ux, uy = _upsample(ux, rows, cols, at_y, at_x), _upsample(uy, rows, cols, at_y, at_x)
+        if not lost.any(): return ux, uy, 0
+        # every pixel is checked: misses are solved exactly, those with no inverse keep their extrapolated value
+        unresolved = 0
+        for r0 in range(0, height, _STMAP_ROWS):
+            band = slice(r0, min(height, r0 + _STMAP_ROWS))
+            bx, by = ux[band].astype(np.float64), uy[band].astype(np.float64)
+            ry, rx = np.nonzero(_no_inverse(bx, by, at_x + 0.5, (at_y[band] + 0.5)[:, None], lens))
+            ry += r0
+            gx, gy = undistort_points((rx + 0.5 - cx) / fx, (ry + 0.5 - cy) / fy, lens)
+            gx, gy = (gx * fx + cx).astype(np.float32), (gy * fy + cy).astype(np.float32)
+            still = _no_inverse(gx.astype(np.float64), gy.astype(np.float64), rx + 0.5, ry + 0.5, lens)
+            ux[ry[~still], rx[~still]], uy[ry[~still], rx[~still]] = gx[~still], gy[~still]
+            unresolved += int(np.count_nonzero(still))
+        return ux, uy, unresolved
+
+def stmap(lens, width, height, direction="undistort", info=None):
+    """
+    (height, width, 2) float32 ST-map for one lens: pixel centres at +0.5, s = x / width, t = 1 - y / height.
+    info (dict): gets "unresolved", the redistort pixels the lens cannot invert (their values are extrapolated).
+    """
+    out = np.empty((height, width, 2), np.float32)
+    fx, fy, cx, cy = lens["fx"], lens["fy"], lens["cx"], lens["cy"]
+    if direction == "undistort":
+        x = ((np.arange(width) + 0.5 - cx) / fx).astype(np.float32)[None, :]
+        for r0 in range(0, height, _STMAP_ROWS):
+            y = ((np.arange(r0, min(height, r0 + _STMAP_ROWS)) + 0.5 - cy) / fy).astype(np.float32)[:, None]
+            gx, gy = distort_points(x, y, lens)
+            out[r0:r0 + len(y), :, 0] = (gx * fx + cx) / width
+            out[r0:r0 + len(y), :, 1] = 1.0 - (gy * fy + cy) / height
+    else:
+        ux, uy, unresolved = _inverse_pixels(lens, width, height)
+        if info is not None: info["unresolved"] = unresolved
+        np.divide(ux, width, out=out[..., 0])
+        np.subtract(1.0, uy / height, out=out[..., 1])
+    return out
+
+def write_exr(path, channels):
+    """
+    Uncompressed scanline OpenEXR with float32 channels: {name: (H, W) array}. Every scanline block is
+    laid out by one structured array, so writing costs a single pass over the pixels.
+    """
+    names = sorted(channels)  # EXR stores channels in alphabetical order
+    height, width = channels[names[0]].shape
+    attr = lambda name, kind, data: name.encode() + b"\0" + kind.encode() + b"\0" + struct.pack("<i", len(data)) + data
+    chlist = b"".join(n.encode() + b"\0" + struct.pack("<iB3xii", 2, 0, 1, 1) for n in names) + b"\0"
+    box = struct.pack("<4i", 0, 0, width - 1, height - 1)
+    header = (struct.pack("<ii", 20000630, 2) + attr("channels", "chlist", chlist)
+              + attr("compression", "compression", b"\0") + attr("dataWindow", "box2i", box)
+              + attr("displayWindow", "box2i", box) + attr("lineOrder", "lineOrder", b"\0")
+              + attr("pixelAspectRatio", "float", struct.pack("<f", 1.0))
+              + attr("screenWindowCenter", "v2f", struct.pack("<2f", 0.0, 0.0))
+              + attr("screenWindowWidth", "float", struct.pack("<f", 1.0)) + b"\0")
+    lines = np.empty(height, [("y", "<i4"), ("size", "<i4"), ("data", "<f4", (len(names), width))])
+    lines["y"], lines["size"] = np.arange(height), 4 * len(names) * width
+    for c, n in enumerate(names): lines["data"][:, c] = channels[n]
+    offsets = len(header) + 8 * height + np.arange(height, dtype="<u8") * lines.itemsize
+    with open(path + ".part", "wb") as f:  # a complete file or none: existing maps count as cached
+        f.write(header); f.write(offsets.tobytes()); f.write(lines.tobytes())
+    os.replace(path + ".part", path)
+    return path
+
+def write_stmap(path_base, st, fmt="exr"):
+    """ST-map as EXR (R = s, G = t) or raw little-endian float32 (H, W, 2) with a .json shape sidecar."""
+    if fmt == "exr": return write_exr(path_base + ".exr", {"R": st[..., 0], "G": st[..., 1]})
+    with open(path_base + ".json", "w", encoding="utf-8") as f:
+        json.dump({"width": st.shape[1], "height": st.shape[0], "channels": ["s", "t"], "dtype": "float32le"}, f)
+    st.astype("<f4").tofile(path_base + ".raw.part")
+    os.replace(path_base + ".raw.part", path_base + ".raw")
+    return path_base + ".raw"
+
+def write_stmaps(cams, out_dir, fmt="exr", camera_ids=None, progress=None):
+    """
+    Undistort / redistort ST-maps for every supported camera, named by lens_hash and skipped when present.
+    Returns {camera_id: {"hash", "model", "undistort", "redistort", "unresolved" px}}, also written to STMAP_INDEX.
+    progress(fraction) is called before every camera.
+    """
+    index, ext = {}, ".exr" if fmt == "exr" else ".raw"
+    try:
+        with open(os.path.join(out_dir, STMAP_INDEX), encoding="utf-8") as f:
+            known = {e["hash"]: e.get("unresolved", 0) for e in json.load(f).values()}
+    except (OSError, ValueError, KeyError, AttributeError):
+        known = {}
+    ids = sorted(cams if camera_ids is None else camera_ids)
+    for i, cid in enumerate(ids):
+        if progress: progress(i / len(ids))
+        cdef = cams.get(cid)
+        lens = lens_from_camera(cdef) if cdef else None
+        if lens is None or lens["kind"] == "pinhole": continue
+        key, w, h = lens_hash(cdef), int(cdef["width"]), int(cdef["height"])
+        entry = index[cid] = {"hash": key, "model": cdef["model"], "unresolved": known.get(key, 0)}
+        for direction in ("undistort", "redistort"):
+            base = os.path.join(out_dir, f"stmap_{key}_{direction}")
+            entry[direction] = base + ext
+            if not os.path.isfile(base + ext):
+                os.makedirs(out_dir, exist_ok=True)
+                write_stmap(base, stmap(lens, w, h, direction, entry), fmt)
+    if index:
+        with open(os.path.join(out_dir, STMAP_INDEX), "w", encoding="utf-8") as f:
+            json.dump({str(cid): e for cid, e in index.items()}, f, indent=2)
+    return index
+
+# ------------------------ Point quality filtering (NumPy) ------------------------
+# Threshold filters (reprojection error, track length) run inside the parsers, chunk by chunk.
+# Statistical outlier removal needs the whole cloud: each point's mean distance to its k nearest
+# neighbours is found through a uniform grid index (only the 27 surrounding cells are searched, no
+# O(N^2) comparisons) and points far above the cloud's average are dropped.
+
+_KNN_CHUNK = 1 << 12   # query points per pass
+_KNN_PAIRS = 1 << 20   # candidate pairs materialized at once
+_NEIGHBOUR_CELLS = [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)]
+
+def _quality_mask(error, track_len, max_error=None, min_track_len=None):
+    """Boolean keep mask for the given thresholds, or None when no threshold is set."""
+    keep = None
+    if max_error is not None and error is not None:
+        keep = np.asarray(error) <= max_error
+    if min_track_len and track_len is not None:
+        tl = np.asarray(track_len) >= min_track_len
+        keep = tl if keep is None else keep & tl
+    return keep
+
+def _csr_expand(start, count):
+    """Flat indices start[i] .. start[i] + count[i] - 1 for every i, concatenated."""
+    total = int(count.sum())
+    return np.repeat(start - (np.cumsum(count) - count), count) + np.arange(total)
+
+def _grid_knn(xyz, query, query_idx, k, cell):
+    """
+    k smallest distances from each query point to the cloud within its 27 grid cells -> (kth, mean) per query,
+    both inf when fewer than k neighbours were found.
+    """
+    lo = xyz.min(axis=0)
+    ijk = np.floor((xyz - lo) / cell).astype(np.int64) + 1  # +1: neighbour cells stay >= 0
+    dims = ijk.max(axis=0) + 2
+    key = ijk[:, 0] + dims[0] * (ijk[:, 1] + dims[1] * ijk[:, 2])
+    order = np.argsort(key, kind='stable')
+    ukey, ustart, ucount = np.unique(key[order], return_index=True, return_counts=True)
+    xs = xyz[order]
+    qkey = key[query_idx]
+    offsets = np.array([di + dims[0] * (dj + dims[1] * dk) for di, dj, dk in _NEIGHBOUR_CELLS])
+    kth, mean = np.full(len(query), np.inf), np.full(len(query), np.inf)
+    for a in range(0, len(query), _KNN_CHUNK):
+        nk = qkey[a:a + _KNN_CHUNK, None] + offsets
+        pos = np.minimum(np.searchsorted(ukey, nk), len(ukey) - 1)
+        cnt = np.where(ukey[pos] == nk, ucount[pos], 0)
+        tot = cnt.sum(axis=1)
+        by_tot = np.argsort(tot, kind='stable')
+        b = 0
+        while b < len(by_tot):
+            # widest block (padded to its last row) that fits in _KNN_PAIRS
+            w = tot[by_tot[b:]]
+            e = b + max(1, int(np.count_nonzero(np.arange(1, len(w) + 1) * w <= _KNN_PAIRS)))
+            rows, b = by_tot[b:e], e
+            t = tot[rows]
+            if t[-1] <= k: continue  # the query itself is always among its candidates
+            cand = _csr_expand(ustart[pos[rows]].ravel(), cnt[rows].ravel())
+            q = np.repeat(np.arange(len(rows)), t)
+            qg = a + rows
+            d2 = ((xs[cand] - query[qg][q]) ** 2).sum(axis=1)
+            d2[order[cand] == query_idx[qg][q]] = np.inf
+            mat = np.full((len(rows), int(t[-1])), np.inf)
+            mat[q, np.arange(len(cand)) - np.repeat(np.cumsum(t) - t, t)] = d2
+            ok = t > k
+            d = np.sqrt(np.partition(mat[ok], k - 1, axis=1)[:, :k])
+            kth[qg[ok]], mean[qg[ok]] = d.max(axis=1), d.mean(axis=1)
+    return kth, mean
+
+def _brute_knn(xyz, query, query_idx, k):
+    """(kth, mean) k-NN distances of a few query points against the whole cloud."""
+    kth, mean = np.empty(len(query)), np.empty(len(query))
+    step = max(1, _KNN_PAIRS // len(xyz))
+    for a in range(0, len(query), step):
+        d2 = ((xyz[None, :, :] - query[a:a + step, None, :]) ** 2).sum(axis=2)
+        d2[np.arange(len(d2)), query_idx[a:a + step]] = np.inf
+        d = np.sqrt(np.partition(d2, k - 1, axis=1)[:, :k])
+        kth[a:a + step], mean[a:a + step] = d.max(axis=1), d.mean(axis=1)
+    return kth, mean
+
+def knn_mean_distance(xyz, k):
+    """
+    (N,) exact mean distance of every point to its k nearest neighbours, via uniform grids from fine to coarse
+    (the last few points against the whole cloud); inf only when N <= k.
+    """
+    xyz = np.asarray(xyz, dtype=np.float64)
+    n = len(xyz)
+    out = np.full(n, np.inf)
+    if n <= k: return out
+    extent = float(np.ptp(xyz, axis=0).max())
+    cell = voxel_size_for_budget(xyz, max(1, n // 2)) or extent or 1.0
+    todo = np.arange(n)
+    while len(todo):
+        if len(todo) * n <= _KNN_PAIRS * 16:
+            out[todo] = _brute_knn(xyz, xyz[todo], todo, k)[1]
+            break
+        kth, mean = _grid_knn(xyz, xyz[todo], todo, k, cell)
+        done = (kth <= cell) | (cell > extent)
+        out[todo[done]] = mean[done]
+        todo, kth = todo[~done], kth[~done]
+        # a k-th distance found at this level bounds the true one: jump straight to a cell that settles it
+        found = kth[np.isfinite(kth)]
+        cell = max(2.0 * cell, float(np.median(found)) if len(found) else 0.0)
+    return out
+
+def statistical_outlier_mask(xyz, k=8, std_ratio=2.0):
+    """Keep mask: mean k-NN distance within mean + std_ratio * std of the cloud."""
+    d = knn_mean_distance(xyz, k)
+    finite = np.isfinite(d)
+    if not finite.any(): return finite
+    mu, sigma = d[finite].mean(), d[finite].std()
+    return finite & (d <= mu + std_ratio * sigma)
+
+def filter_points(pts, keep):
+    """Packed points restricted to a boolean mask."""
+    return {k: v[keep] for k, v in pts.items()}
+
+# ------------------------ Point decimation (NumPy) ------------------------
+# Voxel grid over the (scaled) cloud: one representative point per occupied cell, either the cell
+# centroid or the original point with the lowest reprojection error (nearest the centroid if the
+# model carries no errors).
+
+DECIMATE_CENTROID, DECIMATE_BEST = "centroid", "best"
+_BUDGET_STEPS = 24
+
+def _voxel_keys(xyz, voxel):
+    """Per-point flat cell keys (N,) int64, or (N,3) cell indices when the grid is too fine for one key."""
+    ijk = np.floor((xyz - xyz.min(axis=0)) / voxel).astype(np.int64)
+    dims = ijk.max(axis=0) + 1
+    if float(dims[0]) * float(dims[1]) * float(dims[2]) >= 2.0 ** 62: return ijk
+    return ijk[:, 0] + dims[0] * (ijk[:, 1] + dims[1] * ijk[:, 2])
+
+def _voxel_cells(xyz, voxel):
+    """Per-point cell ids (N,) compacted to 0..M-1, and M."""
+    key = _voxel_keys(xyz, voxel)
+    cells, inv = np.unique(key, axis=0 if key.ndim > 1 else None, return_inverse=True)
+    return inv.reshape(-1), len(cells)
+
+def _voxel_count(xyz, voxel):
+    """Number of occupied cells (sort only, no inverse)."""
+    key = _voxel_keys(xyz, voxel)
+    if key.ndim > 1: return len(np.unique(key, axis=0))
+    key.sort()
+    return int(np.count_nonzero(key[1:] != key[:-1])) + 1
+
+def voxel_decimate(pts, voxel, mode=DECIMATE_CENTROID):
+    """
+    Packed points -> packed points with one point per voxel of edge 'voxel' (same units as xyz).
+    Centroid mode averages xyz (and rgb/error when present); best mode keeps whole original records.
+    """
+    xyz = pts["xyz"]
+    if voxel <= 0 or len(xyz) < 2: return pts
+    inv, m = _voxel_cells(xyz, voxel)
+    if mode == DECIMATE_CENTROID:
+        cnt = np.bincount(inv, minlength=m).astype(np.float64)
+        out = {"xyz": np.column_stack([np.bincount(inv, xyz[:, k], m) / cnt for k in range(3)]).astype(xyz.dtype)}
+        if "rgb" in pts:
+            out["rgb"] = np.column_stack([np.rint(np.bincount(inv, pts["rgb"][:, k], m) / cnt) for k in range(3)]).astype(np.uint8)
+        if "error" in pts:
+            out["error"] = (np.bincount(inv, pts["error"], m) / cnt).astype(pts["error"].dtype)
+        return out
+    if "error" in pts:
+        score = pts["error"]
+    else:
+        cnt = np.bincount(inv, minlength=m)
+        centroid = np.column_stack([np.bincount(inv, xyz[:, k], m) / cnt for k in range(3)])
+        score = ((xyz - centroid[inv]) ** 2).sum(axis=1)
+    order = np.lexsort((score, inv))
+    first = order[np.flatnonzero(np.r_[True, inv[order][1:] != inv[order][:-1]])]
+    return {k: v[first] for k, v in pts.items()}
+
+def voxel_size_for_budget(xyz, budget):
+    """
+    Smallest voxel edge (within a few percent) whose grid keeps at most 'budget' points: secant steps on
+    log(cells) vs log(voxel), falling back to bisection inside the bracket.
+    """
+    n = len(xyz)
+    if budget <= 0 or n <= budget: return 0.0
+    ext = np.ptp(xyz, axis=0)
+    lo, hi = 0.0, float(ext.max()) * 1.001 or 1.0  # hi: a single cell
+    v = float(np.prod(np.maximum(ext, hi * 1e-6)) / budget) ** (1.0 / 3.0)
+    prev, dim, target = None, 3.0, 0.975 * budget
+    for _ in range(_BUDGET_STEPS):
+        m = _voxel_count(xyz, v)
+        if m > budget: lo = v
+        else:
+            hi = v
+            if m >= 0.95 * budget: break
+        if prev is not None and prev[1] != m and prev[0] != v:
+            dim = min(3.0, max(1.0, -math.log(prev[1] / m) / math.log(prev[0] / v)))
+        prev = (v, m)
+        v = v * (m / target) ** (1.0 / dim)
+        if not lo < v < hi: v = math.sqrt(lo * hi) if lo > 0 else 0.5 * hi
+    return hi
+
+def decimate_points(pts, voxel=0.0, budget=0, mode=DECIMATE_CENTROID, lods=1):
+    """
+    Voxel or budget decimation plus optional LODs: returns a list of packed clouds, finest first;
+    every further level doubles the voxel edge (budget mode: targets a quarter of the points).
+    """
+    if budget: voxel = voxel_size_for_budget(pts["xyz"], budget)
+    levels = [voxel_decimate(pts, voxel, mode)]
+    for k in range(1, max(1, lods)):
+        coarse = voxel * 2 ** k if voxel else voxel_size_for_budget(pts["xyz"], max(1, len(pts["xyz"]) >> (2 * k)))
+        levels.append(voxel_decimate(levels[-1], coarse, mode))
+    return levels
+
+# ------------------------ Point tiling (NumPy) ------------------------
+# Spatial chunks of at most max_points each, so the viewport can cull what is off screen. Every point
+# gets a leaf key (octree path or grid cell), one stable argsort buckets them, and leaves that are still
+# over budget (duplicates at the depth cap, dense grid cells) are cut into consecutive slices.
+
+TILE_OCTREE, TILE_GRID = "octree", "grid"
+_OCTREE_MAX_DEPTH = 16   # 1 + 3*16 key bits
+_PATH_SAMPLES = 4096     # camera positions tested per tile for "near the camera path"
+
+def octree_leaf_keys(xyz, max_points):
+    """Per-point octree leaf key: a leading 1 bit then 3 bits per level; only cells over max_points split."""
+    n = len(xyz)
+    lo = xyz.min(axis=0).astype(np.float64)
+    edge = float((xyz.max(axis=0) - lo).max()) or 1.0
+    key = np.ones(n, np.int64)
+    corner = np.broadcast_to(lo, (n, 3)).copy()
+    active = np.arange(n)
+    for depth in range(_OCTREE_MAX_DEPTH):
+        _, inv, cnt = np.unique(key[active], return_inverse=True, return_counts=True)
+        active = active[cnt[inv.reshape(-1)] > max_points]
+        if not len(active): break
+        half = edge / 2.0 ** (depth + 1)
+        upper = xyz[active] >= corner[active] + half
+        corner[active] += upper * half
+        key[active] = key[active] * 8 + (upper[:, 0] + 2 * upper[:, 1] + 4 * upper[:, 2])
+    return key
+
+def _split_tiles(starts, max_points):
+    """CSR tile starts with every tile longer than max_points cut into max_points slices."""
+    size = np.diff(starts)
+    parts = np.maximum(1, -(-size // max_points))
+    first = np.repeat(np.cumsum(parts) - parts, parts)
+    return np.r_[np.repeat(starts[:-1], parts) + (np.arange(parts.sum()) - first) * max_points, starts[-1]]
+
+def tile_points(xyz, max_points, mode=TILE_OCTREE):
+    """
+    Bucket an (N, 3) cloud into tiles of at most max_points -> (order, starts); tile k is
+    xyz[order[starts[k]:starts[k + 1]]]. Grid mode uses about 2 * N / max_points equal cubes.
+    """
+    n = len(xyz)
+    if n <= max_points: return np.arange(n), np.array([0, n])
+    if mode == TILE_GRID:
+        ext = np.ptp(xyz, axis=0).astype(np.float64)
+        ext = np.maximum(ext, ext.max() * 1e-3 or 1.0)
+        key = _voxel_keys(xyz, float(np.prod(ext) * max_points / (2.0 * n)) ** (1.0 / 3.0))
+    else:
+        key = octree_leaf_keys(xyz, max_points)
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    starts = np.r_[np.flatnonzero(np.r_[True, key[1:] != key[:-1]]), n]
+    return order, _split_tiles(starts, max_points)
+
+def build_tiles(xyz, max_points, mode=TILE_OCTREE, rgb=None):
+    """
+    Tiled cloud for import_point_tiles: {"xyz": points grouped by tile[, "rgb"], "starts", "lo"/"hi":
+    per-tile bounds, "near": tiles the Matrix previs links (all of them until mark_tiles_near_path)}.
+    """
+    order, starts = tile_points(xyz, max_points, mode)
+    xyz = xyz[order]
+    lo, hi = np.minimum.reduceat(xyz, starts[:-1]), np.maximum.reduceat(xyz, starts[:-1])
+    out = {"xyz": xyz, "starts": starts, "lo": lo, "hi": hi, "near": np.ones(len(lo), bool)}
+    if rgb is not None: out["rgb"] = rgb[order]
+    return out
+
+def mark_tiles_near_path(tiles, path, radius):
+    """Restrict tiles["near"] to tiles whose bounds come within 'radius' of any (subsampled) path position."""
+    path = np.asarray(path, np.float64)[::max(1, -(-len(path) // _PATH_SAMPLES))]
+    lo, hi = tiles["lo"], tiles["hi"]
+    near = np.zeros(len(lo), bool)
+    step = max(1, (1 << 22) // max(1, len(path)))  # tile x path pairs per pass
+    for a in range(0, len(lo), step):
+        gap = np.maximum(lo[a:a + step, None] - path, 0.0) + np.maximum(path - hi[a:a + step, None], 0.0)
+        near[a:a + step] = (np.einsum("tpk,tpk->tp", gap, gap) <= radius * radius).any(axis=1)
+    tiles["near"] = near
+    return tiles
+
+# ------------------------ Ground plane (NumPy) ------------------------
+# RANSAC on a bounded random sample: every hypothesis plane is drawn and scored in one batch of matrix
+# products, planes tilted away from the camera path's up or lying above the cameras are rejected, and
+# the winner is refit (SVD) on its inliers. The cost depends on the sample sizes, not on the cloud.
+
+_GROUND_SAMPLE = 50000      # points the winning plane is refit on
+_GROUND_SCORE = 4096        # points every hypothesis is scored on
+_GROUND_HYPOTHESES = 512
+_GROUND_MAX_TILT = math.radians(35.0)  # from the mean camera up
+_GROUND_THRESHOLD = 0.005   # inlier distance as a fraction of the sample's robust diagonal
+
+def camera_up(rot):
+    """Mean camera up (the v2 columns of (N,3,3) rotations), normalised; +Y when it cancels out."""
+    up = np.asarray(rot, np.float64)[:, :, 1].sum(axis=0)
+    norm = np.linalg.norm(up)
+    return up / norm if norm > 1e-9 else np.array([0.0, 1.0, 0.0])
+
+def _plane_refit(xyz, normal, d, threshold, up):
+    """Least-squares plane through the points within threshold of (normal, d), facing up: -> (normal, d, inliers)."""
+    inl = np.abs(xyz @ normal + d) < threshold
+    if inl.sum() < 3: return normal, d, inl
+    q = xyz[inl].mean(axis=0)
+    normal = np.linalg.svd(xyz[inl] - q, full_matrices=False)[2][2]
+    if normal @ up < 0: normal = -normal
+    return normal, -float(normal @ q), inl
+
+def fit_ground_plane(xyz, up, path=None, threshold=None, seed=0):
+    """
+    Dominant plane of an (N,3) cloud within _GROUND_MAX_TILT of 'up' (and below the camera 'path' when given)
+    -> (normal, d, inlier fraction) with normal . p + d = 0, or None when no such plane is found.
+    """
+    rnd = np.random.default_rng(seed)
+    n = len(xyz)
+    if n < 3: return None
+    sample = np.asarray(xyz[rnd.integers(0, n, _GROUND_SAMPLE)] if n > _GROUND_SAMPLE else xyz, np.float64)
+    centre = sample.mean(axis=0)
+    sample = sample - centre  # hypotheses and refit about the centroid: no cancellation in d
+    up = np.asarray(up, np.float64) / np.linalg.norm(up)
+    if threshold is None:
+        lo, hi = np.percentile(sample, (2.0, 98.0), axis=0)
+        threshold = _GROUND_THRESHOLD * float(np.linalg.norm(hi - lo)) or 1e-9
+
+    # Hypotheses: planes through random triples, oriented to the up side
+    tri = sample[rnd.integers(0, len(sample), (_GROUND_HYPOTHESES, 3))]
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    length = np.linalg.norm(normals, axis=1)
+    normals /= np.where(length > 0, length, 1.0)[:, None]
+    normals *= np.where(normals @ up < 0, -1.0, 1.0)[:, None]
+    d = -np.einsum("hk,hk->h", normals, tri[:, 0])
+    valid = (length > 0) & (normals @ up >= math.cos(_GROUND_MAX_TILT))
+    if path is not None and len(path):
+        path = np.asarray(path, np.float64)[::max(1, -(-len(path) // 256))] - centre
+        valid &= np.median(path @ normals.T + d, axis=0) > 0  # cameras on the up side of the floor
+    if not valid.any(): return None
+
+    # Score every hypothesis at once on a slice of the (already random) sample
+    score = sample[:_GROUND_SCORE]
+    votes = (np.abs(score @ normals.T + d) < threshold).sum(axis=0)
+    best = int(np.argmax(np.where(valid, votes, -1)))
+    normal, d = normals[best], float(d[best])
+    for _ in range(2):
+        normal, d, inl = _plane_refit(sample, normal, d, threshold, up)
+    return normal, d - float(normal @ centre), float(inl.mean())
+
+def ground_alignment(normal, d, up=None):
+    """
+    Root matrix putting the plane (normal . p + d = 0) at Y=0, its side facing 'up' (default: the normal's) along +Y,
+    heading kept -> (rot (3,3), off (3,)) for pose_to_c4d_matrix.
+    """
+    a = np.asarray(normal, np.float64) / np.linalg.norm(normal)
+    if up is not None and a @ np.asarray(up, np.float64) < 0: a, d = -a, -d
+    flip = np.diag((1.0, -1.0, -1.0)) if a[1] < 0 else np.eye(3)  # 180 deg about X first: 1 + a[1] stays >= 1
+    a = flip @ a
+    v = np.cross(a, (0.0, 1.0, 0.0))
+    k = np.array([[0.0, -v[2], v[1]], [v[2], 0.0, -v[0]], [-v[1], v[0], 0.0]])
+    rot = (np.eye(3) + k + k @ k / (1.0 + a[1])) @ flip
+    return rot, np.array([0.0, float(d), 0.0])
+
+# ------------------------ Keyframe reduction ------------------------
+# Ramer-Douglas-Peucker on value-vs-frame curves: a dropped key's value is reproduced by linear
+# interpolation between the kept neighbours within the tolerance, on every channel of its group.
+
+KEY_GROUPS = ("pos", "hpb", "focal")
+
+def rdp_indices(x, y, tol):
+    """
+    Sorted indices of the samples of y(x) to keep; y is (N,) or (N,k) and the channels of a row
+    are kept or dropped together. Flat curves (peak-to-peak <= tol) collapse to their first sample.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64).reshape(len(x), -1)
+    n = len(x)
+    if n < 3: return np.arange(n)
+    if (np.ptp(y, axis=0) <= tol).all(): return np.array([0])
+    keep = np.zeros(n, dtype=bool); keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2: continue
+        w = ((x[a+1:b] - x[a]) / (x[b] - x[a]))[:, None]
+        err = np.abs(y[a+1:b] - (y[a] + w * (y[b] - y[a]))).max(axis=1)
+        i = int(err.argmax())
+        if err[i] > tol:
+            m = a + 1 + i
+            keep[m] = True
+            stack.append((a, m)); stack.append((m, b))
+    return np.flatnonzero(keep)
+
+def reduce_camera_keys(poses, pos_tol, angle_tol, focal_tol):
+    """
+    Kept frame indices per channel group of compute_camera_poses() output:
+    {"pos": ..., "hpb": ..., "focal": ...}. pos_tol in scene units, angle_tol in radians, focal_tol in mm.
+    """
+    f = poses["frame"]
+    return {"pos": rdp_indices(f, poses["pos"], pos_tol),
+            "hpb": rdp_indices(f, poses["hpb"], angle_tol),
+            "focal": rdp_indices(f, poses["focal"], focal_tol)}
+
 # ------------------------ Keyframing ------------------------
 
 def _id_pos_x(): return c4d.DescID(c4d.DescLevel(c4d.ID_BASEOBJECT_POSITION, c4d.DTYPE_VECTOR, 0), c4d.DescLevel(c4d.VECTOR_X, c4d.DTYPE_REAL, 0))
@@ -236,48 +1755,361 @@ def bake_keys_to_camera(cam, keyframes, sensor_mm):
         # Key focus
         insert_key(tr_f,  t, fl_mm)
 
+def write_curve_keys(curve, frames, values, fps, interpolation=None):
+    """
+    Fill 'curve' in one pass, keys appended in time order from ascending frames and their values.
+    Returns the number of keys written.
+    """
+    frames = frames.tolist() if hasattr(frames, "tolist") else list(frames)
+    values = values.tolist() if hasattr(values, "tolist") else list(values)
+    interp = c4d.CINTERPOLATION_SPLINE if interpolation is None else interpolation
+    curve.FlushKeys()
+    if not frames: return 0
+    add = curve.AddKey
+    k = add(c4d.BaseTime(frames[0], fps), False)["key"]
+    set_interp = k.GetInterpolation() != interp
+    for i, (f, v) in enumerate(zip(frames, values)):
+        if i: k = add(c4d.BaseTime(f, fps), False)["key"]
+        k.SetValue(curve, v)
+        if set_interp: k.SetInterpolation(curve, interp)
+    return len(frames)
+
+def _pose_channels(poses):
+    """(channel group, DescID factory, values) for the seven keyed curves of a compute_camera_poses result."""
+    return (
+        ("pos", _id_pos_x, poses["pos"][:, 0]), ("pos", _id_pos_y, poses["pos"][:, 1]), ("pos", _id_pos_z, poses["pos"][:, 2]),
+        ("hpb", _id_rot_h, poses["hpb"][:, 0]), ("hpb", _id_rot_p, poses["hpb"][:, 1]), ("hpb", _id_rot_b, poses["hpb"][:, 2]),
+        ("focal", _id_focus, poses["focal"]),
+    )
+
+def bake_poses_to_camera(cam, poses, sensor_mm, fps, keep=None):
+    """
+    Key compute_camera_poses arrays, one write_curve_keys pass per curve; keep (reduce_camera_keys) limits each
+    channel group to its kept indices, keyed linear. Returns the number of keys written.
+    """
+    written = 0
+    for group, did, values in _pose_channels(poses):
+        frames, interp = poses["frame"], None
+        if keep is not None:
+            idx = keep[group]
+            frames, values, interp = frames[idx], values[idx], c4d.CINTERPOLATION_LINEAR
+        written += write_curve_keys(ensure_track(cam, did()).GetCurve(), frames, values, fps, interp)
+    if len(poses["frame"]):  # leave the camera on its last pose, as the per-frame bake did
+        cam.SetMg(pose_to_c4d_matrix(poses["rot"][-1], poses["pos"][-1]))
+        cam[c4d.CAMERAOBJECT_FOCUS] = float(poses["focal"][-1])
+    cam[c4d.CAMERAOBJECT_APERTURE] = sensor_mm
+    return written
+
+# ------------------------ Resolved-ID registry ------------------------
+# IDs found by scanning (the RS camera plugin, the Matrix "Vertex" distribution entry, the constraint
+# tag's parameter family) are kept per Cinema 4D / Redshift build in a small JSON file next to the parse
+# cache. A stored ID is checked with one cheap call and the scan only runs again when that check fails.
+
+RESOLVED_IDS_FILE = "resolved_ids.json"
+
+_resolved_ids = {}   # name -> ID for the running build, loaded from the registry file on first use
+_resolved_for = None # build key _resolved_ids was loaded for
+
+def build_key():
+    """'c4d <version> rs <version>' for the running Cinema 4D and Redshift builds."""
+    c4d_version = rs_version = "?"
+    try: c4d_version = c4d.GetC4DVersion()
+    except Exception: pass
+    try:
+        import redshift
+        rs_version = redshift.GetCoreVersion()
+    except Exception:
+        pass
+    return f"c4d {c4d_version} rs {rs_version}"
+
+def _registry_path():
+    return os.path.join(cache_dir(), RESOLVED_IDS_FILE)
+
+def _read_registry():
+    try:
+        with open(_registry_path(), encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _load_resolved_ids():
+    global _resolved_for
+    key = build_key()
+    if _resolved_for != key:
+        _resolved_ids.clear()
+        _resolved_ids.update(_read_registry().get(key) or {})
+        _resolved_for = key
+
+def _save_resolved_ids():
+    """Write this build's entry back (other builds' entries are kept); best effort."""
+    data = _read_registry()
+    data[_resolved_for] = dict(_resolved_ids)
+    path = _registry_path()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+def resolve_id(name, validate, scan):
+    """
+    ID 'name' for the running build: the stored one while validate(value) accepts it, else scan() (None
+    when nothing is found), which is then stored for later sessions. Exceptions count as failures.
+    """
+    _load_resolved_ids()
+    value = _resolved_ids.get(name)
+    if value is not None:
+        try:
+            if validate(value): return value
+        except Exception:
+            pass
+    try: found = scan()
+    except Exception: found = None
+    if found is None: _resolved_ids.pop(name, None)
+    else: _resolved_ids[name] = found
+    if found != value: _save_resolved_ids()
+    return found
+
+def resolved_ids():
+    """Copy of what has been resolved for the running build (stored entries included)."""
+    _load_resolved_ids()
+    return dict(_resolved_ids)
+
+def _format_resolved(value):
+    if isinstance(value, dict): return " ".join(str(v) for v in value.values())
+    return str(value)
+
 # ------------------------ Redshift camera discovery ------------------------
 
-def find_rs_camera_object_id():
+def _is_rs_camera(plug):
+    name = plug.GetName()
+    if not isinstance(name, str): return False
+    low = name.lower()
+    return "camera" in low and ("redshift" in low or low.startswith("rs"))
+
+def _scan_rs_camera_id():
     try: plist = c4d.plugins.FilterPluginList(c4d.PLUGINTYPE_OBJECT, True)
     except Exception: return None
     if not plist: return None
     for plug in plist:
-        try: name = plug.GetName()
-        except Exception: continue
-        if isinstance(name, str):
-            low = name.lower()
-            if "camera" in low and ("redshift" in low or low.startswith("rs")):
-                try: return plug.GetID()
-                except Exception: pass
+        try:
+            if _is_rs_camera(plug): return plug.GetID()
+        except Exception:
+            continue
     return None
 
+def find_rs_camera_object_id():
+    """RS Camera object plugin ID: the registry's, checked with FindPlugin, else a FilterPluginList scan."""
+    def valid(pid):
+        plug = c4d.plugins.FindPlugin(pid, c4d.PLUGINTYPE_OBJECT)
+        return plug is not None and _is_rs_camera(plug)
+    return resolve_id("rs_camera", valid, _scan_rs_camera_id)
+
 # ------------------------ Sparse import helpers ------------------------
 
-def import_point_cloud(doc, points, parent=None):
-    """Create a PolygonObject with one point per COLMAP 3D point (already scaled/axis-fixed)."""
-    if not points: return None
-    pts_c4d = [apply_B_to_vec(c4d.Vector(x,y,z), B_WORLD) for (x,y,z) in points]
-    obj = c4d.PolygonObject(len(pts_c4d), 0)
-    obj.SetName("GLoMap_SparseCloud")
+_POINT_CHUNK = 1 << 16  # points (or polygons) per block: array -> c4d.Vector / CPolygon conversion, update hashes
+
+def scale_flip_points(xyz, scale):
+    """
+    Scale + COLMAP -> C4D axes (B_WORLD only negates Y) as one in-place multiply over a packed (N, 3)
+    array; read-only inputs (e.g. memory-mapped) are copied once. Returns the transformed array.
+    """
+    if not xyz.flags.writeable: xyz = xyz.copy()
+    xyz *= np.array((scale, -scale, scale), dtype=xyz.dtype)
+    return xyz
+
+@instrumented("point cloud", count=lambda obj: obj.GetPointCount() if obj else 0)
+def import_point_cloud(doc, points, parent=None, name="GLoMap_SparseCloud", rgb=None):
+    """
+    PolygonObject with one point per COLMAP 3D point, already scaled and in C4D axes (a packed (N, 3) array or
+    (x, y, z) sequence); rgb: (N, 3) uint8 point colours.
+    """
+    n = len(points)
+    if not n: return None
+    obj = c4d.PolygonObject(n, 0)
+    obj.SetName(name)
     (obj.InsertUnder(parent) if parent else doc.InsertObject(obj))
-    obj.SetAllPoints(pts_c4d)
+    if np is not None and isinstance(points, np.ndarray):
+        write_points(obj, points)
+    else:
+        V = c4d.Vector
+        obj.SetAllPoints([V(x, y, z) for x, y, z in points])
+    if rgb is not None: add_vertex_colors(obj, rgb)
     obj.Message(c4d.MSG_UPDATE)
     return obj
 
-def add_matrix_on_sparse_vertices(doc, sparse_obj, parent=None):
+def write_points(obj, points, blocks=None):
+    """
+    Write a packed (N, 3) array, or only its _POINT_CHUNK 'blocks', into a point object with at most one chunk
+    of c4d.Vector alive: one SetAllPoints when the object is a single chunk, else SetPoint chunk by chunk.
+    """
+    V, n = c4d.Vector, len(points)
+    if blocks is None and n <= _POINT_CHUNK:
+        obj.SetAllPoints([V(x, y, z) for x, y, z in points.tolist()])
+        return
+    set_point = obj.SetPoint
+    for b in (range((n + _POINT_CHUNK - 1) // _POINT_CHUNK) if blocks is None else blocks):
+        lo, hi = b * _POINT_CHUNK, min(n, (b + 1) * _POINT_CHUNK)
+        for i, (x, y, z) in enumerate(points[lo:hi].tolist(), lo):
+            set_point(i, V(x, y, z))
+
+def write_polygons(obj, polys):
+    """
+    Write a packed (K, 4) index array into a polygon object, one _POINT_CHUNK of c4d.CPolygon built per
+    comprehension (the Python API has no bulk polygon setter, so SetPolygon still runs per polygon).
+    """
+    P, set_polygon = c4d.CPolygon, obj.SetPolygon
+    for lo in range(0, len(polys), _POINT_CHUNK):
+        chunk = [P(a, b, c, d) for a, b, c, d in polys[lo:lo + _POINT_CHUNK].tolist()]
+        for i, poly in enumerate(chunk, lo):
+            set_polygon(i, poly)
+
+@instrumented("vertex colours", count=lambda tag: tag.GetDataCount())
+def add_vertex_colors(obj, rgb):
+    """
+    Per-point Vertex Color tag from (N, 3) uint8 colours. The RGBA float32 values are written in one go
+    into the tag's low-level buffer; builds without it fall back to VertexColorTag.SetColor per point.
+    """
+    tag = c4d.VertexColorTag(obj.GetPointCount())
+    tag.SetName("GLoMap_PointColor")
+    try: tag.SetPerPointMode(True)
+    except AttributeError: pass
+    write_vertex_colors(tag, rgb)
+    obj.InsertTag(tag)
+    return tag
+
+def write_vertex_colors(tag, rgb, start=0):
+    """Write (N, 3) uint8 colours into a per-point Vertex Color tag from point 'start' on."""
+    n = len(rgb)
+    rgba = np.empty((n, 4), np.float32)
+    np.multiply(rgb, np.float32(1.0 / 255.0), out=rgba[:, :3])
+    rgba[:, 3] = 1.0
+    try:
+        dst = np.frombuffer(tag.GetLowlevelDataAddressW(), np.float32)
+        if dst.size != 4 * tag.GetDataCount(): raise ValueError("unexpected vertex colour layout")
+        dst[4 * start:4 * (start + n)] = rgba.reshape(-1)
+    except (AttributeError, TypeError, ValueError):
+        data, set_color, V4 = tag.GetDataAddressW(), c4d.VertexColorTag.SetColor, c4d.Vector4d
+        for i, (r, g, b, a) in enumerate(rgba.tolist(), start):
+            set_color(data, None, None, i, V4(r, g, b, a))
+
+def import_point_tiles(doc, tiles, parent=None, name="GLoMap_SparseCloud"):
+    """
+    A Null 'name' with one point object per tile (build_tiles), each at its bounds' centre.
+    Returns (group, tile objects the Matrix previs should link).
+    """
+    group = c4d.BaseObject(c4d.Onull)
+    group.SetName(name)
+    (group.InsertUnder(parent) if parent else doc.InsertObject(group))
+    xyz, starts = tiles["xyz"], tiles["starts"]
+    centres = 0.5 * (tiles["lo"] + tiles["hi"])
+    targets = []
+    rgb = tiles.get("rgb")
+    for k in range(len(starts) - 1):
+        obj = import_point_cloud(doc, xyz[starts[k]:starts[k + 1]] - centres[k], parent=group, name=f"{name}_Tile{k:04d}",
+                                 rgb=None if rgb is None else rgb[starts[k]:starts[k + 1]])
+        obj.SetRelPos(c4d.Vector(*centres[k].tolist()))
+        if tiles["near"][k]: targets.append(obj)
+    return group, targets
+
+def import_point_lods(doc, levels, parent=None, name="GLoMap_SparseCloud", colors=None):
+    """
+    One point object (or tile group) per LOD, finest first, finer levels hidden; colors[k] is each level's rgb.
+    Returns the objects of the coarsest level for the Matrix previs.
+    """
+    objs, targets = [], []
+    for k, pts in enumerate(levels):
+        level_name = name + (f"_LOD{k}" if k else "")
+        if isinstance(pts, dict):
+            obj, targets = import_point_tiles(doc, pts, parent=parent, name=level_name)
+        else:
+            obj = import_point_cloud(doc, pts, parent=parent, name=level_name, rgb=colors[k] if colors else None)
+            targets = [obj] if obj is not None else []
+        if obj is not None: objs.append(obj)
+    for o in objs[:-1]:
+        o.SetEditorMode(c4d.MODE_OFF); o.SetRenderMode(c4d.MODE_OFF)
+    return targets
+
+def add_matrix_previs(doc, targets, parent=None):
+    """
+    One Matrix per linked point object (under a 'SparceCloud_Matrix_Previs' Null for tiles), coloured by a
+    shared Python Effector when the points carry Vertex Colors. Returns the top object.
+    """
+    if len(targets) <= 1:
+        top = add_matrix_on_sparse_vertices(doc, targets[0] if targets else None, parent=parent)
+        matrices = [top] if top is not None else []
+    else:
+        top = c4d.BaseObject(c4d.Onull)
+        top.SetName("SparceCloud_Matrix_Previs")
+        (top.InsertUnder(parent) if parent else doc.InsertObject(top))
+        matrices = [add_matrix_on_sparse_vertices(doc, obj, parent=top, name="SparceCloud_Matrix_Previs_" + obj.GetName().rsplit("_", 1)[-1])
+                    for obj in targets]
+    if matrices and all(o.GetTag(c4d.Tvertexcolor) for o in targets):
+        add_color_effector(matrices, parent=top)
+    return top
+
+# Python Effector for the Matrix previs: clone colours from the linked object's Vertex Color tag (one RGBA
+# float32 per point), decoded once per tag change and applied with a single SetArray. Decoded colours are
+# keyed by the tag's data dirty count; the few stale entries left by edits are dropped past _CACHE_MAX.
+_COLOR_EFFECTOR_CODE = """import c4d
+from array import array
+from c4d.modules import mograph
+
+_cache = {}
+_CACHE_MAX = 64
+
+def main():
+    md = mograph.GeGetMoData(op)
+    gen = md.GetGenerator() if md else None
+    src = gen[c4d.MG_OBJECT_LINK] if gen else None
+    tag = src.GetTag(c4d.Tvertexcolor) if src else None
+    if tag is None: return True
+    key = tag.GetDirty(c4d.DIRTYFLAGS_DATA)
+    colors = _cache.get(key)
+    if colors is None:
+        if len(_cache) >= _CACHE_MAX: _cache.clear()
+        rgba = array("f", bytes(tag.GetLowlevelDataAddressR()))
+        colors = _cache[key] = [c4d.Vector(rgba[i], rgba[i + 1], rgba[i + 2]) for i in range(0, len(rgba), 4)]
+    if md.GetCount() == len(colors):
+        md.SetArray(c4d.MODATA_COLOR, colors, False)
+    return True
+"""
+
+def add_color_effector(matrices, parent):
+    """'SparceCloud_Color_Effector' (Python Effector) under 'parent', in each Matrix's effector list; None if unavailable."""
+    try:
+        eff = c4d.BaseObject(getattr(c4d, "Omgpython", 1025800))
+        eff.SetName("SparceCloud_Color_Effector")
+        eff[c4d.OEPYTHON_STRING] = _COLOR_EFFECTOR_CODE
+        eff[c4d.OEPYTHON_MODE] = c4d.OEPYTHON_MODE_FULL  # main() writes the MoData itself
+        eff[c4d.ID_MG_BASEEFFECTOR_COLOR_ENABLE] = True
+        eff.InsertUnder(parent)
+        for mtx in matrices:
+            effectors = mtx[c4d.ID_MG_MOTIONGENERATOR_EFFECTORLIST] or c4d.InExcludeData()
+            effectors.InsertObject(eff, 1)
+            mtx[c4d.ID_MG_MOTIONGENERATOR_EFFECTORLIST] = effectors
+        return eff
+    except (AttributeError, TypeError):
+        return None
+
+@instrumented("matrix previs")
+def add_matrix_on_sparse_vertices(doc, sparse_obj, parent=None, name="SparceCloud_Matrix_Previs"):
     """
     Create a MoGraph Matrix object and configure:
       - Mode: Object (enum 0 on your build)
       - Draw Size: 0.5
       - Object link: sparse_obj
-      - Distribution: Vertex (resolved by reading the parameter's cycle)
+      - Distribution: Vertex (the resolved-ID registry's value, else read from the parameter's cycle)
     """
     if sparse_obj is None:
         return None
 
     mtx = c4d.BaseObject(c4d.Omgmatrix)
-    mtx.SetName("SparceCloud_Matrix_Previs")
+    mtx.SetName(name)
     (mtx.InsertUnder(parent) if parent else doc.InsertObject(mtx))
 
     def DID(i, dtype, creator):
@@ -302,32 +2134,33 @@ def add_matrix_on_sparse_vertices(doc, sparse_obj, parent=None):
     except Exception:
         pass
 
-    # Distribution -> resolve "Vertex" by reading the cycle (enum) list
+    # Distribution -> "Vertex": the registry's value (set and read back), else read from the cycle (enum) list
     dist_did = DID(1100, c4d.DTYPE_LONG, 1018571)
-    try:
-        desc = c4d.Description()
-        if mtx.GetDescription(desc, c4d.DESCFLAGS_DESC_0):
-            for did, bc in desc:
-                if isinstance(did, c4d.DescID) and did.GetDepth() >= 1 and did[0].id == 1100 and did[0].creator == 1018571:
-                    cyc = bc.GetContainer(c4d.DESC_CYCLE)
-                    if isinstance(cyc, c4d.BaseContainer):
-                        chosen = None
-                        for key, label in cyc:
-                            try:
-                                if "vertex" in str(label).strip().lower():
-                                    chosen = key
-                                    break
-                            except Exception:
-                                continue
-                        if chosen is not None:
-                            mtx.SetParameter(dist_did, int(chosen), c4d.DESCFLAGS_SET_0)
-                    break
-    except Exception:
-        pass
+    def valid(value):
+        return mtx.SetParameter(dist_did, value, c4d.DESCFLAGS_SET_0) and mtx.GetParameter(dist_did, c4d.DESCFLAGS_GET_0) == value
+    vertex = resolve_id("matrix_vertex", valid, lambda: _scan_matrix_vertex(mtx))
+    if vertex is not None:
+        mtx.SetParameter(dist_did, vertex, c4d.DESCFLAGS_SET_0)
 
     mtx.Message(c4d.MSG_UPDATE)
     return mtx
 
+def _scan_matrix_vertex(mtx):
+    """Matrix Distribution cycle value labelled "Vertex", from the object's full description (None if absent)."""
+    desc = c4d.Description()
+    if not mtx.GetDescription(desc, c4d.DESCFLAGS_DESC_0): return None
+    for did, bc in desc:
+        if isinstance(did, c4d.DescID) and did.GetDepth() >= 1 and did[0].id == 1100 and did[0].creator == 1018571:
+            cyc = bc.GetContainer(c4d.DESC_CYCLE)
+            if isinstance(cyc, c4d.BaseContainer):
+                for key, label in cyc:
+                    try:
+                        if "vertex" in str(label).strip().lower(): return int(key)
+                    except Exception:
+                        continue
+            return None
+    return None
+
 # ------------------------ Scene helpers ------------------------
 
 def ensure_null(doc, name):
@@ -336,6 +2169,16 @@ def ensure_null(doc, name):
     doc.InsertObject(n)
     return n
 
+def set_timeline(doc, n, fps):
+    """Document FPS, timeline and Preview Range for n frames."""
+    if fps > 0: doc.SetFps(fps)
+    doc.SetMinTime(c4d.BaseTime(0, fps))
+    doc.SetMaxTime(c4d.BaseTime(max(1, n), fps))
+    doc.SetTime(c4d.BaseTime(0, fps))
+    # Also set the Preview Range to match the full timeline
+    doc.SetLoopMinTime(c4d.BaseTime(0, fps))
+    doc.SetLoopMaxTime(c4d.BaseTime(max(1, n), fps))
+
 # ------------------------ Constraint setup (B-family IDs + PSR fallback) ------------------------
 
 ID_TRANSFORM_ENABLE = 1000  # enable Transform block
@@ -348,19 +2191,37 @@ ID_S_B           = 10006
 def _desc(i):
     return c4d.DescID(c4d.DescLevel(i))
 
+def _constraint_family_ok(tag, family):
+    """Cheap check of a stored family: the Transform block switches on, or the PSR constants exist."""
+    if family.get("mode") == "transform":
+        return bool(tag.SetParameter(_desc(ID_TRANSFORM_ENABLE), True, c4d.DESCFLAGS_SET_0))
+    return family.get("mode") == "psr" and getattr(c4d, "ID_CA_CONSTRAINT_TAG_PSR", None) is not None
+
+def _scan_constraint_family(tag):
+    """Probe the tag: {"mode": "transform", "weight": 1.0 | 100.0} (inline/B IDs) or {"mode": "psr"}; None if neither."""
+    if tag.SetParameter(_desc(ID_TRANSFORM_ENABLE), True, c4d.DESCFLAGS_SET_0):
+        return {"mode": "transform", "weight": 1.0 if tag.SetParameter(_desc(ID_WEIGHT_B), 1.0, c4d.DESCFLAGS_SET_0) else 100.0}
+    if getattr(c4d, "ID_CA_CONSTRAINT_TAG_PSR", None) is not None and getattr(c4d, "ID_CA_CONSTRAINT_TAG_PARENT_LINK", None) is not None:
+        return {"mode": "psr"}
+    return None
+
+@instrumented("constraint")
 def setup_constraint_follow(dup_cam, src_cam):
     tag = c4d.BaseTag(c4d.Tcaconstraint)
     if not tag:
         raise RuntimeError("Failed to create Character Constraint tag.")
     dup_cam.InsertTag(tag)
+    family = resolve_id("constraint", lambda f: _constraint_family_ok(tag, f), lambda: _scan_constraint_family(tag))
+    if family is None:
+        raise RuntimeError("Constraint setup failed: Transform and PSR unavailable on this build.")
 
     # Transform path (inline/B)
-    if tag.SetParameter(_desc(ID_TRANSFORM_ENABLE), True, c4d.DESCFLAGS_SET_0):
+    if family["mode"] == "transform":
+        tag.SetParameter(_desc(ID_TRANSFORM_ENABLE), True, c4d.DESCFLAGS_SET_0)
         tag.SetParameter(_desc(ID_P_B), True,  c4d.DESCFLAGS_SET_0)
         tag.SetParameter(_desc(ID_R_B), True,  c4d.DESCFLAGS_SET_0)
         tag.SetParameter(_desc(ID_S_B), True,  c4d.DESCFLAGS_SET_0)
-        if not tag.SetParameter(_desc(ID_WEIGHT_B), 1.0, c4d.DESCFLAGS_SET_0):
-            tag.SetParameter(_desc(ID_WEIGHT_B), 100.0, c4d.DESCFLAGS_SET_0)
+        tag.SetParameter(_desc(ID_WEIGHT_B), family["weight"], c4d.DESCFLAGS_SET_0)
         tag.SetParameter(_desc(ID_TARGET_LINK_B), src_cam, c4d.DESCFLAGS_SET_0)
         tag.Message(c4d.MSG_UPDATE)
         dup_cam.Message(c4d.MSG_UPDATE)
@@ -375,9 +2236,6 @@ def setup_constraint_follow(dup_cam, src_cam):
     k_PSR_R       = k(c4d, "ID_CA_CONSTRAINT_TAG_PSR_R", None)
     k_PSR_S       = k(c4d, "ID_CA_CONSTRAINT_TAG_PSR_S", None)
 
-    if k_PSR is None or k_PARENT_LINK is None:
-        raise RuntimeError("Constraint setup failed: Transform and PSR unavailable on this build.")
-
     bc[k_PSR] = True
     bc[k_PARENT_LINK] = src_cam
     if k_PSR_P is not None: bc[k_PSR_P] = True
@@ -388,6 +2246,865 @@ def setup_constraint_follow(dup_cam, src_cam):
     dup_cam.Message(c4d.MSG_UPDATE)
     return tag
 
+# ------------------------ Incremental update (NumPy) ------------------------
+# A full import stamps its objects with hashes (BaseContainer IMPORT_META_ID): the animated camera one
+# per frame, each point object one per _POINT_CHUNK block. update_scene() compares a re-solved model
+# against them and rewrites only the keys and point blocks that changed.
+
+IMPORT_META_ID = 1064731  # private sub-container on imported objects
+META_VERSION = 1
+_META_VERSION_ID, _META_HASHES_ID, _META_SIGNATURE_ID, _META_FRAMES_ID = 1, 2, 3, 4
+
+def row_hashes(a):
+    """64-bit FNV-1a style hash of every row of a 2-D array of 8-byte values, vectorized over the rows."""
+    words = np.ascontiguousarray(a).view(np.uint64).reshape(len(a), -1)
+    h = np.full(len(a), 0xCBF29CE484222325, np.uint64)
+    with np.errstate(over="ignore"):
+        for col in words.T:
+            h ^= col
+            h *= np.uint64(0x100000001B3)
+    return h
+
+def pose_hashes(poses):
+    """One hash per frame over its frame number and the seven keyed values."""
+    return row_hashes(np.column_stack([poses["frame"].astype(np.float64), poses["pos"], poses["hpb"], poses["focal"]]))
+
+def block_hashes(points, rgb=None, block=None):
+    """One 64-bit hash per block of 'block' (default _POINT_CHUNK) points, coordinates and colours."""
+    block = block or _POINT_CHUNK
+    out = np.empty((len(points) + block - 1) // block, np.uint64)
+    for i, lo in enumerate(range(0, len(points), block)):
+        h = hashlib.blake2b(np.ascontiguousarray(points[lo:lo + block]).tobytes(), digest_size=8)
+        if rgb is not None: h.update(np.ascontiguousarray(rgb[lo:lo + block]).tobytes())
+        out[i] = int.from_bytes(h.digest(), "little")
+    return out
+
+def set_import_meta(obj, hashes, signature=None, frames=None):
+    bc = c4d.BaseContainer()
+    bc.SetInt32(_META_VERSION_ID, META_VERSION)
+    bc.SetString(_META_HASHES_ID, hashes.astype("<u8").tobytes().hex())
+    if signature is not None: bc.SetString(_META_SIGNATURE_ID, json.dumps(signature, sort_keys=True))
+    if frames is not None: bc.SetString(_META_FRAMES_ID, np.asarray(frames, "<i8").tobytes().hex())
+    obj.GetDataInstance().SetContainer(IMPORT_META_ID, bc)
+
+def get_import_meta(obj):
+    """(hashes, signature) stored by set_import_meta, or None (not stamped, or by another version)."""
+    bc = obj.GetDataInstance().GetContainerInstance(IMPORT_META_ID) if obj else None
+    if bc is None or bc.GetInt32(_META_VERSION_ID) != META_VERSION: return None
+    sig = bc.GetString(_META_SIGNATURE_ID)
+    return np.frombuffer(bytes.fromhex(bc.GetString(_META_HASHES_ID)), "<u8"), json.loads(sig) if sig else None
+
+def get_import_frames(obj):
+    """Keyed frames stored with the camera's hashes, or None (not stamped with them)."""
+    bc = obj.GetDataInstance().GetContainerInstance(IMPORT_META_ID) if obj else None
+    frames = bc.GetString(_META_FRAMES_ID) if bc is not None else ""
+    return np.frombuffer(bytes.fromhex(frames), "<i8") if frames else None
+
+def _camera_signature(fps, keep):
+    return {"fps": fps, "reduced": keep is not None}
+
+def _level_names(name, n):
+    return [name + (f"_LOD{k}" if k else "") for k in range(n)]
+
+def _remove_levels(doc, name):
+    """Remove an imported cloud: 'name', then name_LOD1, name_LOD2, … until one is missing."""
+    k = 0
+    while True:
+        obj = doc.SearchObject(_level_names(name, k + 1)[-1])
+        if obj is None and k: return
+        if obj is not None: obj.Remove()
+        k += 1
+
+def _level_parts(doc, levels, colors, name):
+    """
+    (object, points as stored in it, rgb, centre) for every point object of an imported cloud, matched
+    by name (and tile order); None when the document's objects do not have the levels' structure.
+    """
+    parts = []
+    for k, (level_name, pts) in enumerate(zip(_level_names(name, len(levels)), levels)):
+        obj = doc.SearchObject(level_name)
+        if obj is None: return None
+        if isinstance(pts, dict):
+            tiles = obj.GetChildren()
+            starts, rgb = pts["starts"], pts.get("rgb")
+            if len(tiles) != len(starts) - 1 or not all(isinstance(t, c4d.PolygonObject) for t in tiles): return None
+            centres = 0.5 * (pts["lo"] + pts["hi"])
+            for t, (a, b) in enumerate(zip(starts[:-1], starts[1:])):
+                parts.append((tiles[t], pts["xyz"][a:b] - centres[t], None if rgb is None else rgb[a:b], centres[t]))
+        else:
+            if not isinstance(obj, c4d.PolygonObject): return None
+            parts.append((obj, pts, colors[k] if colors else None, None))
+    if not levels: return None
+    if doc.SearchObject(_level_names(name, len(levels) + 1)[-1]) is not None: return None  # fewer LODs now
+    return parts
+
+def stamp_point_levels(doc, levels, colors, name):
+    for obj, pts, rgb, _ in _level_parts(doc, levels, colors, name) or ():
+        set_import_meta(obj, block_hashes(pts, rgb))
+
+def update_point_object(obj, points, rgb=None, centre=None):
+    """
+    Rewrite the _POINT_CHUNK blocks of a stamped point object whose hashes differ from 'points' (and
+    their colours); the object is resized when the count changed. Returns the number of points written.
+    """
+    new, meta = block_hashes(points, rgb), get_import_meta(obj)
+    old = meta[0] if meta else np.empty(0, np.uint64)
+    n = len(points)
+    if obj.GetPointCount() != n: obj.ResizeObject(n, 0)  # blocks past the old end never match
+    changed = np.flatnonzero(new[:len(old)] != old[:len(new)]).tolist() + list(range(min(len(old), len(new)), len(new)))
+    tag = obj.GetTag(c4d.Tvertexcolor)
+    if tag is not None and (rgb is None or tag.GetDataCount() != n):
+        tag.Remove()
+        tag = None
+    if rgb is not None and tag is None:
+        add_vertex_colors(obj, rgb)
+    written = 0
+    if changed: write_points(obj, points, changed)
+    for b in changed:
+        lo, hi = b * _POINT_CHUNK, min(n, (b + 1) * _POINT_CHUNK)
+        if tag is not None: write_vertex_colors(tag, rgb[lo:hi], lo)
+        written += hi - lo
+    if centre is not None: obj.SetRelPos(c4d.Vector(*centre.tolist()))
+    set_import_meta(obj, new)
+    if written: obj.Message(c4d.MSG_UPDATE)
+    return written
+
+def update_point_levels(doc, root, levels, colors, name, previs):
+    """
+    Bring an imported cloud up to date: with the same structure only changed point blocks are rewritten,
+    otherwise the cloud and its Matrix previs are rebuilt. Returns the number of points written.
+    """
+    parts = _level_parts(doc, levels, colors, name)
+    if parts is not None:
+        return sum(update_point_object(*part) for part in parts)
+    _remove_levels(doc, name)
+    old = doc.SearchObject("SparceCloud_Matrix_Previs") if previs else None
+    if old is not None: old.Remove()
+    if levels:
+        targets = import_point_lods(doc, levels, parent=root, name=name, colors=colors)
+        if previs: add_matrix_previs(doc, targets, parent=None)
+        stamp_point_levels(doc, levels, colors, name)
+    return sum(_level_count(level) for level in levels)
+
+def update_camera_keys(cam, poses, sensor_mm, fps, keep=None):
+    """
+    Rewrite the keys of frames whose pose hash is not in the camera's stamp, delete those of frames that are gone;
+    a reduced key set or another FPS is re-baked in full. Returns the number of keys written.
+    """
+    meta, new, frames = get_import_meta(cam), pose_hashes(poses), poses["frame"]
+    sig, old_frames = _camera_signature(fps, keep), get_import_frames(cam)
+    if meta is None or meta[1] != sig or keep is not None or old_frames is None:
+        written = bake_poses_to_camera(cam, poses, sensor_mm, fps, keep=keep)
+        set_import_meta(cam, new, sig, frames)
+        return written
+    n = len(new)
+    todo = np.flatnonzero(~np.isin(new, meta[0])).tolist()
+    gone = np.setdiff1d(old_frames, frames).tolist()
+    for _, did, values in _pose_channels(poses):
+        curve = ensure_track(cam, did()).GetCurve()
+        for f in gone:
+            hit = curve.FindKey(c4d.BaseTime(f, fps))
+            if hit: curve.DelKey(hit["idx"])
+        for i in todo:
+            t = c4d.BaseTime(int(frames[i]), fps)
+            hit = curve.FindKey(t)
+            key = hit["key"] if hit else curve.AddKey(t)["key"]
+            key.SetValue(curve, float(values[i]))
+    if n and (todo and todo[-1] == n - 1 or gone and gone[-1] > frames[-1]):  # the last pose changed
+        cam.SetMg(pose_to_c4d_matrix(poses["rot"][-1], poses["pos"][-1]))
+        cam[c4d.CAMERAOBJECT_FOCUS] = float(poses["focal"][-1])
+    set_import_meta(cam, new, sig, frames)
+    return 7 * len(todo)
+
+def find_previous_import(doc):
+    """(root, animated camera) of a stamped earlier import in doc, or None."""
+    root, cam = doc.SearchObject("GLoMap_Scene_Orient"), doc.SearchObject("RS_GLoMap_Animated_Camera")
+    if root is None or cam is None or get_import_meta(cam) is None: return None
+    return root, cam
+
+# ------------------------ Per-frame visibility (NumPy) ------------------------
+# Which points each image observes, from the point tracks, as a CSR index over timeline frames:
+# frame f sees points[offsets[f]:offsets[f + 1]] (int32). It is written next to the scene with the
+# points' C4D positions, and the 'GLoMap_VisiblePoints' Python Generator builds just the current frame's set.
+
+VISIBILITY_DIR = "visibility"
+_META_VISIBILITY_ID = 5  # index path, in the generator's IMPORT_META_ID container (apart from the hashes)
+
+def image_rows(image_ids, track_image):
+    """
+    Row of each IMAGE_ID in the sorted image_ids, -1 for unknown images: a lookup table while the ids are
+    dense enough (COLMAP numbers images from 1), else a binary search.
+    """
+    image_ids, track_image = np.asarray(image_ids), np.asarray(track_image)
+    if not len(image_ids): return np.full(len(track_image), -1, np.int64)
+    top = int(image_ids[-1])
+    if image_ids[0] >= 0 and top < 4 * len(image_ids) + 4096:
+        lookup = np.full(top + 2, -1, np.int64)  # last slot: every id outside 0..top
+        lookup[image_ids] = np.arange(len(image_ids))
+        return lookup[np.where((track_image >= 0) & (track_image <= top), track_image, top + 1)]
+    row = np.searchsorted(image_ids, track_image)
+    known = row < len(image_ids)
+    known[known] = image_ids[row[known]] == track_image[known]
+    return np.where(known, row, -1)
+
+def visibility_index(track_len, track_image, image_ids):
+    """
+    Point tracks (track_len, IMAGE_IDs) -> {"offsets": (F+1,) int32, "points": (M,) int32} CSR by frame of the
+    sorted image_ids; entries of unknown images are dropped.
+    """
+    image_ids = np.asarray(image_ids)
+    frame = image_rows(image_ids, track_image)
+    known = frame >= 0
+    point = np.repeat(np.arange(len(track_len), dtype=np.int32), track_len)[known]
+    frame = frame[known]
+    small = len(image_ids) <= np.iinfo(np.int16).max  # int16 keys take NumPy's radix sort
+    order = np.argsort(frame.astype(np.int16 if small else np.int32), kind="stable")
+    offsets = np.zeros(len(image_ids) + 1, np.int32)
+    np.cumsum(np.bincount(frame, minlength=len(image_ids)), out=offsets[1:])
+    return {"offsets": offsets, "points": point[order]}
+
+def filter_visibility(index, keep):
+    """Index restricted to the points of a boolean mask (as filter_points), renumbered to the kept points."""
+    renumber = np.cumsum(keep, dtype=np.int64).astype(np.int32) - 1
+    kept = keep[index["points"]]
+    before = np.r_[0, np.cumsum(kept, dtype=np.int64)]  # kept entries ahead of each position
+    return {"offsets": before[index["offsets"]].astype(np.int32), "points": renumber[index["points"][kept]]}
+
+def write_visibility(path, index, xyz):
+    """Save an index with the (N, 3) C4D positions of the points it refers to (uncompressed .npz)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, offsets=index["offsets"], points=index["points"], xyz=np.asarray(xyz, np.float32))
+    os.replace(tmp, path)
+
+# Python Generator for GLoMap_VisiblePoints: a point object with the current frame's points of the index
+# file stored on the generator (reloaded when the file changes, e.g. after an update). Nothing outside the
+# generator's own cache is modified, so it is safe under threaded scene evaluation.
+_VISIBILITY_GENERATOR_CODE = """import os
+import c4d
+import numpy as np
+
+_index, _built = {}, {}
+
+def main():
+    bc = op.GetDataInstance().GetContainerInstance(%d)
+    path = bc.GetString(%d) if bc is not None else ""
+    if not path or not os.path.isfile(path): return None
+    key = (path, os.path.getmtime(path))
+    if key not in _index:
+        with np.load(path) as z:
+            _index.clear()
+            _index[key] = (z["offsets"], z["points"], z["xyz"])
+    offsets, points, xyz = _index[key]
+    f = doc.GetTime().GetFrame(doc.GetFps())
+    if _built.get("at") != (key, f):
+        ids = points[offsets[f]:offsets[f + 1]] if 0 <= f < len(offsets) - 1 else points[:0]
+        obj = c4d.PolygonObject(len(ids), 0)
+        obj.SetAllPoints([c4d.Vector(x, y, z) for x, y, z in xyz[ids].tolist()])
+        obj.Message(c4d.MSG_UPDATE)
+        _built.update(at=(key, f), obj=obj)
+    return _built["obj"].GetClone()
+""" % (IMPORT_META_ID, _META_VISIBILITY_ID)
+
+def add_visible_points(doc, visibility, parent=None, name="GLoMap_VisiblePoints"):
+    """Python Generator showing the points observed at the current frame, read from visibility["path"]."""
+    gen = c4d.BaseObject(c4d.Opython)
+    gen.SetName(name)
+    gen[c4d.OPYTHON_CODE] = _VISIBILITY_GENERATOR_CODE
+    gen[c4d.OPYTHON_OPTIMIZE] = False  # rebuilt on frame changes, not only when the generator is dirty
+    bc = c4d.BaseContainer()
+    bc.SetString(_META_VISIBILITY_ID, visibility["path"])
+    gen.GetDataInstance().SetContainer(IMPORT_META_ID, bc)
+    (gen.InsertUnder(parent) if parent else doc.InsertObject(gen))
+    return gen
+
+# ------------------------ Camera frustum previs (NumPy) ------------------------
+# The whole solved path as one editor-only polygon object: a pyramid (apex + image-plane corners) per
+# registered image or every Nth, all vertices from the pose batch in one pass, coloured along the shot.
+
+FRUSTUM_COLORS = ((40, 90, 255), (60, 220, 90), (255, 70, 40))  # first, middle, last frame
+_FRUSTUM_POLYS = ((0, 1, 2, 2), (0, 2, 3, 3), (0, 3, 4, 4), (0, 4, 1, 1), (1, 2, 3, 4))  # 4 sides + image plane
+
+def frustum_size(pos, scale):
+    """Auto pyramid depth: 3% of the camera path's bounding diagonal (0.1 scene units for a static camera)."""
+    diag = float(np.linalg.norm(np.ptp(pos, axis=0))) if len(pos) else 0.0
+    return 0.03 * diag if diag > 0 else 0.1 * scale
+
+def frustum_mesh(poses, sensor_mm, aspect, size, step=1):
+    """
+    Pyramids for every step-th pose, apex at the camera, image plane 'size' along +Z
+    -> (xyz (5K,3), polys (5K,4) int32, rgb (5K,3) uint8).
+    """
+    rot, pos, focal = poses["rot"][::step], poses["pos"][::step], poses["focal"][::step]
+    k = len(pos)
+    hw = size * sensor_mm / (2.0 * np.maximum(focal, 1e-6))
+    corners = np.empty((k, 4, 3))
+    corners[..., 0] = hw[:, None] * (-1.0, 1.0, 1.0, -1.0)
+    corners[..., 1] = (hw * aspect)[:, None] * (1.0, 1.0, -1.0, -1.0)
+    corners[..., 2] = size
+    xyz = np.empty((k, 5, 3))
+    xyz[:, 0] = pos
+    xyz[:, 1:] = pos[:, None] + np.einsum("nij,nkj->nki", rot, corners)
+    polys = (np.array(_FRUSTUM_POLYS, np.int32)[None] + 5 * np.arange(k, dtype=np.int32)[:, None, None]).reshape(-1, 4)
+    t = np.linspace(0.0, 1.0, k) if k > 1 else np.zeros(k)
+    stops = np.array(FRUSTUM_COLORS, np.float64)
+    rgb = np.stack([np.interp(t, (0.0, 0.5, 1.0), stops[:, c]) for c in range(3)], axis=1).round().astype(np.uint8)
+    return xyz.reshape(-1, 3), polys, np.repeat(rgb, 5, axis=0)
+
+@instrumented("camera frusta", count=lambda obj: obj.GetPolygonCount() // 5)
+def add_camera_frusta(doc, mesh, parent=None, name="GLoMap_Camera_Frusta"):
+    """One polygon object from frustum_mesh (points, polygons, Vertex Color tag), hidden in renders."""
+    xyz, polys, rgb = mesh
+    obj = c4d.PolygonObject(len(xyz), len(polys))
+    obj.SetName(name)
+    (obj.InsertUnder(parent) if parent else doc.InsertObject(obj))
+    write_points(obj, xyz)
+    write_polygons(obj, polys)
+    add_vertex_colors(obj, rgb)
+    obj.SetRenderMode(c4d.MODE_OFF)
+    obj.Message(c4d.MSG_UPDATE)
+    return obj
+
+# ------------------------ Solve quality (NumPy) ------------------------
+# Per-frame statistics of the solve, from what the parsers already hold: the observation count of each
+# image (images.bin/.txt), the image of every track entry and the point errors (points3D). They are baked
+# as User Data tracks on the animated camera, so weakly tracked frames show up in the timeline.
+
+QUALITY_CHANNELS = (
+    ("observed", "Observed 2D points"), ("triangulated", "Triangulated points"),
+    ("error", "Mean track error (px)"), ("jump", "Pose jump"),
+)
+QUALITY_WORST = 5  # frames listed in the final message
+
+def image_statistics(imgs, track_len, track_image, error):
+    """
+    Per image in one pass over the tracks: "observed" 2D points, "triangulated" points and "error", the mean
+    of those points' whole-track errors (not per-observation residuals).
+    """
+    image_ids = imgs["image_id"]
+    frame = image_rows(image_ids, track_image)
+    known = frame >= 0
+    frame = frame[known]
+    tri = np.bincount(frame, minlength=len(image_ids))
+    err = np.bincount(frame, weights=np.repeat(error, track_len)[known], minlength=len(image_ids))
+    return {"observed": np.asarray(imgs["points2d"], np.int64), "triangulated": tri, "error": err / np.maximum(tri, 1)}
+
+def pose_jump(pos):
+    """Distance of each camera from the midpoint of its neighbours (end frames take the next one's value)."""
+    jump = np.zeros(len(pos))
+    if len(pos) > 2:
+        jump[1:-1] = np.linalg.norm(pos[1:-1] - 0.5 * (pos[:-2] + pos[2:]), axis=1)
+        jump[0], jump[-1] = jump[1], jump[-2]
+    return jump
+
+def solve_quality(stats, poses):
+    """image_statistics restricted to the keyed frames, plus "jump": {"frame", "pos", channel: (F,) float32}."""
+    idx = poses["frame"]
+    out = {key: stats[key][idx].astype(np.float32) for key, _ in QUALITY_CHANNELS if key != "jump"}
+    out["jump"] = pose_jump(poses["pos"]).astype(np.float32)
+    out["frame"], out["pos"] = idx, poses["pos"]
+    return out
+
+def worst_frames(quality, n=QUALITY_WORST):
+    """
+    The n weakest frames as JSON-ready dicts, ranked by the largest of: the shot's median triangulated
+    count over the frame's, its error over the median error, its jump over the median camera step.
+    """
+    if not len(quality["frame"]): return []
+    med = lambda a: max(float(np.median(a)), 1e-9) if len(a) else 1e-9
+    tri = np.maximum(quality["triangulated"], 1.0)
+    step = max(med(np.linalg.norm(np.diff(quality["pos"], axis=0), axis=1)), med(quality["jump"]))
+    score = np.maximum.reduce([med(tri) / tri, quality["error"] / med(quality["error"]), quality["jump"] / step])
+    return [{"frame": int(quality["frame"][i]), **{key: float(quality[key][i]) for key, _ in QUALITY_CHANNELS}}
+            for i in np.argsort(-score, kind="stable")[:n].tolist()]
+
+def _quality_user_data(cam):
+    """DescID of each channel's User Data entry (REAL) on 'cam', found again by name or added."""
+    have = {bc[c4d.DESC_NAME]: did for did, bc in cam.GetUserDataContainer()}
+    ids = {}
+    for key, label in QUALITY_CHANNELS:
+        did = have.get(label)
+        if did is None:
+            bc = c4d.GetCustomDataTypeDefault(c4d.DTYPE_REAL)
+            bc[c4d.DESC_NAME] = bc[c4d.DESC_SHORT_NAME] = label
+            did = cam.AddUserData(bc)
+        ids[key] = did
+    return ids
+
+@instrumented("quality channels", count=lambda written: written)
+def bake_quality_channels(cam, quality, fps):
+    """Key the quality channels as User Data tracks (write_curve_keys, step interpolation). Returns the key count."""
+    written = 0
+    for key, did in _quality_user_data(cam).items():
+        written += write_curve_keys(ensure_track(cam, did).GetCurve(), quality["frame"], quality[key], fps, c4d.CINTERPOLATION_STEP)
+    return written
+
+# ------------------------ Import pipeline ------------------------
+# prepare_import() does everything that does not touch the document (parsing, filtering, decimation,
+# pose math) and is safe to run on a worker thread; build_scene() is the only part that edits the
+# document and must run on the main thread. Cancelling before build_scene leaves the document untouched.
+
+class ImportCancelled(Exception):
+    """The user cancelled a running import; nothing was written to the document."""
+
+class ImportProgress(object):
+    """
+    Progress shared between the worker stages and the dialog: weighted per-stage fractions, a status
+    text, and the cancel flag. The callbacks handed to the parsers raise ImportCancelled once cancelled.
+    """
+    def __init__(self):
+        self._weights, self._done = {}, {}
+        self._cancel = threading.Event()
+        self.text = ""
+
+    def stage(self, name, weight=1.0, text=None):
+        """Register a stage and return its progress(fraction) callback."""
+        self._weights[name], self._done[name] = float(weight), 0.0
+        self.text = text or f"Reading {name}…"
+        def update(fraction):
+            if self._cancel.is_set(): raise ImportCancelled()
+            self._done[name] = min(1.0, max(0.0, fraction))
+        return update
+
+    def fraction(self):
+        total = sum(self._weights.values())
+        return sum(w * self._done.get(k, 0.0) for k, w in list(self._weights.items())) / total if total else 0.0
+
+    def cancel(self):
+        self._cancel.set()
+        self.text = "Cancelling…"
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set(): raise ImportCancelled()
+
+class _ScopedProgress(object):
+    """An ImportProgress whose stage names carry a prefix, so concurrent model imports share one bar."""
+    def __init__(self, report, prefix):
+        self._report, self._prefix = report, prefix
+
+    def stage(self, name, weight=1.0, text=None):
+        return self._report.stage(self._prefix + name, weight, text and self._prefix + text)
+
+    def __getattr__(self, name):
+        return getattr(self._report, name)
+
+def _level_count(level):
+    return len(level["xyz"]) if isinstance(level, dict) else len(level)
+
+def _point_levels(pts, opts, stage=""):
+    """
+    Packed cloud -> (levels, colors) for import_point_lods: decimated, scaled into C4D axes, tiled.
+    colors[k] is level k's (N, 3) uint8 rgb, or None (colours off or none in the file; tiles carry their own).
+    """
+    scale, tiles = opts["scale"], opts.get("tiles")
+    with_rgb = bool(opts.get("colors")) and "rgb" in pts
+    if opts.get("decimate"):  # on COLMAP coordinates: the voxel edge is given in scene units
+        dec = dict(opts["decimate"])
+        dec["voxel"] = dec.get("voxel", 0.0) / scale
+        with import_stage(stage + "decimation", len(pts["xyz"])):
+            keys = ("xyz", "error", "rgb") if with_rgb else ("xyz", "error")  # error: lowest-error mode's score
+            decimated = decimate_points({k: pts[k] for k in keys if k in pts}, **dec)
+        levels, colors = [l["xyz"] for l in decimated], [l.get("rgb") for l in decimated]
+        del decimated
+    else:
+        levels, colors = [pts["xyz"]], [pts.get("rgb") if with_rgb else None]
+    with import_stage(stage + "point transform", sum(len(l) for l in levels)):
+        done = {}  # a level can be its parent's array when nothing merged
+        for l in levels:
+            if id(l) not in done: done[id(l)] = scale_flip_points(l, scale)
+        levels = [done[id(l)] for l in levels]
+    if tiles:
+        with import_stage(stage + "tiling", sum(len(l) for l in levels)):
+            done = {}
+            for l, c in zip(levels, colors):
+                if id(l) not in done: done[id(l)] = build_tiles(l, tiles["max_points"], tiles.get("mode", TILE_OCTREE), rgb=c)
+            levels, colors = [done[id(l)] for l in levels], [None] * len(levels)
+    return levels, colors
+
+def prepare_import(sparse, fmt, opts, report=None, pool=None):
+    """
+    Parse + process a model for build_scene without touching any document; opts as ImportDialog.read_options
+    returns them.
+    """
+    report = report or ImportProgress()
+    sensor_mm, fps, scale = opts["sensor_mm"], opts["fps"], opts["scale"]
+    warnings, dense_path, visibility, image_stats = [], None, None, None
+    with_tracks = bool(opts.get("visibility") or opts.get("quality")) and opts["points"] and np is not None
+    if opts.get("dense") and np is not None:
+        dense_path = find_dense_model(sparse)
+        if not dense_path: warnings.append("No dense/fused.ply found for this scene; only the sparse cloud was imported.")
+    dense_step = report.stage("fused.ply", os.path.getsize(dense_path)) if dense_path else None
+    with import_stage("parse") as st:
+        cams, imgs, pts = load_sparse_model(sparse, fmt, with_points=opts["points"], use_cache=opts["cache"],
+                                            point_filter=opts.get("point_filter"), report=report, pool=pool,
+                                            with_tracks=with_tracks)
+        st["count"] = image_count(imgs) + point_count(pts)
+    if not cams or not image_count(imgs):
+        raise ValueError(f"Could not read cameras.{fmt} / images.{fmt} in the sparse model.")
+    step = report.stage("prepare", 0.1 * sum(report._weights.values()) or 1.0, "Preparing points and camera keys…")
+
+    # Points: per-image statistics and visibility index, outliers, scale, decimation / LODs
+    tracks = pts.pop("track_image", None) if with_tracks and pts else None
+    if tracks is not None:
+        if opts.get("quality"):
+            with import_stage("image statistics", len(tracks)):
+                image_stats = image_statistics(imgs, pts["track_len"], tracks, pts["error"])
+        if opts.get("visibility"):
+            with import_stage("visibility index", len(tracks)):
+                visibility = visibility_index(pts["track_len"], tracks, imgs["image_id"])
+        del tracks
+    pts_outliers = 0
+    sor = opts.get("sor")
+    if sor and isinstance(pts, dict) and point_count(pts) > sor[0]:
+        with import_stage("outlier removal", point_count(pts)):
+            keep = statistical_outlier_mask(pts["xyz"], *sor)
+            pts_outliers = int(len(keep) - keep.sum())
+            pts = filter_points(pts, keep)
+            if visibility is not None: visibility = filter_visibility(visibility, keep)
+    if visibility is not None:  # indexed points at full resolution, whatever decimation keeps
+        vis_xyz = scale_flip_points(pts["xyz"].astype(np.float32), scale)
+        path = os.path.join(scene_folder_of(sparse), VISIBILITY_DIR, model_id(sparse) + ".npz")
+        try:
+            with import_stage("visibility write", len(visibility["points"])):
+                write_visibility(path, visibility, vis_xyz)
+            off = visibility["offsets"]
+            visibility = {"path": path, "mean": int(off[-1]) // max(1, len(off) - 1)}
+        except OSError as e:
+            warnings.append(f"Visible-point index could not be written: {e}")
+            visibility = None
+        del vis_xyz
+    step(0.3)
+    pts_total = pts_kept = point_count(pts)
+    levels = []
+    colors = dense_colors = None
+    if pts_total and isinstance(pts, dict):
+        levels, colors = _point_levels(pts, opts)
+        pts_kept = _level_count(levels[0])
+    elif pts_total:
+        with import_stage("point transform", pts_total):
+            levels = [[(x*scale, -y*scale, z*scale) for (x,y,z) in iter_points_xyz(pts)]]
+    del pts
+    dense_levels, dense_total = [], 0
+    if dense_path:
+        with import_stage("dense read") as st:
+            dense = read_ply_points(dense_path, with_rgb=bool(opts.get("colors")), progress=dense_step)
+            st["count"] = dense_total = len(dense["xyz"])
+        if dense_total: dense_levels, dense_colors = _point_levels(dense, opts, "dense ")
+        if dense_total and (opts.get("decimate") or {}).get("mode") == DECIMATE_BEST:
+            warnings.append("fused.ply has no reprojection errors; the dense cloud keeps the point nearest each cell's centroid.")
+        del dense
+    step(0.6)
+
+    # Camera keyframes (all frames at once with NumPy, else per frame)
+    poses = keyframes = keep = None
+    with import_stage("camera poses", image_count(imgs)):
+        if isinstance(imgs, dict):
+            poses = compute_camera_poses(imgs, cams, sensor_mm, scale)
+        else:
+            keyframes = []
+            for i, (cid, qw, qx, qy, qz, tx, ty, tz) in enumerate(iter_image_poses(imgs)):
+                cdef = cams.get(cid)
+                if not cdef: continue
+                fl_mm = build_cam_params(cdef, sensor_mm)
+                m_c4d = colmap_to_c4d_matrix(qw, qx, qy, qz, tx*scale, ty*scale, tz*scale)
+                keyframes.append((c4d.BaseTime(i, fps), m_c4d, fl_mm))
+    step(0.7)
+    radius = (opts.get("tiles") or {}).get("near", 0.0)
+    if radius > 0 and poses is not None and levels and isinstance(levels[-1], dict):
+        mark_tiles_near_path(levels[-1], poses["pos"], radius)  # previs only on tiles near the camera path
+    if poses is not None and opts.get("reduce"):
+        with import_stage("key reduction", 7 * len(poses["frame"])):
+            keep = reduce_camera_keys(poses, *opts["reduce"])
+    quality = None
+    if image_stats is not None and poses is not None:
+        with import_stage("solve quality", len(poses["frame"])):
+            quality = solve_quality(image_stats, poses)
+    step(0.8)
+    frusta = None
+    if opts.get("frusta") and poses is not None and len(poses["pos"]):
+        fr = opts["frusta"]
+        with import_stage("camera frusta mesh", len(poses["pos"])):
+            c0 = cams.get(first_camera_id(imgs))
+            aspect = c0["height"] / c0["width"] if c0 and c0["width"] else 9.0 / 16.0
+            frusta = frustum_mesh(poses, sensor_mm, aspect, fr.get("size") or frustum_size(poses["pos"], scale), max(1, fr.get("step", 1)))
+    ground = None
+    if opts.get("orient") and poses is not None:
+        cloud = levels or dense_levels
+        with import_stage("ground plane", _level_count(cloud[0]) if cloud else 0):
+            xyz = cloud[0]["xyz"] if cloud and isinstance(cloud[0], dict) else cloud[0] if cloud else ()
+            plane = fit_ground_plane(xyz, camera_up(poses["rot"]), poses["pos"]) if len(xyz) else None
+        if plane:
+            rot, off = ground_alignment(plane[0], plane[1], camera_up(poses["rot"]))
+            ground = {"rot": rot, "off": off, "inliers": plane[2]}
+        else:
+            warnings.append("Auto-orient found no ground plane below the cameras; the scene was left unrotated.")
+    step(0.9)
+    stmaps = {}
+    if opts.get("stmaps") and np is not None:
+        with import_stage("st-maps") as st:
+            try:
+                stmaps = write_stmaps(cams, os.path.join(scene_folder_of(sparse), STMAP_DIR), opts["stmaps"],
+                                      progress=lambda f: step(0.9 + 0.1 * f))
+            except OSError as e:
+                warnings.append(f"ST-maps could not be written: {e}")
+            st["count"] = len(stmaps)
+        for cid, e in sorted(stmaps.items()):
+            if e.get("unresolved"):
+                warnings.append(f"ST-map of camera {cid}: {e['unresolved']} plate pixels lie past the lens model's invertible "
+                                "radius; their redistort values are extrapolated.")
+    step(1.0)
+    return {
+        "frames": image_count(imgs), "camera0": cams.get(first_camera_id(imgs)),
+        "poses": poses, "keep": keep, "keyframes": keyframes,
+        "levels": levels, "colors": colors, "points_total": pts_total, "points_kept": pts_kept, "points_outliers": pts_outliers,
+        "dense_levels": dense_levels, "dense_colors": dense_colors, "dense_total": dense_total,
+        "dense_kept": _level_count(dense_levels[0]) if dense_levels else 0, "ground": ground, "visibility": visibility, "frusta": frusta, "quality": quality, "stmaps": stmaps, "warnings": warnings,
+    }
+
+def _scene_summary(prep):
+    c0 = prep["camera0"]
+    return {"frames": prep["frames"], "points_total": prep["points_total"], "points_kept": prep["points_kept"],
+            "points_outliers": prep["points_outliers"], "dense_total": prep.get("dense_total", 0),
+            "dense_kept": prep.get("dense_kept", 0), "stmaps": len(prep.get("stmaps") or {}), "keys_written": 0, "keys_total": 0,
+            "ground": prep["ground"]["inliers"] if prep.get("ground") else None,
+            "visible_mean": prep["visibility"]["mean"] if prep.get("visibility") else 0,
+            "frusta": len(prep["frusta"][1]) // 5 if prep.get("frusta") else 0,
+            "quality_worst": worst_frames(prep["quality"]) if prep.get("quality") else [],
+            "updated": False, "points_written": 0, "warnings": list(prep.get("warnings", [])), "resolved": {},
+            "resolution": f"{int(c0['width'])} x {int(c0['height'])}" if c0 else "Unknown"}
+
+def build_scene(doc, prep, opts):
+    """
+    Create the scene for a prepare_import() result (main thread only). Returns a summary dict; non-fatal
+    problems are collected in summary["warnings"]. Raises RuntimeError when the RS camera plugin is missing.
+    """
+    sensor_mm, fps = opts["sensor_mm"], opts["fps"]
+    n, c0 = prep["frames"], prep["camera0"]
+    summary = _scene_summary(prep)
+    if opts.get("update"):
+        previous = find_previous_import(doc) if prep["poses"] is not None else None
+        if previous: return update_scene(doc, prep, opts, previous)
+        summary["warnings"].append("No earlier import found in this document to update; the scene was imported in full.")
+
+    doc.StartUndo()
+    try:
+        # Renamed root group
+        root = ensure_null(doc, "GLoMap_Scene_Orient")
+        set_timeline(doc, n, fps)
+        if prep.get("ground"): root.SetMg(pose_to_c4d_matrix(prep["ground"]["rot"], prep["ground"]["off"]))
+
+        # Points first (Matrix + reference polygon)
+        if prep["levels"]:
+            add_matrix_previs(doc, import_point_lods(doc, prep["levels"], parent=root, colors=prep.get("colors")), parent=None)
+        if prep.get("dense_levels"):  # no Matrix previs: the dense cloud is viewed as points
+            import_point_lods(doc, prep["dense_levels"], parent=root, name="GLoMap_DenseCloud", colors=prep.get("dense_colors"))
+        if prep.get("visibility"):
+            add_visible_points(doc, prep["visibility"], parent=root)
+        if prep.get("frusta"):
+            add_camera_frusta(doc, prep["frusta"], parent=root)
+
+        # RS camera
+        rs_id = find_rs_camera_object_id()
+        if not rs_id:
+            raise RuntimeError("Redshift Camera object plugin not found. No RS camera created.")
+
+        rs_cam = c4d.BaseObject(rs_id)
+        rs_cam.SetName("RS_GLoMap_Animated_Camera")  # renamed
+        rs_cam.InsertUnder(root)
+        poses = prep["poses"]
+        with import_stage("bake camera") as st:
+            if poses is not None:
+                summary["keys_total"] = 7 * len(poses["frame"])
+                summary["keys_written"] = bake_poses_to_camera(rs_cam, poses, sensor_mm, fps, keep=prep["keep"])
+            else:
+                summary["keys_total"] = summary["keys_written"] = 7 * len(prep["keyframes"])
+                bake_keys_to_camera(rs_cam, prep["keyframes"], sensor_mm)
+            st["count"] = summary["keys_written"]
+
+        # Duplicate + Constraint
+        dup_cam = None
+        try:
+            dup_cam = rs_cam.GetClone()
+            dup_cam.SetName("RS_GLoMap_Render_Camera")  # renamed
+            doc.InsertObject(dup_cam)  # at scene root
+
+            setup_constraint_follow(dup_cam, rs_cam)
+            dup_cam.Message(c4d.MSG_UPDATE)
+        except Exception as e:
+            summary["warnings"].append(f"Camera duplication/constraint failed: {e}")
+
+        # Hashes for a later update_scene (after the clone, so only the animated camera carries them)
+        if poses is not None:
+            with import_stage("stamp hashes"):
+                set_import_meta(rs_cam, pose_hashes(poses), _camera_signature(fps, prep["keep"]), poses["frame"])
+                stamp_point_levels(doc, prep["levels"], prep.get("colors"), "GLoMap_SparseCloud")
+                stamp_point_levels(doc, prep.get("dense_levels") or [], prep.get("dense_colors"), "GLoMap_DenseCloud")
+        if prep.get("quality"):
+            bake_quality_channels(rs_cam, prep["quality"], fps)
+
+        # ---------- Render Output ----------
+        res_w = res_h = None
+        try:
+            if c0:
+                res_w = int(c0["width"])
+                res_h = int(c0["height"])
+        except Exception:
+            pass
+
+        try:
+            rd = doc.GetActiveRenderData()
+            if rd:
+                if res_w and res_h:
+                    rd[c4d.RDATA_XRES] = res_w
+                    rd[c4d.RDATA_YRES] = res_h
+                try:
+                    rd[c4d.RDATA_FRAMESEQUENCE] = c4d.RDATA_FRAMESEQUENCE_PREVIEWRANGE
+                except Exception:
+                    loop_min = doc.GetLoopMinTime()
+                    loop_max = doc.GetLoopMaxTime()
+                    rd[c4d.RDATA_FRAMESEQUENCE] = c4d.RDATA_FRAMESEQUENCE_MANUAL
+                    rd[c4d.RDATA_FRAMEFROM] = loop_min
+                    rd[c4d.RDATA_FRAMETO]   = loop_max
+                try:
+                    rd[c4d.RDATA_FILMASPECT] = c4d.RDATA_FILMASPECT_CUSTOM
+                except Exception:
+                    pass
+                try:
+                    rd[c4d.RDATA_PIXELASPECT] = 1.0
+                except Exception:
+                    pass
+        except Exception:
+            pass
+
+        c4d.EventAdd()
+    finally:
+        doc.EndUndo()
+    summary["resolved"] = resolved_ids()
+    return summary
+
+def update_scene(doc, prep, opts, previous):
+    """
+    Apply a re-solved model to an earlier import, rewriting only the camera keys and point blocks that changed.
+    Returns a build_scene summary with updated=True.
+    """
+    root, cam = previous
+    summary = _scene_summary(prep)
+    summary["updated"], poses = True, prep["poses"]
+    doc.StartUndo()
+    try:
+        set_timeline(doc, prep["frames"], opts["fps"])
+        if prep.get("ground"): root.SetMg(pose_to_c4d_matrix(prep["ground"]["rot"], prep["ground"]["off"]))
+        with import_stage("update points") as st:
+            st["count"] = summary["points_written"] = (
+                update_point_levels(doc, root, prep["levels"], prep.get("colors"), "GLoMap_SparseCloud", previs=True)
+                + update_point_levels(doc, root, prep.get("dense_levels") or [], prep.get("dense_colors"), "GLoMap_DenseCloud", previs=False))
+        if prep.get("visibility") and doc.SearchObject("GLoMap_VisiblePoints") is None:
+            add_visible_points(doc, prep["visibility"], parent=root)  # an existing one reloads the rewritten index
+        if prep.get("frusta"):  # derived from every pose: rebuilt rather than patched
+            old = doc.SearchObject("GLoMap_Camera_Frusta")
+            if old is not None: old.Remove()
+            add_camera_frusta(doc, prep["frusta"], parent=root)
+        with import_stage("update camera") as st:
+            summary["keys_total"] = 7 * len(poses["frame"])
+            st["count"] = summary["keys_written"] = update_camera_keys(cam, poses, opts["sensor_mm"], opts["fps"], keep=prep["keep"])
+        if prep.get("quality"):  # cheap next to the pose keys: rewritten in full
+            bake_quality_channels(cam, prep["quality"], opts["fps"])
+        c4d.EventAdd()
+    finally:
+        doc.EndUndo()
+    summary["resolved"] = resolved_ids()
+    return summary
+
+def prepare_models(models, opts, report=None, pool=None):
+    """
+    prepare_import for several sub-models [(folder, fmt)] on parallel threads -> [(model_id, prep)]. Their
+    memory peak is one "models" stage (tracemalloc is process-wide).
+    """
+    report = report or ImportProgress()
+    if len(models) == 1:
+        return [(model_id(models[0][0]), prepare_import(models[0][0], models[0][1], opts, report, pool))]
+    stats = getattr(_active_stats, "stats", None)
+
+    def run(folder, fmt):
+        sub = ImportStats()  # per thread: ImportStats is thread-local and not shared across threads
+        with sub:
+            return prepare_import(folder, fmt, opts, _ScopedProgress(report, f"[{model_id(folder)}] "), pool), sub.stages
+
+    with import_stage("models", len(models)), \
+         ThreadPoolExecutor(max_workers=len(models), thread_name_prefix="COLMAP model") as workers:
+        futures = [workers.submit(run, folder, fmt) for folder, fmt in models]
+        results = [f.result() for f in futures]
+    if stats is not None:
+        for _, stages in results: stats.stages.extend(stages)
+    return [(model_id(folder), prep) for (folder, _), (prep, _) in zip(models, results)]
+
+MODEL_TOP_OBJECTS = ("GLoMap_Scene_Orient", "RS_GLoMap_Render_Camera", "SparceCloud_Matrix_Previs")
+_HOLD_SUFFIX = "_(held)"
+
+def _model_objects(doc, suffix):
+    return [o for o in (doc.SearchObject(name + suffix) for name in MODEL_TOP_OBJECTS) if o is not None]
+
+def _rename_trees(objs, add="", strip=""):
+    """Strip the name suffix 'strip' (where present), then append 'add', on objs and everything below them."""
+    stack = list(objs)
+    while stack:
+        op = stack.pop()
+        name = op.GetName()
+        if strip and name.endswith(strip): name = name[:-len(strip)]
+        op.SetName(name + add)
+        stack.extend(op.GetChildren())
+
+def build_models(doc, preps, opts):
+    """
+    build_scene (or update_scene) for each prepare_models entry; objects of every model but the first get
+    '_<model_id>' appended. Returns one summary per model.
+    """
+    summaries = []
+    for k, (mid, prep) in enumerate(preps):
+        if k == 0:
+            summary = build_scene(doc, prep, opts)
+        else:
+            suffix = f"_{mid}"
+            _rename_trees(_model_objects(doc, ""), add=_HOLD_SUFFIX)
+            _rename_trees(_model_objects(doc, suffix), strip=suffix)  # an earlier import of this model
+            try:
+                summary = build_scene(doc, prep, opts)
+            finally:
+                _rename_trees(_model_objects(doc, ""), add=suffix)
+                _rename_trees(_model_objects(doc, _HOLD_SUFFIX), strip=_HOLD_SUFFIX)
+        summary["model_id"] = mid
+        summaries.append(summary)
+    if len(preps) > 1: set_timeline(doc, max(prep["frames"] for _, prep in preps), opts["fps"])
+    return summaries
+
+class ImportJob(object):
+    """prepare_models() on a background thread; the dialog polls it from its timer."""
+    def __init__(self, models, opts, stats=None):
+        self.models, self.opts = models, opts
+        self.report = ImportProgress()
+        self.stats = stats or ImportStats()
+        self.result = self.error = None
+        self._thread = threading.Thread(target=self._run, name="COLMAP import", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def done(self):
+        return not self._thread.is_alive()
+
+    def _run(self):
+        try:
+            with self.stats, ThreadPoolExecutor(max_workers=3 * len(self.models), thread_name_prefix="COLMAP parse") as pool:
+                self.result = prepare_models(self.models, self.opts, self.report, pool)
+        except BaseException as e:  # handed to the main thread
+            self.error = e
+
 # ------------------------ UI ------------------------
 
 class ImportDialog(gui.GeDialog):
@@ -397,6 +3114,50 @@ class ImportDialog(gui.GeDialog):
     ID_FPS         = 1004
     ID_SCALE       = 1005
     ID_POINTS      = 1006
+    ID_CACHE       = 1007
+    ID_REDUCE      = 1008
+    ID_DECIMATE    = 1009
+
+    # Keyframe reduction tolerances
+    ID_TOL_POS     = 1020
+    ID_TOL_ANGLE   = 1021
+    ID_TOL_FOCAL   = 1022
+
+    # Point decimation: value (voxel size or budget), representative per cell, LOD count
+    ID_DECIMATE_VALUE = 1023
+    ID_DECIMATE_KEEP  = 1024
+    ID_LODS           = 1025
+
+    # Point quality: thresholds applied while parsing, statistical outlier removal afterwards (0 = off)
+    ID_MAX_ERROR      = 1026
+    ID_MIN_TRACK      = 1027
+    ID_SOR_K          = 1028
+    ID_SOR_STD        = 1029
+    ID_STATS          = 1030
+
+    # Point tiling: max points per tile (0 = one object), octree / grid, Matrix previs on all or near tiles
+    ID_TILE_POINTS    = 1031
+    ID_TILE_MODE      = 1032
+    ID_TILE_PREVIS    = 1033
+    ID_TILE_RADIUS    = 1034
+    ID_DENSE          = 1035
+    ID_COLORS         = 1036
+    ID_STMAPS         = 1037
+    ID_UPDATE         = 1038
+    ID_MODEL          = 1039  # sub-model under sparse/: ranked index, or _MODEL_ALL
+    ID_ORIENT         = 1040
+    ID_VISIBILITY     = 1041
+
+    # Camera frustum previs: every Nth image (0 = off), pyramid depth in scene units (0 = auto)
+    ID_FRUSTA         = 1042
+    ID_FRUSTA_SIZE    = 1043
+    ID_QUALITY        = 1044  # per-frame solve-quality User Data tracks on the animated camera
+
+    STATS_LOG = "colmap_import_stats.json"
+
+    _DECIMATE_OFF, _DECIMATE_VOXEL, _DECIMATE_BUDGET = 0, 1, 2
+    _MODEL_ALL = 999
+    _models = ()
 
     # Preset dropdown id
     ID_FPS_PRESET  = 1010
@@ -443,6 +3204,11 @@ class ImportDialog(gui.GeDialog):
         self.AddButton(self.ID_BTN_BROWSE, c4d.BFH_LEFT, 70, 0, "Browse…")
         self.GroupEnd()
         self.GroupEnd()
+        # --- Sub-model (sparse/0, sparse/1, …), ranked by registered images ---
+        self.GroupBegin(13, c4d.BFH_SCALEFIT, 2, 1)
+        self.AddStaticText(14, c4d.BFH_LEFT, 120, 0, "Model:")
+        self.AddComboBox(self.ID_MODEL, c4d.BFH_SCALEFIT, initw=250, inith=0)
+        self.GroupEnd()
         self.AddSeparatorH(0, c4d.BFH_SCALEFIT)
 
         # --- Sensor width ---
@@ -466,6 +3232,85 @@ class ImportDialog(gui.GeDialog):
 
         # --- Checkbox ---
         self.AddCheckbox(self.ID_POINTS, c4d.BFH_LEFT, 0, 0, "Import sparse point cloud")
+        self.AddCheckbox(self.ID_DENSE, c4d.BFH_LEFT, 0, 0, "Import dense cloud (dense/fused.ply)")
+        self.AddCheckbox(self.ID_COLORS, c4d.BFH_LEFT, 0, 0, "Point colours (Vertex Color tag)")
+        self.AddCheckbox(self.ID_ORIENT, c4d.BFH_LEFT, 0, 0, "Auto-orient (ground plane at Y=0)")
+        self.AddCheckbox(self.ID_VISIBILITY, c4d.BFH_LEFT, 0, 0, "Points seen by the current frame (previs)")
+        self.AddCheckbox(self.ID_QUALITY, c4d.BFH_LEFT, 0, 0, "Solve-quality channels (camera User Data)")
+
+        # --- Quality filters ---
+        self.GroupBegin(80, c4d.BFH_SCALEFIT, 3, 1)
+        self.AddStaticText(81, c4d.BFH_LEFT, 120, 0, "Max error / min track:")
+        self.AddEditNumberArrows(self.ID_MAX_ERROR, c4d.BFH_LEFT, 70, 0)
+        self.AddEditNumberArrows(self.ID_MIN_TRACK, c4d.BFH_LEFT, 70, 0)
+        self.GroupEnd()
+        self.GroupBegin(90, c4d.BFH_SCALEFIT, 3, 1)
+        self.AddStaticText(91, c4d.BFH_LEFT, 120, 0, "Outliers k / std:")
+        self.AddEditNumberArrows(self.ID_SOR_K, c4d.BFH_LEFT, 70, 0)
+        self.AddEditNumberArrows(self.ID_SOR_STD, c4d.BFH_LEFT, 70, 0)
+        self.GroupEnd()
+
+        # --- Decimation: Off / Voxel size (scene units) / Point budget ---
+        self.GroupBegin(60, c4d.BFH_SCALEFIT, 3, 1)
+        self.AddStaticText(61, c4d.BFH_LEFT, 120, 0, "Decimation:")
+        self.AddComboBox(self.ID_DECIMATE, c4d.BFH_LEFT, initw=110, inith=0)
+        self.AddChild(self.ID_DECIMATE, self._DECIMATE_OFF, "Off")
+        self.AddChild(self.ID_DECIMATE, self._DECIMATE_VOXEL, "Voxel size")
+        self.AddChild(self.ID_DECIMATE, self._DECIMATE_BUDGET, "Point budget")
+        self.AddEditNumberArrows(self.ID_DECIMATE_VALUE, c4d.BFH_LEFT, 90, 0)
+        self.GroupEnd()
+        self.GroupBegin(70, c4d.BFH_SCALEFIT, 3, 1)
+        self.AddStaticText(71, c4d.BFH_LEFT, 120, 0, "Per cell / LODs:")
+        self.AddComboBox(self.ID_DECIMATE_KEEP, c4d.BFH_LEFT, initw=110, inith=0)
+        self.AddChild(self.ID_DECIMATE_KEEP, 0, "Centroid")
+        self.AddChild(self.ID_DECIMATE_KEEP, 1, "Lowest error")
+        self.AddEditNumberArrows(self.ID_LODS, c4d.BFH_LEFT, 50, 0)
+        self.GroupEnd()
+
+        # --- Tiling: max points per tile object, octree / grid; previs on all tiles or near the camera ---
+        self.GroupBegin(100, c4d.BFH_SCALEFIT, 3, 1)
+        self.AddStaticText(101, c4d.BFH_LEFT, 120, 0, "Tile points / split:")
+        self.AddEditNumberArrows(self.ID_TILE_POINTS, c4d.BFH_LEFT, 90, 0)
+        self.AddComboBox(self.ID_TILE_MODE, c4d.BFH_LEFT, initw=110, inith=0)
+        self.AddChild(self.ID_TILE_MODE, 0, "Octree")
+        self.AddChild(self.ID_TILE_MODE, 1, "Grid")
+        self.GroupEnd()
+        self.GroupBegin(110, c4d.BFH_SCALEFIT, 3, 1)
+        self.AddStaticText(111, c4d.BFH_LEFT, 120, 0, "Previs tiles:")
+        self.AddComboBox(self.ID_TILE_PREVIS, c4d.BFH_LEFT, initw=110, inith=0)
+        self.AddChild(self.ID_TILE_PREVIS, 0, "All")
+        self.AddChild(self.ID_TILE_PREVIS, 1, "Near camera")
+        self.AddEditNumberArrows(self.ID_TILE_RADIUS, c4d.BFH_LEFT, 90, 0)
+        self.GroupEnd()
+
+        # --- Camera frusta: one merged object, every Nth registered image ---
+        self.GroupBegin(130, c4d.BFH_SCALEFIT, 3, 1)
+        self.AddStaticText(131, c4d.BFH_LEFT, 120, 0, "Frusta every / size:")
+        self.AddEditNumberArrows(self.ID_FRUSTA, c4d.BFH_LEFT, 70, 0)
+        self.AddEditNumberArrows(self.ID_FRUSTA_SIZE, c4d.BFH_LEFT, 70, 0)
+        self.GroupEnd()
+
+        # --- Lens distortion ST-maps written next to the sparse folder ---
+        self.GroupBegin(120, c4d.BFH_SCALEFIT, 2, 1)
+        self.AddStaticText(121, c4d.BFH_LEFT, 120, 0, "ST-maps:")
+        self.AddComboBox(self.ID_STMAPS, c4d.BFH_LEFT, initw=110, inith=0)
+        self.AddChild(self.ID_STMAPS, 0, "Off")
+        self.AddChild(self.ID_STMAPS, 1, "EXR")
+        self.AddChild(self.ID_STMAPS, 2, "Raw float32")
+        self.GroupEnd()
+
+        self.AddCheckbox(self.ID_UPDATE, c4d.BFH_LEFT, 0, 0, "Update previous import (changed keys / points only)")
+        self.AddCheckbox(self.ID_CACHE, c4d.BFH_LEFT, 0, 0, "Cache parsed model (faster re-import)")
+        self.AddCheckbox(self.ID_REDUCE, c4d.BFH_LEFT, 0, 0, "Reduce camera keyframes")
+        self.AddCheckbox(self.ID_STATS, c4d.BFH_LEFT, 0, 0, "Profile memory + write stats log")
+
+        # --- Reduction tolerances: position (scene units), angle (degrees), focal (mm) ---
+        self.GroupBegin(50, c4d.BFH_SCALEFIT, 4, 1)
+        self.AddStaticText(51, c4d.BFH_LEFT, 120, 0, "Tolerance P/°/mm:")
+        self.AddEditNumber(self.ID_TOL_POS, c4d.BFH_LEFT, 60, 0)
+        self.AddEditNumber(self.ID_TOL_ANGLE, c4d.BFH_LEFT, 60, 0)
+        self.AddEditNumber(self.ID_TOL_FOCAL, c4d.BFH_LEFT, 60, 0)
+        self.GroupEnd()
 
         # --- Buttons ---
         self.AddSeparatorH(0, c4d.BFH_SCALEFIT)
@@ -483,6 +3328,43 @@ class ImportDialog(gui.GeDialog):
         self.SetInt32(self.ID_FPS, fps, min=1, max=240, step=1)
         self.SetFloat(self.ID_SCALE, 100.0, min=0.0001, max=100000.0, step=0.1)
         self.SetBool(self.ID_POINTS, True)
+        self.SetBool(self.ID_DENSE, False)
+        self.Enable(self.ID_DENSE, np is not None)
+        self.SetBool(self.ID_COLORS, np is not None)
+        self.SetBool(self.ID_ORIENT, False)
+        self.SetBool(self.ID_VISIBILITY, False)
+        self.SetBool(self.ID_QUALITY, False)
+        self.SetBool(self.ID_CACHE, np is not None)
+        self.Enable(self.ID_CACHE, np is not None)
+        self.SetInt32(self.ID_FRUSTA, 0, min=0, max=100000, step=1)
+        self.SetFloat(self.ID_FRUSTA_SIZE, 0.0, min=0.0, max=100000.0, step=1.0)
+        self.Enable(self.ID_FRUSTA, np is not None)
+        self._enable_frusta()
+        self.SetInt32(self.ID_STMAPS, 0)
+        self.Enable(self.ID_STMAPS, np is not None)
+        self.SetBool(self.ID_UPDATE, np is not None and doc is not None and find_previous_import(doc) is not None)
+        self.Enable(self.ID_UPDATE, np is not None)
+        self.SetBool(self.ID_REDUCE, False)
+        self.SetBool(self.ID_STATS, False)
+        self.Enable(self.ID_REDUCE, np is not None)
+        self.SetFloat(self.ID_TOL_POS, 0.1, min=0.0, max=1000.0, step=0.01)
+        self.SetFloat(self.ID_TOL_ANGLE, 0.05, min=0.0, max=10.0, step=0.01)
+        self.SetFloat(self.ID_TOL_FOCAL, 0.01, min=0.0, max=10.0, step=0.01)
+        self._enable_tolerances()
+        self.SetInt32(self.ID_DECIMATE, self._DECIMATE_OFF)
+        self.SetInt32(self.ID_DECIMATE_KEEP, 0)
+        self.SetInt32(self.ID_LODS, 1, min=1, max=4, step=1)
+        self._apply_decimate_mode()
+        self.SetFloat(self.ID_MAX_ERROR, 0.0, min=0.0, max=100.0, step=0.1)
+        self.SetInt32(self.ID_MIN_TRACK, 0, min=0, max=1000, step=1)
+        self.SetInt32(self.ID_SOR_K, 0, min=0, max=64, step=1)
+        self.SetFloat(self.ID_SOR_STD, 2.0, min=0.1, max=10.0, step=0.1)
+        self._enable_quality()
+        self.SetInt32(self.ID_TILE_POINTS, 0, min=0, max=100000000, step=10000)
+        self.SetInt32(self.ID_TILE_MODE, 0)
+        self.SetInt32(self.ID_TILE_PREVIS, 0)
+        self.SetFloat(self.ID_TILE_RADIUS, 1000.0, min=0.0, max=10000000.0, step=100.0)
+        self._enable_tiles()
 
         # Initialize preset selection to best match current timeline fps
         init_pid = 999
@@ -494,160 +3376,405 @@ class ImportDialog(gui.GeDialog):
 
         return True
 
+    def _enable_tolerances(self):
+        on = np is not None and self.GetBool(self.ID_REDUCE)
+        for i in (self.ID_TOL_POS, self.ID_TOL_ANGLE, self.ID_TOL_FOCAL):
+            self.Enable(i, on)
+
+    def _apply_decimate_mode(self, reset_value=True):
+        mode = self.GetInt32(self.ID_DECIMATE)
+        if reset_value and mode == self._DECIMATE_VOXEL:
+            self.SetFloat(self.ID_DECIMATE_VALUE, 1.0, min=0.001, max=100000.0, step=0.1)
+        elif reset_value and mode == self._DECIMATE_BUDGET:
+            self.SetInt32(self.ID_DECIMATE_VALUE, 1000000, min=1000, max=1000000000, step=100000)
+        usable = np is not None and (self.GetBool(self.ID_POINTS) or self.GetBool(self.ID_DENSE))
+        self.Enable(self.ID_DECIMATE, usable)
+        for i in (self.ID_DECIMATE_VALUE, self.ID_DECIMATE_KEEP, self.ID_LODS):
+            self.Enable(i, usable and mode != self._DECIMATE_OFF)
+
+    def _enable_quality(self):
+        on = self.GetBool(self.ID_POINTS)
+        self.Enable(self.ID_MAX_ERROR, on)
+        self.Enable(self.ID_MIN_TRACK, on)
+        self.Enable(self.ID_SOR_K, on and np is not None)
+        self.Enable(self.ID_SOR_STD, on and np is not None)
+        self.Enable(self.ID_VISIBILITY, on and np is not None)
+        self.Enable(self.ID_QUALITY, on and np is not None)
+
+    def _enable_frusta(self):
+        self.Enable(self.ID_FRUSTA_SIZE, np is not None and self.GetInt32(self.ID_FRUSTA) > 0)
+
+    def _enable_tiles(self):
+        on = np is not None and (self.GetBool(self.ID_POINTS) or self.GetBool(self.ID_DENSE))
+        self.Enable(self.ID_COLORS, on)
+        self.Enable(self.ID_ORIENT, on)
+        self.Enable(self.ID_TILE_POINTS, on)
+        tiled = on and self.GetInt32(self.ID_TILE_POINTS) > 0
+        self.Enable(self.ID_TILE_MODE, tiled)
+        self.Enable(self.ID_TILE_PREVIS, tiled)
+        self.Enable(self.ID_TILE_RADIUS, tiled and self.GetInt32(self.ID_TILE_PREVIS) == 1)
+
     def Command(self, cid, msg):
         if cid == self.ID_BTN_BROWSE:
             p = c4d.storage.LoadDialog(flags=c4d.FILESELECT_DIRECTORY, title="Select Scene Folder")
-            if p: self.SetString(self.ID_SCENEFOLDER, p)
+            if p:
+                self.SetString(self.ID_SCENEFOLDER, p)
+                self._refresh_models()
+        elif cid == self.ID_SCENEFOLDER:  # typing: rescan only once the text names a new existing folder
+            folder = self.GetString(self.ID_SCENEFOLDER)
+            if os.path.isdir(folder) and os.path.normpath(folder) != self._models_folder:
+                self._refresh_models()
         elif cid == self.ID_FPS_PRESET:
             pid = self.GetInt32(self.ID_FPS_PRESET)
             self._apply_preset_to_spinner(pid)
+        elif cid == self.ID_REDUCE:
+            self._enable_tolerances()
+        elif cid == self.ID_DECIMATE:
+            self._apply_decimate_mode()
+        elif cid in (self.ID_POINTS, self.ID_DENSE):
+            self._apply_decimate_mode(reset_value=False)
+            self._enable_quality()
+            self._enable_tiles()
+        elif cid in (self.ID_TILE_POINTS, self.ID_TILE_PREVIS):
+            self._enable_tiles()
+        elif cid == self.ID_FRUSTA:
+            self._enable_frusta()
         elif cid == c4d.DLG_OK:
-            self.do_import(); self.Close()
+            if self._job is None and not self.do_import(): self.Close()
         elif cid == c4d.DLG_CANCEL:
-            self.Close()
+            if self._job is not None: self._job.report.cancel()
+            else: self.Close()
         return True
 
+    _job = None
+
+    _models_folder = None
+
+    def _refresh_models(self):
+        """Header-scan the scene folder's sub-models into the Model dropdown (best first)."""
+        folder = self.GetString(self.ID_SCENEFOLDER)
+        self._models = scan_sparse_models(folder) if folder and os.path.isdir(folder) else []
+        self._models_folder = os.path.normpath(folder) if self._models else None
+        self.FreeChildren(self.ID_MODEL)
+        for m in self._models:
+            self.AddChild(self.ID_MODEL, m["rank"], f"{m['id']}: {_count_text(m['images'])} images, {_count_text(m['points'])} points" + (" (best)" if not m["rank"] else ""))
+        if len(self._models) > 1:
+            self.AddChild(self.ID_MODEL, self._MODEL_ALL, f"All {len(self._models)} models")
+        self.SetInt32(self.ID_MODEL, 0)
+
+    def selected_models(self, scene_folder):
+        """[(folder, fmt)] to import: the dropdown's choice, all sub-models, or the best one."""
+        if not self._models or os.path.normpath(scene_folder_of(self._models[0]["folder"])) != os.path.normpath(scene_folder):
+            self._models = scan_sparse_models(scene_folder)
+        choice = self.GetInt32(self.ID_MODEL)
+        picked = self._models if choice == self._MODEL_ALL else [m for m in self._models if m["rank"] == choice][:1] or self._models[:1]
+        return [(m["folder"], m["fmt"]) for m in picked]
+
+    def read_options(self):
+        """Dialog values -> the opts dict used by prepare_import / build_scene."""
+        dec_mode = self.GetInt32(self.ID_DECIMATE) if np is not None else self._DECIMATE_OFF
+        value = self.GetFloat(self.ID_DECIMATE_VALUE)
+        sor_k = self.GetInt32(self.ID_SOR_K) if np is not None else 0
+        tile_points = self.GetInt32(self.ID_TILE_POINTS) if np is not None else 0
+        frusta = self.GetInt32(self.ID_FRUSTA) if np is not None else 0
+        return {
+            "sensor_mm": self.GetFloat(self.ID_SENSOR),
+            "fps":       self.GetInt32(self.ID_FPS),  # unchanged: integer timeline FPS
+            "scale":     self.GetFloat(self.ID_SCALE),
+            "points":    self.GetBool(self.ID_POINTS),
+            "cache":     self.GetBool(self.ID_CACHE),
+            "dense":     np is not None and self.GetBool(self.ID_DENSE),
+            "colors":    np is not None and self.GetBool(self.ID_COLORS),
+            "orient":    np is not None and self.GetBool(self.ID_ORIENT),
+            "visibility": np is not None and self.GetBool(self.ID_VISIBILITY),
+            "quality":   np is not None and self.GetBool(self.ID_QUALITY),
+            "frusta":    {"step": frusta, "size": self.GetFloat(self.ID_FRUSTA_SIZE)} if frusta else None,
+            "stmaps":    {1: "exr", 2: "raw"}.get(self.GetInt32(self.ID_STMAPS)) if np is not None else None,
+            "update":    np is not None and self.GetBool(self.ID_UPDATE),
+            "point_filter": {"max_error": self.GetFloat(self.ID_MAX_ERROR), "min_track_len": self.GetInt32(self.ID_MIN_TRACK)},
+            "sor": (sor_k, self.GetFloat(self.ID_SOR_STD)) if sor_k else None,
+            "decimate": None if dec_mode == self._DECIMATE_OFF else {
+                "voxel": value if dec_mode == self._DECIMATE_VOXEL else 0.0,
+                "budget": int(value) if dec_mode == self._DECIMATE_BUDGET else 0,
+                "mode": DECIMATE_BEST if self.GetInt32(self.ID_DECIMATE_KEEP) else DECIMATE_CENTROID,
+                "lods": self.GetInt32(self.ID_LODS)},
+            "reduce": (self.GetFloat(self.ID_TOL_POS), math.radians(self.GetFloat(self.ID_TOL_ANGLE)),
+                       self.GetFloat(self.ID_TOL_FOCAL)) if np is not None and self.GetBool(self.ID_REDUCE) else None,
+            "tiles": {"max_points": tile_points, "mode": TILE_GRID if self.GetInt32(self.ID_TILE_MODE) else TILE_OCTREE,
+                      "near": self.GetFloat(self.ID_TILE_RADIUS) if self.GetInt32(self.ID_TILE_PREVIS) else 0.0} if tile_points else None,
+        }
+
     def do_import(self):
+        """Validate, then parse on a worker thread; Timer() polls it and builds the scene when it is done."""
         scene_folder = self.GetString(self.ID_SCENEFOLDER)
         if not scene_folder or not os.path.isdir(scene_folder):
             gui.MessageDialog("Please select a valid SCENE folder (must contain 'sparse').")
-            return
-
-        sparse = find_sparse_txt_folder(scene_folder)
-        if not sparse:
-            gui.MessageDialog("Could not find a COLMAP TXT model under 'sparse'.")
-            return
+            return False
 
-        sensor_mm = self.GetFloat(self.ID_SENSOR)
-        fps       = self.GetInt32(self.ID_FPS)  # unchanged: integer timeline FPS
-        scale     = self.GetFloat(self.ID_SCALE)
-        do_points = self.GetBool(self.ID_POINTS)
+        models = self.selected_models(scene_folder)
+        if not models:
+            gui.MessageDialog("Could not find a COLMAP model (BIN or TXT) under 'sparse'.")
+            return False
 
-        cams = parse_cameras_txt(os.path.join(sparse, "cameras.txt"))
-        imgs = parse_images_txt(os.path.join(sparse, "images.txt"))
-        pts  = parse_points3D_txt(os.path.join(sparse, "points3D.txt")) if do_points else []
-        if not cams or not imgs:
-            gui.MessageDialog("Could not read cameras.txt / images.txt in the sparse model.")
-            return
+        self._scene_folder = scene_folder
+        self._job = ImportJob(models, self.read_options(), ImportStats(trace_memory=self.GetBool(self.ID_STATS))).start()
+        self.Enable(c4d.DLG_OK, False)
+        self.SetTimer(100)
+        return True
 
-        doc.StartUndo()
+    def Timer(self, msg):
+        job = self._job
+        if job is None: return
+        c4d.StatusSetText(job.report.text)
+        c4d.StatusSetBar(int(100 * job.report.fraction()))
+        if not job.done(): return
+        self._job = None
+        self.SetTimer(0)
+        c4d.StatusClear()
+        if job.error is None:
+            self.finish_import(job.result, job.opts, job.stats)
+        elif not isinstance(job.error, ImportCancelled):
+            err = job.error
+            gui.MessageDialog(str(err) if isinstance(err, ValueError) else f"Import failed: {err}")
+        self.Close()
+
+    def AskClose(self):
+        if self._job is not None:  # stop the worker first; Timer() closes the dialog once it has exited
+            self._job.report.cancel()
+            return True
+        return False
+
+    def finish_import(self, preps, opts, stats):
+        """Main thread: build the scene from the worker's result (prepare_models) and report."""
         try:
-            # Renamed root group
-            root = ensure_null(doc, "GLoMap_Scene_Orient")
-
-            # Timeline
-            if fps > 0: doc.SetFps(fps)
-            n = len(imgs)
-            doc.SetMinTime(c4d.BaseTime(0, fps))
-            doc.SetMaxTime(c4d.BaseTime(max(1, n), fps))
-            doc.SetTime(c4d.BaseTime(0, fps))
-            # Also set the Preview Range to match the full timeline
-            doc.SetLoopMinTime(c4d.BaseTime(0, fps))
-            doc.SetLoopMaxTime(c4d.BaseTime(max(1, n), fps))
-
-            # Points first (Matrix + reference polygon)
-            sparse_obj = None
-            if pts:
-                pts_scaled = [(x*scale, y*scale, z*scale) for (x,y,z) in pts]
-                sparse_obj = import_point_cloud(doc, pts_scaled, parent=root)
-                add_matrix_on_sparse_vertices(doc, sparse_obj, parent=None)
-
-            # Build camera keyframes
-            keyframes = []
-            for i, im in enumerate(imgs):
-                cdef = cams.get(im["camera_id"])
-                if not cdef: continue
-                fl_mm = build_cam_params(cdef, sensor_mm)
-                m_c4d = colmap_to_c4d_matrix(
-                    im["qw"], im["qx"], im["qy"], im["qz"],
-                    im["tx"]*scale, im["ty"]*scale, im["tz"]*scale
-                )
-                keyframes.append((c4d.BaseTime(i, fps), m_c4d, fl_mm))
-
-            # RS camera
-            rs_id = find_rs_camera_object_id()
-            if not rs_id:
-                gui.MessageDialog("Redshift Camera object plugin not found. No RS camera created.")
-                return
-
-            rs_cam = c4d.BaseObject(rs_id)
-            rs_cam.SetName("RS_GLoMap_Animated_Camera")  # renamed
-            rs_cam.InsertUnder(root)
-            bake_keys_to_camera(rs_cam, keyframes, sensor_mm)
-
-            # Duplicate + Constraint
-            dup_cam = None
-            try:
-                dup_cam = rs_cam.GetClone()
-                dup_cam.SetName("RS_GLoMap_Render_Camera")  # renamed
-                doc.InsertObject(dup_cam)  # at scene root
-
-                setup_constraint_follow(dup_cam, rs_cam)
-                dup_cam.Message(c4d.MSG_UPDATE)
-            except Exception as e:
-                gui.MessageDialog(f"Camera duplication/constraint failed: {e}")
-
-            # ---------- Render Output ----------
-            res_w = res_h = None
+            with stats, import_stage("build scene"):
+                summaries = build_models(doc, preps, opts)
+        except RuntimeError as e:
+            gui.MessageDialog(str(e))
+            return
+        summary = summaries[0]
+        for other in summaries[1:]:
+            summary["warnings"].extend(f"Model {other['model_id']}: {w}" for w in other["warnings"])
+        log_note = ""
+        if stats.trace_memory:
             try:
-                if imgs:
-                    c0 = cams.get(imgs[0]["camera_id"])
-                    if c0:
-                        res_w = int(c0["width"])
-                        res_h = int(c0["height"])
-            except Exception:
-                pass
-
-            try:
-                rd = doc.GetActiveRenderData()
-                if rd:
-                    if res_w and res_h:
-                        rd[c4d.RDATA_XRES] = res_w
-                        rd[c4d.RDATA_YRES] = res_h
-                    try:
-                        rd[c4d.RDATA_FRAMESEQUENCE] = c4d.RDATA_FRAMESEQUENCE_PREVIEWRANGE
-                    except Exception:
-                        loop_min = doc.GetLoopMinTime()
-                        loop_max = doc.GetLoopMaxTime()
-                        rd[c4d.RDATA_FRAMESEQUENCE] = c4d.RDATA_FRAMESEQUENCE_MANUAL
-                        rd[c4d.RDATA_FRAMEFROM] = loop_min
-                        rd[c4d.RDATA_FRAMETO]   = loop_max
-                    try:
-                        rd[c4d.RDATA_FILMASPECT] = c4d.RDATA_FILMASPECT_CUSTOM
-                    except Exception:
-                        pass
-                    try:
-                        rd[c4d.RDATA_PIXELASPECT] = 1.0
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-
-            c4d.EventAdd()
-        finally:
-            doc.EndUndo()
+                log_note = "Stats log: " + stats.write_json(os.path.join(self._scene_folder, self.STATS_LOG),
+                                                            scene=self._scene_folder, summary=summary) + "\n"
+            except (IOError, OSError, TypeError, ValueError) as e:
+                log_note = f"Stats log not written: {e}\n"
+        if summary["warnings"]:
+            gui.MessageDialog("\n\n".join(summary["warnings"]))
 
         # ------- Final concise message -------
-        res_text = "Unknown"
-        try:
-            c0 = cams.get(imgs[0]["camera_id"])
-            if c0:
-                res_text = f"{int(c0['width'])} x {int(c0['height'])}"
-        except Exception:
-            pass
-
+        pts_outliers = summary["points_outliers"]
+        keys = (f"Camera keys: {summary['keys_written']} of {summary['keys_total']} rewritten, {summary['points_written']} points rewritten\n"
+                if summary["updated"] else
+                f"Camera keys: {summary['keys_written']} written, {summary['keys_total'] - summary['keys_written']} removed\n")
         gui.MessageDialog(
-            "Scene import successful\n"
-            f"Resolution: {res_text}\n"
-            f"Duration: {n} frames\n"
-            "To visualise the point cloud, select the 'SparceCloud_Matrix_Previs' object and set Distribution to Vertex."
+            ("Scene update successful\n" if summary["updated"] else "Scene import successful\n") +
+            f"Resolution: {summary['resolution']}\n"
+            f"Duration: {summary['frames']} frames\n" + keys +
+            f"Sparse points: {summary['points_kept']} of {summary['points_total']}" + (f", {pts_outliers} outliers removed" if pts_outliers else "") + "\n"
+            + (f"Dense points: {summary['dense_kept']} of {summary['dense_total']}\n" if summary["dense_total"] else "")
+            + (f"Visible points: {summary['visible_mean']} per frame on average in 'GLoMap_VisiblePoints'\n" if summary["visible_mean"] else "")
+            + (f"Camera frusta: {summary['frusta']} in 'GLoMap_Camera_Frusta'\n" if summary["frusta"] else "")
+            + ("Weakest frames: " + ", ".join(f"{w['frame']} ({w['triangulated']:.0f}/{w['observed']:.0f} points, track error {w['error']:.2f} px, jump {w['jump']:.2f})"
+                                              for w in summary["quality_worst"]) + "\n" if summary["quality_worst"] else "")
+            + (f"Ground plane: levelled at Y=0 ({summary['ground']:.0%} of the points on it)\n" if summary["ground"] is not None else "")
+            + (f"ST-maps: {summary['stmaps']} camera(s) in '{STMAP_DIR}'\n" if summary["stmaps"] else "")
+            + "".join(f"Model {o['model_id']} (objects '_{o['model_id']}'): {o['frames']} frames, {o['points_kept']} points\n" for o in summaries[1:]) +
+            "Resolved IDs: " + (", ".join(f"{k} {_format_resolved(v)}" for k, v in sorted(summary["resolved"].items())) or "none") + "\n"
+            "Slowest stages:\n" + "\n".join(stats.breakdown()) + "\n" + log_note
+            + ("To visualise the point cloud, select the 'SparceCloud_Matrix_Previs' object and set Distribution to Vertex."
+               if summary["points_kept"] and "matrix_vertex" not in summary["resolved"] else "")
         )
 
+# ------------------------ Batch (headless) ------------------------
+# c4dpy COLMAP_Tracking_Importer_C4D_v1_3.py --batch "shots/*/" --fps 25 --out renders/c4d --jobs 4
+# Same pipeline as the dialog (prepare_import + build_scene), one saved .c4d per scene folder, no dialogs.
+
+BATCH_SUMMARY = "colmap_batch_summary.json"
+
+def expand_scene_folders(patterns):
+    """Scene folders (paths or globs) that contain a COLMAP model, sorted, without duplicates."""
+    found = []
+    for pat in patterns:
+        for path in sorted(glob.glob(pat)) or [pat]:
+            path = os.path.normpath(path)
+            if os.path.isdir(path) and path not in found: found.append(path)
+    return found
+
+def batch_output_paths(folders, out_dir=None):
+    """<out_dir>/<scene name>.c4d (numbered on name clashes), or <scene>/<scene name>.c4d without out_dir."""
+    paths, used = [], set()
+    for folder in folders:
+        name = os.path.basename(os.path.abspath(folder)) or "scene"
+        base = os.path.join(out_dir or folder, name)
+        path, i = base + ".c4d", 1
+        while path in used:
+            i += 1
+            path = f"{base}_{i}.c4d"
+        used.add(path)
+        paths.append(path)
+    return paths
+
+def import_shot(scene_folder, opts, out_path, trace_memory=False):
+    """Import one scene folder into a new document and save it. Returns a JSON-ready record (never raises)."""
+    rec = {"scene": scene_folder, "output": out_path, "status": "failed"}
+    timings = rec["timings"] = {}
+    stats = ImportStats(trace_memory)
+    t0 = t = time.perf_counter()
+    try:
+        with stats:
+            models = select_models(scene_folder, opts.get("models", "best"))
+            if not models:
+                raise ValueError("Could not find a COLMAP model (BIN or TXT) under 'sparse'.")
+            rec["model"] = models[0][0]
+            with ThreadPoolExecutor(max_workers=3 * len(models)) as pool:
+                preps = prepare_models(models, opts, pool=pool)
+            timings["prepare"], t = time.perf_counter() - t, time.perf_counter()
+
+            shot_doc = None
+            if opts.get("update") and os.path.isfile(out_path):  # re-solved shot: patch the saved scene
+                shot_doc = c4d.documents.LoadDocument(out_path, c4d.SCENEFILTER_OBJECTS | c4d.SCENEFILTER_MATERIALS, None)
+            shot_doc = shot_doc or c4d.documents.BaseDocument()
+            with import_stage("build scene"):
+                summary, *others = build_models(shot_doc, preps, opts)
+            del preps
+            if others: rec["models"] = [{k: o[k] for k in ("model_id", "frames", "points_kept", "keys_written", "warnings")} for o in others]
+            timings["build"], t = time.perf_counter() - t, time.perf_counter()
+
+            out_dir = os.path.dirname(out_path)
+            if out_dir: os.makedirs(out_dir, exist_ok=True)
+            with import_stage("save"):
+                if not c4d.documents.SaveDocument(shot_doc, out_path, c4d.SAVEDOCUMENTFLAGS_DONTADDTORECENTLIST, c4d.FORMAT_C4DEXPORT):
+                    raise IOError(f"Could not save {out_path}")
+            timings["save"] = time.perf_counter() - t
+            rec.update(summary, status="ok")
+    except Exception as e:
+        rec["error"] = f"{type(e).__name__}: {e}"
+    timings["total"] = time.perf_counter() - t0
+    rec["stages"] = stats.stages
+    return rec
+
+def batch_import(folders, opts, out_dir=None, jobs=1, log=print, trace_memory=False):
+    """
+    Import every scene folder over 'jobs' worker processes; jobs > 1 needs this file run as the main script
+    (c4dpy … --batch). Shots of a dead worker are recorded as failed.
+    """
+    shots = list(zip(folders, batch_output_paths(folders, out_dir)))
+    records = {}
+    def done(rec):
+        records[rec["scene"]] = rec
+        log(f"[{len(records)}/{len(shots)}] {rec['status']:6s} {rec['scene']}" + (f"  ({rec['error']})" if rec.get("error") else ""))
+    if jobs > 1 and len(shots) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(shots))) as procs:
+                futures = [procs.submit(import_shot, folder, opts, out, trace_memory) for folder, out in shots]
+                for f in futures: done(f.result())
+        except BrokenProcessPool as e:
+            for folder, out in shots:
+                if folder not in records:
+                    done({"scene": folder, "output": out, "status": "failed", "error": f"Worker process died ({e}); rerun with --jobs 1."})
+    for folder, out in shots:
+        if folder not in records: done(import_shot(folder, opts, out, trace_memory))
+    return [records[folder] for folder, _ in shots]
+
+def batch_arg_parser():
+    ap = argparse.ArgumentParser(description="Import COLMAP/GLoMap scene folders into one .c4d per shot (no dialogs).")
+    ap.add_argument("scenes", nargs="+", help="scene folders or globs (each containing 'sparse')")
+    ap.add_argument("--out", help="folder for the .c4d files (default: inside each scene folder)")
+    ap.add_argument("--summary", help=f"JSON summary path (default: <out or cwd>/{BATCH_SUMMARY})")
+    ap.add_argument("--trace-memory", action="store_true", help="record per-stage peak memory (tracemalloc)")
+    ap.add_argument("--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="worker processes")
+    ap.add_argument("--sensor", type=float, default=36.0, help="sensor width (mm)")
+    ap.add_argument("--fps", type=int, default=24)
+    ap.add_argument("--scale", type=float, default=100.0)
+    ap.add_argument("--models", default="best",
+                    help="sub-models under sparse/: 'best' (most registered images), 'all', or ids like '0,2'")
+    ap.add_argument("--no-points", dest="points", action="store_false", help="skip the sparse point cloud")
+    ap.add_argument("--no-cache", dest="cache", action="store_false", help="do not read/write the parsed-model cache")
+    ap.add_argument("--update", action="store_true", help="update existing output .c4d files in place (changed keys / points only)")
+    ap.add_argument("--dense", action="store_true", help="also import the scene's dense/fused.ply")
+    ap.add_argument("--no-colors", dest="colors", action="store_false", help="no Vertex Color tags from the point colours")
+    ap.add_argument("--auto-orient", dest="orient", action="store_true", help="level the scene on a fitted ground plane (Y=0)")
+    ap.add_argument("--visible-points", dest="visibility", action="store_true",
+                    help=f"per-frame visible-point index (<scene>/{VISIBILITY_DIR}) and GLoMap_VisiblePoints previs")
+    ap.add_argument("--quality", action="store_true", help="per-frame solve-quality User Data tracks on the animated camera")
+    ap.add_argument("--frusta", type=int, default=0, help="camera frustum previs for every Nth image, 0 = off")
+    ap.add_argument("--frustum-size", type=float, default=0.0, help="frustum depth (scene units), 0 = auto")
+    ap.add_argument("--stmaps", choices=("exr", "raw"), help=f"write undistort / redistort ST-maps into <scene>/{STMAP_DIR}")
+    ap.add_argument("--max-error", type=float, default=0.0, help="max reprojection error (px), 0 = off")
+    ap.add_argument("--min-track", type=int, default=0, help="min track length, 0 = off")
+    ap.add_argument("--sor-k", type=int, default=0, help="outlier removal neighbours, 0 = off")
+    ap.add_argument("--sor-std", type=float, default=2.0)
+    ap.add_argument("--voxel", type=float, default=0.0, help="decimation voxel size (scene units)")
+    ap.add_argument("--budget", type=int, default=0, help="decimation point budget")
+    ap.add_argument("--keep", choices=("centroid", "lowest-error"), default="centroid", help="point kept per voxel")
+    ap.add_argument("--lods", type=int, default=1)
+    ap.add_argument("--reduce", action="store_true", help="reduce camera keyframes")
+    ap.add_argument("--tol-pos", type=float, default=0.1)
+    ap.add_argument("--tol-angle", type=float, default=0.05, help="degrees")
+    ap.add_argument("--tol-focal", type=float, default=0.01)
+    ap.add_argument("--tile-points", type=int, default=0, help="max points per point cloud tile, 0 = one object")
+    ap.add_argument("--tile-mode", choices=(TILE_OCTREE, TILE_GRID), default=TILE_OCTREE)
+    ap.add_argument("--previs-near", type=float, default=0.0,
+                    help="Matrix previs only on tiles within this distance of the camera path (scene units), 0 = all")
+    return ap
+
+def batch_options(args):
+    """argparse namespace -> the same opts dict ImportDialog.read_options() builds."""
+    numpy_only = np is not None
+    return {
+        "sensor_mm": args.sensor, "fps": args.fps, "scale": args.scale, "models": args.models,
+        "points": args.points, "cache": args.cache and numpy_only, "dense": args.dense and numpy_only,
+        "colors": args.colors and numpy_only, "orient": args.orient and numpy_only,
+        "visibility": args.visibility and numpy_only, "quality": args.quality and numpy_only, "stmaps": args.stmaps if numpy_only else None,
+        "update": args.update and numpy_only,
+        "frusta": {"step": args.frusta, "size": args.frustum_size} if numpy_only and args.frusta > 0 else None,
+        "point_filter": {"max_error": args.max_error, "min_track_len": args.min_track},
+        "sor": (args.sor_k, args.sor_std) if numpy_only and args.sor_k else None,
+        "decimate": {"voxel": args.voxel, "budget": 0 if args.voxel else args.budget,
+                     "mode": DECIMATE_BEST if args.keep == "lowest-error" else DECIMATE_CENTROID,
+                     "lods": args.lods} if numpy_only and (args.voxel or args.budget) else None,
+        "reduce": (args.tol_pos, math.radians(args.tol_angle), args.tol_focal) if numpy_only and args.reduce else None,
+        "tiles": {"max_points": args.tile_points, "mode": args.tile_mode, "near": args.previs_near}
+                 if numpy_only and args.tile_points > 0 else None,
+    }
+
+def batch_main(argv):
+    """Command line entry point; returns the process exit code (1 if any shot failed)."""
+    args = batch_arg_parser().parse_args(argv)
+    folders = expand_scene_folders(args.scenes)
+    if not folders:
+        print("No scene folders matched.", file=sys.stderr)
+        return 2
+    opts = batch_options(args)
+    t0 = time.perf_counter()
+    records = batch_import(folders, opts, args.out, args.jobs, trace_memory=args.trace_memory)
+    failed = [r for r in records if r["status"] != "ok"]
+    report = {"options": opts, "seconds": time.perf_counter() - t0, "ok": len(records) - len(failed),
+              "failed": len(failed), "shots": records}
+    summary_path = args.summary or os.path.join(args.out or os.getcwd(), BATCH_SUMMARY)
+    if os.path.dirname(summary_path): os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"{report['ok']} imported, {report['failed']} failed in {report['seconds']:.1f}s -> {summary_path}")
+    return 1 if failed else 0
+
 # ------------------------ Main ------------------------
 
-def main():
+BATCH_FLAG = "--batch"
+
+def main(argv=None):
+    # c4dpy with --batch first -> headless batch import (returns its exit code), otherwise the dialog;
+    # other arguments a host leaves in sys.argv are ignored
+    argv = [a for a in (getattr(sys, "argv", [])[1:] if argv is None else argv) if a]
+    if argv[:1] == [BATCH_FLAG]:
+        return batch_main(argv[1:])
     # Compact width by default
     ImportDialog().Open(c4d.DLG_TYPE_MODAL, defaultw=350, defaulth=0)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    code = main()
+    if code is not None: sys.exit(code)
\ No newline at end of file
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Loads the importer script as a module. Outside Cinema 4D (no c4d), tests/stubs provides a minimal c4d.
+# The synthetic model writer from benchmarks/ is shared as a fixture too.
+# MIT
+
+import os, sys, importlib.util
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMPORTER = os.path.join(HERE, os.pardir, "src", "COLMAP_Tracking_Importer_C4D_v1_3.py")
+SYNTHETIC = os.path.join(HERE, os.pardir, "benchmarks", "synthetic_model.py")
+
+try:
+    import c4d  # noqa: F401  (c4dpy)
+except ImportError:
+    sys.path.insert(0, os.path.join(HERE, "stubs"))
+
+def _load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+@pytest.fixture(scope="session")
+def importer():
+    return _load("colmap_importer", IMPORTER)
+
+@pytest.fixture(scope="session")
+def synthetic():
+    pytest.importorskip("numpy")
+    return _load("synthetic_model", SYNTHETIC)
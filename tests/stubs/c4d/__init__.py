@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+# Minimal stand-in for Cinema 4D's c4d module so the importer can be tested and benchmarked headless:
+# vector math, objects / tags / parameters, CTrack / CCurve / CKey animation and a document with
+# render data. Only what the importer uses is implemented and IDs are stand-ins, not Cinema 4D's
+# values; the real module always wins when it is importable (c4dpy).
+# MIT
+
+import math, struct
+from array import array
+
+ROTATIONORDER_DEFAULT = 6
+
+class Vector(object):
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x=0.0, y=None, z=None):
+        if y is None and z is None:
+            y = z = x
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    def __add__(self, o): return Vector(self.x + o.x, self.y + o.y, self.z + o.z)
+    def __sub__(self, o): return Vector(self.x - o.x, self.y - o.y, self.z - o.z)
+    def __neg__(self): return Vector(-self.x, -self.y, -self.z)
+
+    def __mul__(self, o):
+        if isinstance(o, Vector):  # dot product, as in c4d
+            return self.x * o.x + self.y * o.y + self.z * o.z
+        return Vector(self.x * o, self.y * o, self.z * o)
+    __rmul__ = __mul__
+
+    def __eq__(self, o):
+        return isinstance(o, Vector) and (self.x, self.y, self.z) == (o.x, o.y, o.z)
+
+    def GetLength(self): return math.sqrt(self * self)
+    def GetNormalized(self):
+        l = self.GetLength()
+        return Vector(self.x / l, self.y / l, self.z / l) if l else Vector(self.x, self.y, self.z)
+
+    def __repr__(self): return f"Vector({self.x}, {self.y}, {self.z})"
+
+class Matrix(object):
+    """off + v1*x + v2*y + v3*z, like c4d.Matrix."""
+
+    def __init__(self, off=None, v1=None, v2=None, v3=None):
+        self.off = off if off is not None else Vector(0.0)
+        self.v1 = v1 if v1 is not None else Vector(1.0, 0.0, 0.0)
+        self.v2 = v2 if v2 is not None else Vector(0.0, 1.0, 0.0)
+        self.v3 = v3 if v3 is not None else Vector(0.0, 0.0, 1.0)
+
+    def MulV(self, v):
+        return self.v1 * v.x + self.v2 * v.y + self.v3 * v.z
+
+    def Mul(self, v):
+        return self.off + self.MulV(v)
+
+    def __mul__(self, o):
+        if isinstance(o, Matrix):
+            return Matrix(self.Mul(o.off), self.MulV(o.v1), self.MulV(o.v2), self.MulV(o.v3))
+        if isinstance(o, Vector):
+            return self.Mul(o)
+        return Matrix(self.off * o, self.v1 * o, self.v2 * o, self.v3 * o)
+
+    def __repr__(self): return f"Matrix({self.off}, {self.v1}, {self.v2}, {self.v3})"
+
+class Vector4d(object):
+    __slots__ = ("x", "y", "z", "w")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=0.0):
+        self.x, self.y, self.z, self.w = float(x), float(y), float(z), float(w)
+
+class InExcludeData(object):
+    def __init__(self):
+        self._items = []
+
+    def InsertObject(self, op, flags): self._items.append((op, flags))
+    def GetObjectCount(self): return len(self._items)
+    def ObjectFromIndex(self, doc, i): return self._items[i][0]
+
+# ------------------------ Constants ------------------------
+
+DTYPE_SUBCONTAINER, DTYPE_LONG, DTYPE_REAL, DTYPE_VECTOR, DTYPE_BASELISTLINK = 0, 15, 19, 23, 133
+ID_USERDATA, DESC_NAME, DESC_SHORT_NAME = 700, 1, 2
+VECTOR_X, VECTOR_Y, VECTOR_Z = 1000, 1001, 1002
+ID_BASEOBJECT_POSITION, ID_BASEOBJECT_ROTATION, ID_BASEOBJECT_SCALE = 903, 904, 905
+CAMERAOBJECT_FOCUS, CAMERAOBJECT_APERTURE = 500, 1006
+CINTERPOLATION_SPLINE, CINTERPOLATION_LINEAR, CINTERPOLATION_STEP = 1, 2, 3
+DESCFLAGS_SET_0 = DESCFLAGS_GET_0 = DESCFLAGS_DESC_0 = 0
+DESC_CYCLE = 29
+MSG_UPDATE = 1
+DLG_TYPE_MODAL = 1
+MODE_ON, MODE_OFF, MODE_UNDEF = 0, 1, 2
+Onull, Ocamera, Opolygon, Omgmatrix = 5140, 5103, 5100, 1018545
+Tcaconstraint, Tuserdata, Tvertexcolor = 1019364, 5680, 431000045
+Omgpython, OEPYTHON_STRING, ID_MG_MOTIONGENERATOR_EFFECTORLIST = 1025800, 1000, 2009
+OEPYTHON_MODE, OEPYTHON_MODE_FULL, ID_MG_BASEEFFECTOR_COLOR_ENABLE, MG_OBJECT_LINK = 1001, 1, 1035, 1015
+Opython, OPYTHON_CODE, OPYTHON_OPTIMIZE = 1023866, 1000, 1001
+PLUGINTYPE_OBJECT, PLUGINTYPE_TAG = 5, 4
+RDATA_XRES, RDATA_YRES, RDATA_FILMASPECT, RDATA_PIXELASPECT = 1001, 1002, 1003, 1004
+RDATA_FRAMESEQUENCE, RDATA_FRAMEFROM, RDATA_FRAMETO = 1005, 1006, 1007
+RDATA_FRAMESEQUENCE_MANUAL, RDATA_FRAMESEQUENCE_PREVIEWRANGE = 0, 3
+RDATA_FILMASPECT_CUSTOM = 0
+SAVEDOCUMENTFLAGS_NONE, SAVEDOCUMENTFLAGS_DONTADDTORECENTLIST = 0, 2
+FORMAT_C4DEXPORT = 1001026
+SCENEFILTER_OBJECTS, SCENEFILTER_MATERIALS = 1, 2
+
+# ------------------------ Time / descriptions / containers ------------------------
+
+class BaseTime(object):
+    """BaseTime(seconds) or BaseTime(frame, fps)."""
+    __slots__ = ("_sec",)
+
+    def __init__(self, z=0.0, n=None):
+        self._sec = float(z) if n is None else float(z) / float(n)
+
+    def Get(self): return self._sec
+    def GetFrame(self, fps): return int(math.floor(self._sec * fps + 0.5))
+    def __eq__(self, o): return isinstance(o, BaseTime) and abs(self._sec - o._sec) < 1e-9
+    def __lt__(self, o): return self._sec < o._sec - 1e-9
+    def __hash__(self): return hash(round(self._sec, 9))
+    def __repr__(self): return f"BaseTime({self._sec})"
+
+class DescLevel(object):
+    __slots__ = ("id", "dtype", "creator")
+
+    def __init__(self, t_id, t_datatype=0, t_creator=0):
+        self.id, self.dtype, self.creator = t_id, t_datatype, t_creator
+
+class DescID(object):
+    """Compared by the level ids only, like descriptions resolved on one object type."""
+    def __init__(self, *levels):
+        self._levels = [l if isinstance(l, DescLevel) else DescLevel(l) for l in levels]
+
+    def GetDepth(self): return len(self._levels)
+    def __getitem__(self, i): return self._levels[i]
+    def _key(self): return tuple(l.id for l in self._levels)
+    def __eq__(self, o): return isinstance(o, DescID) and self._key() == o._key()
+    def __hash__(self): return hash(self._key())
+    def __repr__(self): return f"DescID{self._key()}"
+
+def _param_key(did):
+    if isinstance(did, DescID):
+        return did._key()[0] if did.GetDepth() == 1 else did._key()
+    return did
+
+class BaseContainer(dict):
+    def GetContainer(self, i): return self.get(i)
+    def GetData(self, i, default=None): return self.get(i, default)
+    def SetData(self, i, v): self[i] = v
+    def GetInt32(self, i, default=0): return self.get(i, default)
+    def SetInt32(self, i, v): self[i] = int(v)
+    def GetString(self, i, default=""): return self.get(i, default)
+    def SetString(self, i, v): self[i] = str(v)
+    def GetContainerInstance(self, i): return self.get(i)
+    def SetContainer(self, i, bc): self[i] = BaseContainer(bc)
+    def __iter__(self): return iter(list(self.items()))
+
+def GetCustomDataTypeDefault(dtype): return BaseContainer({"dtype": dtype})
+
+class Description(object):
+    def __iter__(self): return iter(())
+
+# ------------------------ Objects / tags ------------------------
+
+class BaseList2D(object):
+    def __init__(self, type_id=0):
+        self._type, self._name, self._data = type_id, "", BaseContainer()
+        self._userdata = []
+
+    def GetType(self): return self._type
+    def GetName(self): return self._name
+    def SetName(self, name): self._name = str(name)
+    def GetDataInstance(self): return self._data
+    def __getitem__(self, i): return self._data.get(_param_key(i))
+    def __setitem__(self, i, v): self._data[_param_key(i)] = v
+    def GetParameter(self, did, flags=DESCFLAGS_GET_0): return self._data.get(_param_key(did))
+    def SetParameter(self, did, value, flags=DESCFLAGS_SET_0):
+        self._data[_param_key(did)] = value
+        return True
+    def GetDescription(self, desc, flags): return False
+    def GetUserDataContainer(self): return list(self._userdata)
+    def AddUserData(self, bc):
+        did = DescID(DescLevel(ID_USERDATA, DTYPE_SUBCONTAINER, 0), DescLevel(len(self._userdata) + 1, bc.get("dtype", DTYPE_REAL), 0))
+        self._userdata.append((did, BaseContainer(bc)))
+        return did
+    def Message(self, msg, data=None): return True
+    def __bool__(self): return True
+
+class BaseTag(BaseList2D):
+    def __init__(self, type_id=0):
+        BaseList2D.__init__(self, type_id)
+        self._host = None
+
+    def GetObject(self): return self._host
+    def Remove(self):
+        if self._host is not None: self._host._tags.remove(self)
+        self._host = None
+
+class VertexColorTag(BaseTag):
+    """RGBA float32 per point (per-point mode) or per polygon corner, like the native tag's low-level data."""
+    def __init__(self, count):
+        BaseTag.__init__(self, Tvertexcolor)
+        self._count, self._per_point = int(count), False
+        self._buf = bytearray(16 * self._count)
+
+    def SetPerPointMode(self, per_point): self._per_point = bool(per_point)
+    def IsPerPointColor(self): return self._per_point
+    def GetDataCount(self): return self._count
+    def GetLowlevelDataAddressW(self): return memoryview(self._buf)
+    def GetLowlevelDataAddressR(self): return memoryview(self._buf).toreadonly()
+    def GetDataAddressW(self): return self._buf
+    def GetDataAddressR(self): return bytes(self._buf)
+
+    @staticmethod
+    def SetColor(data, polygon, normal, index, color):
+        struct.pack_into("<4f", data, 16 * index, color.x, color.y, color.z, getattr(color, "w", 1.0))
+
+    @staticmethod
+    def GetColor(data, polygon, normal, index):
+        return Vector4d(*struct.unpack_from("<4f", data, 16 * index))
+
+class BaseObject(BaseList2D):
+    def __init__(self, type_id=Onull):
+        BaseList2D.__init__(self, type_id)
+        self._parent, self._children, self._doc = None, [], None
+        self._mg, self._tracks, self._tags = Matrix(), [], []
+        self._editor_mode = self._render_mode = MODE_UNDEF
+
+    # hierarchy
+    def _detach(self):
+        if self._parent is not None: self._parent._children.remove(self)
+        elif self._doc is not None: self._doc._objects.remove(self)
+        self._parent = self._doc = None
+
+    def InsertUnder(self, parent):
+        self._detach()
+        self._parent, self._doc = parent, parent._doc
+        parent._children.append(self)
+
+    def Remove(self): self._detach()
+    def GetUp(self): return self._parent
+    def GetChildren(self): return list(self._children)
+    def GetDown(self): return self._children[0] if self._children else None
+    def GetDocument(self):
+        op = self
+        while op._parent is not None: op = op._parent
+        return op._doc
+
+    # transform / modes
+    def GetMg(self): return self._mg
+    def SetMg(self, m): self._mg = m
+    def GetRelPos(self): return self._mg.off
+    def SetRelPos(self, v): self._mg = Matrix(v, self._mg.v1, self._mg.v2, self._mg.v3)
+    def SetEditorMode(self, mode): self._editor_mode = mode
+    def GetEditorMode(self): return self._editor_mode
+    def SetRenderMode(self, mode): self._render_mode = mode
+    def GetRenderMode(self): return self._render_mode
+
+    # tracks / tags
+    def GetCTracks(self): return list(self._tracks)
+    def FindCTrack(self, did):
+        for tr in self._tracks:
+            if tr.GetDescriptionID() == did: return tr
+        return None
+    def InsertTrackSorted(self, track):
+        track._host = self
+        self._tracks.append(track)
+    def InsertTag(self, tag, pred=None):
+        tag._host = self
+        self._tags.append(tag)
+    def MakeTag(self, type_id):
+        tag = BaseTag(type_id)
+        self.InsertTag(tag)
+        return tag
+    def GetTags(self): return list(self._tags)
+    def GetTag(self, type_id):
+        return next((t for t in self._tags if t.GetType() == type_id), None)
+
+    def GetClone(self, flags=0):
+        import copy
+        clone = copy.copy(self)
+        clone._parent = clone._doc = None
+        clone._data = BaseContainer(self._data)
+        clone._tracks = [tr._clone(clone) for tr in self._tracks]
+        clone._userdata = list(self._userdata)
+        clone._tags, clone._children = [], []
+        return clone
+
+class CPolygon(object):
+    """Quad a-b-c-d; a triangle when d is omitted (d = c)."""
+    __slots__ = ("a", "b", "c", "d")
+
+    def __init__(self, a, b, c, d=None):
+        self.a, self.b, self.c, self.d = a, b, c, c if d is None else d
+
+class PolygonObject(BaseObject):
+    """Points stored as packed doubles (x, y, z per point), like the native object, not as Vector objects."""
+    def __init__(self, pcnt=0, vcnt=0):
+        BaseObject.__init__(self, Opolygon)
+        self._xyz = array("d", [0.0]) * (3 * int(pcnt))
+        self._vcnt = int(vcnt)
+        self._polys = {}
+
+    def GetPointCount(self): return len(self._xyz) // 3
+    def GetPolygonCount(self): return self._vcnt
+    def GetPoint(self, i):
+        if not 0 <= i < len(self._xyz) // 3: raise IndexError("point index out of range")
+        return Vector(self._xyz[3 * i], self._xyz[3 * i + 1], self._xyz[3 * i + 2])
+    def GetAllPoints(self):
+        x = self._xyz
+        return [Vector(x[k], x[k + 1], x[k + 2]) for k in range(0, len(x), 3)]
+    def SetPoint(self, i, v):
+        if not 0 <= i < len(self._xyz) // 3: raise IndexError("point index out of range")
+        x, k = self._xyz, 3 * i
+        x[k], x[k + 1], x[k + 2] = v.x, v.y, v.z
+    def SetAllPoints(self, points):
+        if len(points) != len(self._xyz) // 3:
+            raise IndexError("SetAllPoints: point count differs from the object's point count")
+        self._xyz = array("d", (c for v in points for c in (v.x, v.y, v.z)))
+        return True
+    def GetPolygon(self, i): return self._polys[i]
+    def SetPolygon(self, i, p):
+        if not 0 <= i < self._vcnt: raise IndexError("polygon index out of range")
+        self._polys[i] = p
+    def ResizeObject(self, pcnt, vcnt=0):
+        n = 3 * int(pcnt)
+        self._xyz = self._xyz[:n] + array("d", bytes(8 * max(0, n - len(self._xyz))))
+        self._vcnt = int(vcnt)
+        return True
+
+# ------------------------ Animation ------------------------
+
+class CKey(object):
+    __slots__ = ("_time", "_value", "_interp")
+
+    def __init__(self):
+        self._time, self._value, self._interp = BaseTime(), 0.0, CINTERPOLATION_SPLINE
+
+    def GetTime(self): return self._time
+    def SetTime(self, curve, t): self._time = t
+    def GetValue(self): return self._value
+    def SetValue(self, curve, v): self._value = float(v)
+    def GetInterpolation(self): return self._interp
+    def SetInterpolation(self, curve, interp): self._interp = interp
+
+class CCurve(object):
+    """Keys kept in time order. GetValue interpolates linearly (step keys hold), enough for checks."""
+    def __init__(self):
+        self._keys = []
+
+    def GetKeyCount(self): return len(self._keys)
+    def GetKey(self, i): return self._keys[i]
+    def FlushKeys(self): del self._keys[:]
+    def DelKey(self, index, bUndo=True):
+        del self._keys[index]
+        return True
+
+    def _index(self, t):
+        lo, hi = 0, len(self._keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._keys[mid]._time._sec < t._sec: lo = mid + 1
+            else: hi = mid
+        return lo
+
+    def InsertKey(self, key, bUndo=True):
+        i = self._index(key._time)
+        if i < len(self._keys) and self._keys[i]._time == key._time: self._keys[i] = key
+        else: self._keys.insert(i, key)
+        return True
+
+    def AddKey(self, time, bUndo=True):
+        k = CKey()
+        k._time = time
+        i = self._index(time)
+        if i < len(self._keys) and self._keys[i]._time == time: self._keys[i] = k
+        else: self._keys.insert(i, k)
+        return {"key": k, "nidx": i}
+
+    def FindKey(self, time):
+        i = self._index(time)
+        return {"key": self._keys[i], "idx": i} if i < len(self._keys) and self._keys[i]._time == time else None
+
+    def GetValue(self, time, fps=0):
+        keys = self._keys
+        if not keys: return 0.0
+        i = self._index(time)
+        if i < len(keys) and keys[i]._time == time: return keys[i]._value
+        if i == 0: return keys[0]._value
+        if i == len(keys): return keys[-1]._value
+        a, b = keys[i - 1], keys[i]
+        if a._interp == CINTERPOLATION_STEP: return a._value
+        f = (time._sec - a._time._sec) / (b._time._sec - a._time._sec)
+        return a._value + f * (b._value - a._value)
+
+class CTrack(BaseList2D):
+    def __init__(self, op=None, did=None):
+        BaseList2D.__init__(self)
+        self._did, self._curve, self._host = did, CCurve(), None
+
+    def GetDescriptionID(self): return self._did
+    def GetCurve(self, type=0, bCreate=True): return self._curve
+    def GetObject(self): return self._host
+
+    def _clone(self, host):
+        tr = CTrack(host, self._did)
+        tr._host = host
+        for k in self._curve._keys:
+            nk = CKey(); nk._time, nk._value, nk._interp = k._time, k._value, k._interp
+            tr._curve._keys.append(nk)
+        return tr
+
+# ------------------------ Application ------------------------
+
+def GetC4DVersion(): return 2024400
+def EventAdd(flags=0): pass
+def StatusSetText(text): pass
+def StatusSetBar(pct): pass
+def StatusClear(): pass
+
+from c4d import gui, utils, documents, plugins  # noqa: E402  (submodules, as in the real package)
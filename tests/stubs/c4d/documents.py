@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# c4d.documents stand-in: a document with an object list, timeline, undo brackets and render data.
+# SaveDocument writes a JSON outline of the object tree (names, types, point and key counts).
+# MIT
+
+import json
+import c4d
+
+class RenderData(c4d.BaseList2D):
+    pass
+
+class BaseDocument(c4d.BaseList2D):
+    def __init__(self):
+        c4d.BaseList2D.__init__(self)
+        self._objects, self._fps, self._undo_depth = [], 30, 0
+        self._min = self._max = self._loop_min = self._loop_max = self._time = c4d.BaseTime()
+        self._rd = RenderData()
+
+    def InsertObject(self, op, parent=None, pred=None):
+        if parent is not None:
+            op.InsertUnder(parent)
+            return
+        op._detach()
+        op._doc = self
+        self._objects.append(op)
+
+    def GetObjects(self): return list(self._objects)
+    def GetFirstObject(self): return self._objects[0] if self._objects else None
+
+    def SearchObject(self, name):
+        stack = list(self._objects)
+        while stack:
+            op = stack.pop(0)
+            if op.GetName() == name: return op
+            stack[:0] = op.GetChildren()
+        return None
+
+    def GetFps(self): return self._fps
+    def SetFps(self, fps): self._fps = int(fps)
+    def GetMinTime(self): return self._min
+    def SetMinTime(self, t): self._min = t
+    def GetMaxTime(self): return self._max
+    def SetMaxTime(self, t): self._max = t
+    def GetLoopMinTime(self): return self._loop_min
+    def SetLoopMinTime(self, t): self._loop_min = t
+    def GetLoopMaxTime(self): return self._loop_max
+    def SetLoopMaxTime(self, t): self._loop_max = t
+    def GetTime(self): return self._time
+    def SetTime(self, t): self._time = t
+    def GetActiveRenderData(self): return self._rd
+
+    def StartUndo(self):
+        self._undo_depth += 1
+        return True
+
+    def EndUndo(self):
+        self._undo_depth -= 1
+        return True
+
+    def AddUndo(self, type, data): return True
+
+_active = None
+
+def GetActiveDocument():
+    global _active
+    if _active is None: _active = BaseDocument()
+    return _active
+
+def _outline(op):
+    out = {"name": op.GetName(), "type": op.GetType(), "children": [_outline(c) for c in op.GetChildren()]}
+    if isinstance(op, c4d.PolygonObject): out["points"] = op.GetPointCount()
+    if op.GetCTracks(): out["keys"] = sum(tr.GetCurve().GetKeyCount() for tr in op.GetCTracks())
+    return out
+
+def SaveDocument(doc, name, saveflags, format):
+    with open(name, "w", encoding="utf-8") as f:
+        json.dump({"fps": doc.GetFps(), "objects": [_outline(op) for op in doc.GetObjects()]}, f, indent=1)
+    return True
+
+def LoadDocument(name, loadflags, thread=None):
+    return None  # the saved outline cannot be read back into a document
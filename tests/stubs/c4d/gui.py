@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+# c4d.gui stand-in: enough for the importer module to define its dialog class.
+# MIT
+
+class GeDialog(object):
+    pass
+
+def MessageDialog(text, type=0):
+    print(text)
+    return True
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# c4d.plugins stand-in: a plugin list with a Redshift camera object, so importer tests get an RS camera ID.
+# Tests can clear or extend REGISTERED to simulate installs without Redshift.
+# MIT
+
+import c4d
+
+class BasePlugin(object):
+    def __init__(self, plugin_id, name, plugin_type):
+        self._id, self._name, self._type = plugin_id, name, plugin_type
+
+    def GetID(self): return self._id
+    def GetName(self): return self._name
+    def GetType(self): return self._type
+
+REGISTERED = [
+    BasePlugin(1057516, "RS Camera", c4d.PLUGINTYPE_OBJECT),
+    BasePlugin(c4d.Omgmatrix, "Matrix", c4d.PLUGINTYPE_OBJECT),
+]
+
+def FilterPluginList(type, sortbyname):
+    found = [p for p in REGISTERED if p.GetType() == type]
+    return sorted(found, key=lambda p: p.GetName()) if sortbyname else found
+
+def FindPlugin(id, type=0):
+    return next((p for p in REGISTERED if p.GetID() == id), None)
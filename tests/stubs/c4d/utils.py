@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# c4d.utils stand-in: HPB conversions for the default (HPB) rotation order.
+# HPBToMatrix(h, p, b) = MatrixRotY(h) * MatrixRotX(p) * MatrixRotZ(b), with c4d's left-handed rotations.
+# MIT
+
+import math
+import c4d
+
+def MatrixRotX(w):
+    cs, sn = math.cos(w), math.sin(w)
+    return c4d.Matrix(c4d.Vector(0.0), c4d.Vector(1.0, 0.0, 0.0), c4d.Vector(0.0, cs, sn), c4d.Vector(0.0, -sn, cs))
+
+def MatrixRotY(w):
+    cs, sn = math.cos(w), math.sin(w)
+    return c4d.Matrix(c4d.Vector(0.0), c4d.Vector(cs, 0.0, -sn), c4d.Vector(0.0, 1.0, 0.0), c4d.Vector(sn, 0.0, cs))
+
+def MatrixRotZ(w):
+    cs, sn = math.cos(w), math.sin(w)
+    return c4d.Matrix(c4d.Vector(0.0), c4d.Vector(cs, sn, 0.0), c4d.Vector(-sn, cs, 0.0), c4d.Vector(0.0, 0.0, 1.0))
+
+def HPBToMatrix(hpb, order=c4d.ROTATIONORDER_DEFAULT):
+    return MatrixRotY(hpb.x) * MatrixRotX(hpb.y) * MatrixRotZ(hpb.z)
+
+def MatrixToHPB(m, order=c4d.ROTATIONORDER_DEFAULT):
+    v1, v2, v3 = m.v1.GetNormalized(), m.v2.GetNormalized(), m.v3.GetNormalized()
+    l = math.hypot(v3.x, v3.z)
+    p = math.atan2(-v3.y, l)
+    if l < 1e-7:
+        return c4d.Vector(0.0, p, math.atan2(-v2.x, v1.x))
+    return c4d.Vector(math.atan2(v3.x, v3.z), p, math.atan2(v1.y, v2.y))
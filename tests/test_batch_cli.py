@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Headless batch entry point: folder globbing, output naming, options and the failure summary.
+# MIT
+
+import json, math, os
+import pytest
+
+def test_expand_and_output_paths(importer, tmp_path):
+    for name in ("shot_b", "shot_a", "other"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "shot_c.txt").write_text("not a folder")
+    found = importer.expand_scene_folders([str(tmp_path / "shot_*"), str(tmp_path / "shot_a")])
+    assert found == [str(tmp_path / "shot_a"), str(tmp_path / "shot_b")]
+
+    out = importer.batch_output_paths(["x/a", "y/a", "z/b"], "renders")
+    assert out == [os.path.join("renders", "a.c4d"), os.path.join("renders", "a_2.c4d"), os.path.join("renders", "b.c4d")]
+    assert importer.batch_output_paths(["x/a"]) == [os.path.join("x/a", "a.c4d")]
+
+def test_options_match_dialog_layout(importer):
+    args = importer.batch_arg_parser().parse_args(["s", "--fps", "30", "--budget", "5000", "--reduce", "--tol-angle", "1"])
+    opts = importer.batch_options(args)
+    assert opts["fps"] == 30 and opts["points"] and opts["sor"] is None
+    assert opts["point_filter"] == {"max_error": 0.0, "min_track_len": 0}
+    if importer.np is not None:
+        assert opts["decimate"]["budget"] == 5000 and opts["decimate"]["voxel"] == 0.0
+        assert opts["reduce"][1] == math.radians(1.0)
+
+def test_failures_are_summarised(importer, tmp_path):
+    (tmp_path / "empty_shot").mkdir()
+    out = tmp_path / "out"
+    code = importer.batch_main([str(tmp_path / "empty_shot"), "--out", str(out), "--jobs", "1"])
+    assert code == 1
+    report = json.loads((out / importer.BATCH_SUMMARY).read_text())
+    assert report["ok"] == 0 and report["failed"] == 1
+    shot = report["shots"][0]
+    assert shot["status"] == "failed" and "sparse" in shot["error"] and "total" in shot["timings"]
+    assert importer.batch_main([str(tmp_path / "nothing_*")]) == 2
+
+def test_main_needs_the_batch_flag(importer, tmp_path, monkeypatch):
+    opened = []
+    monkeypatch.setattr(importer.ImportDialog, "Open", lambda self, *a, **k: opened.append(a) or True, raising=False)
+    assert importer.main([str(tmp_path / "nothing_*")]) is None and opened  # stray host arguments: the dialog
+    assert importer.main(["--batch", str(tmp_path / "nothing_*")]) == 2 and len(opened) == 1
+
+def test_dead_worker_fails_its_shots(importer, tmp_path, monkeypatch):
+    from concurrent.futures import Future
+    class Pool(object):
+        def __init__(self, max_workers): self.n = 0
+        def __enter__(self): return self
+        def __exit__(self, *exc): return False
+        def submit(self, fn, folder, opts, out, trace):
+            f, self.n = Future(), self.n + 1
+            if self.n == 1: f.set_result({"scene": folder, "status": "ok"})
+            else: f.set_exception(importer.BrokenProcessPool("killed"))
+            return f
+    monkeypatch.setattr(importer, "ProcessPoolExecutor", Pool)
+    monkeypatch.setattr(importer, "import_shot", lambda *a: pytest.fail("re-imported in this process"))
+    records = importer.batch_import(["a", "b", "c"], {}, str(tmp_path), jobs=2, log=lambda msg: None)
+    assert [r["status"] for r in records] == ["ok", "failed", "failed"] and "--jobs 1" in records[2]["error"]
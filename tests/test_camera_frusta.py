@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Camera frustum previs: one merged pyramid mesh from the pose batch, every Nth frame, coloured along the shot.
+# MIT
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+OPTS = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": False, "cache": False, "point_filter": None,
+        "sor": None, "decimate": None, "reduce": None}
+
+def test_pyramids_match_the_cameras(importer, synthetic, tmp_path):
+    synthetic.write_scene(str(tmp_path), fmt="bin", n_images=50, n_points=500, obs_per_image=50)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    prep = importer.prepare_import(sparse, fmt, dict(OPTS, frusta={"step": 4, "size": 0.0}))
+    poses = prep["poses"]
+    xyz, polys, rgb = prep["frusta"]
+    k = len(range(0, 50, 4))
+    assert xyz.shape == (5 * k, 3) and polys.shape == (5 * k, 4) and rgb.shape == (5 * k, 3) and polys.max() == 5 * k - 1
+
+    # apex on the camera; image plane 'size' ahead along the view axis, as wide as the focal length allows
+    size = importer.frustum_size(poses["pos"], 100.0)
+    apex, corners = xyz[0::5], xyz.reshape(k, 5, 3)[:, 1:]
+    assert np.allclose(apex, poses["pos"][::4])
+    ahead = np.einsum("nkj,nj->nk", corners - apex[:, None], poses["rot"][::4, :, 2])
+    assert np.allclose(ahead, size)
+    width = np.linalg.norm(corners[:, 1] - corners[:, 0], axis=1)
+    assert np.allclose(width, size * 36.0 / poses["focal"][::4])
+    assert np.allclose(np.linalg.norm(corners[:, 2] - corners[:, 1], axis=1), width * 1080 / 1920)
+    up = np.einsum("nj,nj->n", corners[:, 0] - corners[:, 3], poses["rot"][::4, :, 1])
+    assert (up > 0).all()  # first two corners at the top of the image
+    assert rgb[0].tolist() == list(importer.FRUSTUM_COLORS[0]) and rgb[-1].tolist() == list(importer.FRUSTUM_COLORS[-1])
+
+    doc = importer.c4d.documents.BaseDocument()
+    summary = importer.build_scene(doc, prep, OPTS)
+    obj = doc.SearchObject("GLoMap_Camera_Frusta")
+    assert summary["frusta"] == k and obj.GetPointCount() == 5 * k and obj.GetPolygonCount() == 5 * k
+    last = obj.GetPolygon(5 * k - 1)
+    assert (last.a, last.b, last.c, last.d) == tuple(range(5 * k - 4, 5 * k))
+    assert obj.GetRenderMode() == importer.c4d.MODE_OFF and obj.GetTag(importer.c4d.Tvertexcolor).GetDataCount() == 5 * k
+
+def test_polygons_written_in_chunks(importer, monkeypatch):
+    monkeypatch.setattr(importer, "_POINT_CHUNK", 4)
+    polys = np.arange(40, dtype=np.int32).reshape(10, 4)
+    obj = importer.c4d.PolygonObject(40, 10)
+    importer.write_polygons(obj, polys)
+    assert [(p.a, p.b, p.c, p.d) for p in map(obj.GetPolygon, range(10))] == [tuple(r) for r in polys.tolist()]
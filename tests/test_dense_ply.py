@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Dense fused.ply: header parsing, memory-mapped vertex fields, scene lookup and the import pipeline.
+# MIT
+
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def _write_ply(path, body, header):
+    with open(path, "wb") as f:
+        f.write(("ply\nformat binary_little_endian 1.0\ncomment test\n" + header + "end_header\n").encode())
+        f.write(body)
+
+def test_reads_fields_after_a_fixed_size_element(importer, tmp_path):
+    vertex = np.dtype([("nx", "<f4"), ("x", "<f8"), ("y", "<f8"), ("z", "<f8"), ("red", "<u2"), ("green", "<u2"), ("blue", "<u2")])
+    rec = np.zeros(5, vertex)
+    rec["x"], rec["y"], rec["z"] = np.arange(5), np.arange(5) * 2.0, -1.5
+    rec["red"], rec["green"], rec["blue"] = 0xFFFF, 0x8000, 0
+    pre = np.zeros(2, [("a", "<i4"), ("b", "u1")])  # a 5-byte element stored before the vertices
+    header = ("element camera 2\nproperty int a\nproperty uchar b\nelement vertex 5\nproperty float nx\n"
+              "property double x\nproperty double y\nproperty double z\nproperty ushort red\nproperty ushort green\n"
+              "property ushort blue\nelement face 0\nproperty list uchar int vertex_indices\n")
+    path = str(tmp_path / "fused.ply")
+    _write_ply(path, pre.tobytes() + rec.tobytes(), header)
+
+    out = importer.read_ply_points(path, with_rgb=True)
+    assert out["xyz"].dtype == np.float64 and out["xyz"].flags.writeable
+    assert np.array_equal(out["xyz"], np.column_stack([rec["x"], rec["y"], rec["z"]]))
+    assert out["rgb"].tolist() == [[255, 128, 0]] * 5
+    assert set(importer.read_ply_points(path)) == {"xyz"}
+
+    _write_ply(path, b"", "element vertex 1\nproperty float x\n")
+    with pytest.raises(ValueError):
+        importer.read_ply_points(path)
+
+def test_dense_cloud_in_scene(importer, synthetic, tmp_path):
+    synthetic.write_scene(str(tmp_path), fmt="bin", n_images=10, n_points=500, obs_per_image=80, dense_points=50000)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    ply = importer.find_dense_model(sparse)
+    assert ply == os.path.join(str(tmp_path), "dense", "fused.ply")
+    assert importer.read_ply_points(ply)["xyz"].dtype == np.float32
+
+    opts = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": True, "cache": False, "point_filter": None,
+            "sor": None, "decimate": {"budget": 20000, "lods": 1}, "reduce": None, "dense": True}
+    prep = importer.prepare_import(sparse, fmt, opts)
+    assert prep["dense_total"] == 50000 and prep["dense_kept"] <= 20000
+    doc = importer.c4d.documents.BaseDocument()
+    summary = importer.build_scene(doc, prep, opts)
+    assert summary["dense_kept"] == doc.SearchObject("GLoMap_DenseCloud").GetPointCount()
+    ys = [doc.SearchObject("GLoMap_DenseCloud").GetPoint(i).y for i in range(0, summary["dense_kept"], 97)]
+    assert max(ys) > 99.0 and min(ys) > -1.0  # boxes rise along -Y in COLMAP, +Y (scaled) in C4D
+    assert not prep["warnings"]
+    best = dict(opts, decimate={"budget": 20000, "lods": 1, "mode": importer.DECIMATE_BEST})
+    assert any("fused.ply has no reprojection errors" in w for w in importer.prepare_import(sparse, fmt, best)["warnings"])
+
+    opts["dense"], opts["points"] = True, False
+    os.remove(ply)
+    assert importer.prepare_import(sparse, fmt, opts)["warnings"]
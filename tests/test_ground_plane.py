@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Auto-orient: sampled RANSAC ground plane picked by the camera up, root null levelled on it.
+# MIT
+
+import math
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def _tilted_room(n, seed=0):
+    """Floor (25%) under the cameras, a larger wall (45%) and ceiling (30%), all tilted and shifted."""
+    rnd = np.random.default_rng(seed)
+    nf, nw = n // 4, n * 45 // 100
+    nc = n - nf - nw
+    floor = np.c_[rnd.uniform(-500, 500, nf), np.zeros(nf), rnd.uniform(-500, 500, nf)]
+    wall = np.c_[rnd.uniform(-500, 500, nw), rnd.uniform(0, 600, nw), np.full(nw, 500.0)]
+    ceiling = np.c_[rnd.uniform(-500, 500, nc), np.full(nc, 300.0), rnd.uniform(-500, 500, nc)]
+    xyz = np.vstack([floor, wall, ceiling]) + rnd.normal(0.0, 1.0, (n, 3))
+    path = np.c_[rnd.uniform(-200, 200, 50), np.full(50, 160.0), rnd.uniform(-200, 200, 50)]
+    a, b = math.radians(20.0), math.radians(-12.0)
+    tilt = (np.array([[1, 0, 0], [0, math.cos(a), -math.sin(a)], [0, math.sin(a), math.cos(a)]])
+            @ np.array([[math.cos(b), -math.sin(b), 0], [math.sin(b), math.cos(b), 0], [0, 0, 1]]))
+    shift = np.array([30.0, -75.0, 12.0])
+    return xyz @ tilt.T + shift, path @ tilt.T + shift, tilt, nf
+
+def test_floor_is_found_and_levelled(importer):
+    xyz, path, tilt, n_floor = _tilted_room(400000)
+    up = tilt[:, 1]
+    cam_rot = np.repeat(tilt[None], 50, axis=0)  # cameras level with the room
+    assert np.allclose(importer.camera_up(cam_rot), up)
+    normal, d, inliers = importer.fit_ground_plane(xyz.astype(np.float32), up, path)
+    assert abs(normal @ up) > 0.9999 and 0.2 < inliers < 0.3  # the floor, not the ceiling above the cameras
+
+    rot, off = importer.ground_alignment(normal, d)
+    assert np.allclose(rot @ rot.T, np.eye(3)) and np.isclose(np.linalg.det(rot), 1.0)
+    levelled = xyz @ rot.T + off
+    assert np.abs(levelled[:n_floor, 1]).mean() < 1.0 and (levelled[n_floor:, 1] > -5.0).all()
+    assert ((path @ rot.T + off)[:, 1] > 150.0).all()
+
+    # the up vector picks the plane: facing the wall finds the wall, nothing qualifies below the cameras
+    normal = importer.fit_ground_plane(xyz, -tilt[:, 2], path)[0]
+    assert normal @ -tilt[:, 2] > 0.9999
+    assert importer.fit_ground_plane(xyz, up, path - 1000.0 * up) is None
+
+@pytest.mark.parametrize("normal", [(0.0, -1.0, 0.0), (0.01, -1.0, 0.02), (0.0, 1.0, 0.0)])
+def test_downward_plane_is_turned_over(importer, normal):
+    # an upside-down scene (camera up along -Y): the floor faces down and is rotated 180 deg, not divided by zero
+    normal = np.array(normal) / np.linalg.norm(normal)
+    up = np.array([0.0, -1.0, 0.0])
+    rot, off = importer.ground_alignment(normal, 2.0, up)
+    assert np.isfinite(rot).all() and np.allclose(rot @ rot.T, np.eye(3)) and np.isclose(np.linalg.det(rot), 1.0)
+    facing = normal if normal @ up > 0 else -normal
+    assert np.allclose(rot @ facing, (0.0, 1.0, 0.0))
+    on_plane = np.cross(normal, (1.0, 0.0, 0.0)) * 7.0 - 2.0 * normal  # normal . p + 2 = 0
+    assert abs((rot @ on_plane + off)[1]) < 1e-9
+    assert (rot @ (on_plane + 5.0 * facing) + off)[1] > 4.99  # the camera side ends up above
+
+def test_scene_root_is_levelled(importer, synthetic, tmp_path):
+    synthetic.write_scene(str(tmp_path), fmt="bin", n_images=30, n_points=3000, obs_per_image=200)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    opts = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": True, "cache": False, "point_filter": None,
+            "sor": None, "decimate": None, "reduce": None}
+    assert importer.prepare_import(sparse, fmt, opts)["ground"] is None
+    opts["orient"] = True
+    prep = importer.prepare_import(sparse, fmt, opts)
+    # the synthetic floor is y=0 with up -Y in COLMAP, so Y=0 facing +Y in C4D: the root stays level
+    ground = prep["ground"]
+    assert np.allclose(ground["rot"], np.eye(3), atol=2e-3) and abs(ground["off"][1]) < 2.0 and 0.4 < ground["inliers"] < 0.8
+
+    doc = importer.c4d.documents.BaseDocument()
+    summary = importer.build_scene(doc, prep, opts)
+    assert summary["ground"] == ground["inliers"] and not summary["warnings"]
+    mg = doc.SearchObject("GLoMap_Scene_Orient").GetMg()
+    assert np.allclose([(v.x, v.y, v.z) for v in (mg.v1, mg.v2, mg.v3, mg.off)], np.c_[ground["rot"], ground["off"]].T)
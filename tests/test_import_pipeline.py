@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Import pipeline: concurrent model parsing, progress / cancel, and prepare_import without a document.
+# MIT
+
+import threading
+import pytest
+
+np = pytest.importorskip("numpy")
+from concurrent.futures import ThreadPoolExecutor
+
+def _write_model(folder, n_img=12, n_pts=400, seed=0):
+    rnd = np.random.default_rng(seed)
+    with open(folder / "cameras.txt", "w") as f:
+        f.write("# Camera list\n1 SIMPLE_RADIAL 1920 1080 1400.0 960.0 540.0 0.01\n")
+    with open(folder / "images.txt", "w") as f:
+        f.write("# Image list\n")
+        for i in range(n_img):
+            q = rnd.normal(size=4); q /= np.linalg.norm(q)
+            t = rnd.uniform(-5.0, 5.0, 3)
+            f.write(f"{n_img - i} " + " ".join(map(repr, q.tolist() + t.tolist())) + f" 1 frame_{n_img - i:04d}.jpg\n")
+            f.write("10.5 20.5 -1 30.5 40.5 3\n")
+    with open(folder / "points3D.txt", "w") as f:
+        f.write("# 3D point list\n")
+        for i, p in enumerate(rnd.uniform(-10.0, 10.0, (n_pts, 3)).tolist()):
+            f.write(f"{i + 1} {p[0]!r} {p[1]!r} {p[2]!r} 1 2 3 0.5 1 0 2 1\n")
+
+OPTS = {"sensor_mm": 36.0, "fps": 25, "scale": 10.0, "points": True, "cache": False,
+        "point_filter": None, "sor": None, "decimate": None, "reduce": None}
+
+def test_concurrent_parse_matches_sequential(importer, tmp_path):
+    _write_model(tmp_path)
+    cams, imgs, pts = importer.load_sparse_model(str(tmp_path), "txt")
+    report = importer.ImportProgress()
+    with ThreadPoolExecutor(3) as pool:
+        cams2, imgs2, pts2 = importer.load_sparse_model(str(tmp_path), "txt", report=report, pool=pool)
+    assert cams == cams2
+    assert np.array_equal(imgs["q"], imgs2["q"]) and imgs["name"] == imgs2["name"]
+    assert np.array_equal(pts["xyz"], pts2["xyz"])
+    assert report.fraction() == pytest.approx(1.0)
+
+def test_cancel_raises_before_scene(importer, tmp_path):
+    _write_model(tmp_path)
+    report = importer.ImportProgress()
+    report.cancel()
+    with pytest.raises(importer.ImportCancelled):
+        importer.prepare_import(str(tmp_path), "txt", OPTS, report)
+    with ThreadPoolExecutor(3) as pool, pytest.raises(importer.ImportCancelled):
+        importer.prepare_import(str(tmp_path), "txt", OPTS, report, pool)
+
+def test_prepare_import_off_main_thread(importer, tmp_path):
+    _write_model(tmp_path)
+    out = {}
+    worker = threading.Thread(target=lambda: out.update(importer.prepare_import(str(tmp_path), "txt", OPTS)))
+    worker.start(); worker.join()
+    assert out["frames"] == 12 and out["points_total"] == out["points_kept"] == 400
+    assert len(out["poses"]["frame"]) == 12 and out["camera0"]["width"] == 1920
+    assert out["levels"][0][0][0] == pytest.approx(10.0 * float(open(tmp_path / "points3D.txt").readlines()[1].split()[1]))
+
+def test_cancel_interrupts_post_parse_stages(importer, tmp_path, monkeypatch):
+    _write_model(tmp_path)
+    report = importer.ImportProgress()
+    poses = importer.compute_camera_poses
+    monkeypatch.setattr(importer, "compute_camera_poses", lambda *a: (report.cancel(), poses(*a))[1])
+    monkeypatch.setattr(importer, "reduce_camera_keys", lambda *a: pytest.fail("stage ran after cancel"))
+    with pytest.raises(importer.ImportCancelled):
+        importer.prepare_import(str(tmp_path), "txt", dict(OPTS, reduce=(0.01, 0.1, 0.01)), report)
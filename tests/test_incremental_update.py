@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Incremental re-import: hashes stamped by build_scene, only changed keys / point blocks rewritten in place.
+# MIT
+
+import copy
+import pytest
+
+np = pytest.importorskip("numpy")
+
+OPTS = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": True, "cache": False, "point_filter": None,
+        "sor": None, "decimate": None, "reduce": None, "colors": True}
+
+def _key_value(cam, did, frame, c4d):
+    return cam.FindCTrack(did).GetCurve().FindKey(c4d.BaseTime(frame, 24))["key"].GetValue()
+
+def test_update_rewrites_only_what_changed(importer, synthetic, tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "_POINT_CHUNK", 256)
+    c4d = importer.c4d
+    synthetic.write_scene(str(tmp_path), fmt="bin", n_images=30, n_points=2000, obs_per_image=200)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    prep = importer.prepare_import(sparse, fmt, OPTS)
+    doc = c4d.documents.BaseDocument()
+    importer.build_scene(doc, copy.deepcopy(prep), OPTS)
+    render_cam = doc.SearchObject("RS_GLoMap_Render_Camera")
+    cloud = doc.SearchObject("GLoMap_SparseCloud")
+
+    # unchanged re-solve: nothing written
+    opts = dict(OPTS, update=True)
+    summary = importer.build_scene(doc, copy.deepcopy(prep), opts)
+    assert summary["updated"] and summary["keys_written"] == 0 and summary["points_written"] == 0
+
+    # one frame and one point moved, three frames dropped
+    prep["poses"]["pos"][5] += (10.0, 0.0, 0.0)
+    prep["levels"][0][700] += 5.0
+    prep["colors"][0][1900] = (1, 2, 3)
+    for key in ("frame", "pos", "hpb", "focal", "rot"):
+        prep["poses"][key] = prep["poses"][key][:27]
+    written, set_point = [], cloud.SetPoint
+    cloud.SetPoint = lambda i, v: (written.append(i), set_point(i, v))[1]
+    cloud.GetAllPoints = cloud.SetAllPoints = lambda *a: pytest.fail("whole cloud rewritten")
+    summary = importer.build_scene(doc, prep, opts)
+    assert summary["keys_written"] == 7 and summary["points_written"] == 256 + (2000 - 7 * 256)  # two blocks, the last one partial
+    assert sorted(written) == list(range(512, 768)) + list(range(7 * 256, 2000))  # only the changed blocks
+    del cloud.SetPoint, cloud.GetAllPoints, cloud.SetAllPoints
+    cam = doc.SearchObject("RS_GLoMap_Animated_Camera")
+    assert _key_value(cam, importer._id_pos_x(), 5, c4d) == prep["poses"]["pos"][5, 0]
+    assert all(cam.FindCTrack(did()).GetCurve().GetKeyCount() == 27 for _, did, _ in importer._pose_channels(prep["poses"]))
+    assert doc.SearchObject("RS_GLoMap_Render_Camera") is render_cam and doc.SearchObject("GLoMap_SparseCloud") is cloud
+
+    # a frame dropped mid-shot (its image lost its camera): its keys go, the later frames are untouched
+    for key in ("frame", "pos", "hpb", "focal", "rot"):
+        prep["poses"][key] = np.delete(prep["poses"][key], 10, axis=0)
+    summary = importer.build_scene(doc, copy.deepcopy(prep), opts)
+    assert summary["keys_written"] == 0
+    for _, did, _ in importer._pose_channels(prep["poses"]):
+        curve = cam.FindCTrack(did()).GetCurve()
+        assert curve.GetKeyCount() == 26 and curve.FindKey(c4d.BaseTime(10, 24)) is None
+    p = cloud.GetPoint(700)
+    assert np.allclose((p.x, p.y, p.z), prep["levels"][0][700])
+    rgba = np.frombuffer(bytes(cloud.GetTag(c4d.Tvertexcolor).GetLowlevelDataAddressR()), np.float32).reshape(-1, 4)
+    assert np.allclose(rgba[1900, :3] * 255.0, (1, 2, 3), atol=1e-3)
+
+    # tiling changes the cloud's structure: it is rebuilt, the camera is left alone
+    tiled = dict(opts, tiles={"max_points": 300, "mode": "octree", "near": 0.0})
+    summary = importer.build_scene(doc, importer.prepare_import(sparse, fmt, tiled), tiled)
+    assert summary["points_written"] == 2000 and len(doc.SearchObject("GLoMap_SparseCloud").GetChildren()) > 1
+    assert doc.SearchObject("RS_GLoMap_Render_Camera") is render_cam
+
+    summary = importer.build_scene(c4d.documents.BaseDocument(), importer.prepare_import(sparse, fmt, opts), opts)
+    assert not summary["updated"] and summary["warnings"]
+
+def test_rebuild_removes_every_old_lod(importer):
+    c4d = importer.c4d
+    doc = c4d.documents.BaseDocument()
+    root = importer.ensure_null(doc, "GLoMap_Scene_Orient")
+    levels = [np.random.default_rng(k).random((40 - 3 * k, 3)) for k in range(10)]
+    importer.import_point_lods(doc, levels, parent=root)
+    assert doc.SearchObject("GLoMap_SparseCloud_LOD9") is not None
+    importer.update_point_levels(doc, root, levels[:2], None, "GLoMap_SparseCloud", previs=False)
+    names = [o.GetName() for o in root.GetChildren()]
+    assert names == ["GLoMap_SparseCloud", "GLoMap_SparseCloud_LOD1"]
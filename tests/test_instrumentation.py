@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Stage instrumentation: context manager / decorator records, nested peaks, JSON log.
+# MIT
+
+import json, threading, tracemalloc
+
+def test_stages_only_record_while_active(importer):
+    @importer.instrumented("double", count=len)
+    def double(items):
+        return items + items
+
+    assert double([1, 2]) == [1, 2, 1, 2]  # no active stats: plain call
+    stats = importer.ImportStats()
+    with stats:
+        with importer.import_stage("outer") as st:
+            double([1, 2, 3])
+            st["count"] = 7
+        double([1])
+    assert [r["name"] for r in stats.stages] == ["double", "outer", "double"]
+    assert stats.stages[0]["count"] == 6 and stats.stages[1]["count"] == 7
+    assert all(r["seconds"] >= 0.0 and "peak_mb" not in r for r in stats.stages)
+    totals = {r["name"]: r for r in stats.totals()}
+    assert totals["double"]["count"] == 8 and len(stats.breakdown(top=1)) == 1
+
+    other = []  # another thread does not see this thread's stats
+    with stats:
+        t = threading.Thread(target=lambda: other.append(double([0])))
+        t.start(); t.join()
+    assert len(stats.stages) == 3 and other == [[0, 0]]
+
+def test_nested_peak_and_json(importer, tmp_path):
+    stats = importer.ImportStats(trace_memory=True)
+    with stats:
+        with importer.import_stage("outer"):
+            with importer.import_stage("inner"):
+                blob = bytearray(8 << 20)
+                del blob
+            small = bytearray(1 << 20)
+            del small
+    assert not tracemalloc.is_tracing()
+    inner, outer = stats.stages
+    assert inner["peak_mb"] > 8.0
+    assert outer["peak_mb"] >= inner["peak_mb"]  # the child's peak counts for the parent
+
+    log = json.loads(open(stats.write_json(str(tmp_path / "stats.json"), scene="x")).read())
+    assert log["scene"] == "x" and [r["name"] for r in log["stages"]] == ["inner", "outer"]
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Keyframe reduction (rdp_indices / reduce_camera_keys): dropped keys stay within tolerance.
+# MIT
+
+import math
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def _max_linear_error(x, y, keep):
+    y = np.asarray(y, dtype=np.float64).reshape(len(x), -1)
+    return max(np.abs(np.interp(x, x[keep], y[keep, k]) - y[:, k]).max() for k in range(y.shape[1]))
+
+def test_rdp_keeps_error_within_tolerance(importer):
+    rnd = np.random.default_rng(5)
+    x = np.arange(2000, dtype=np.float64)
+    y = np.column_stack([np.sin(0.01 * x), 0.002 * x, np.cos(0.003 * x)]) + rnd.normal(0, 1e-4, (len(x), 3))
+    for tol in (1e-3, 1e-2, 1e-1):
+        keep = importer.rdp_indices(x, y, tol)
+        assert keep[0] == 0 and keep[-1] == len(x) - 1
+        assert np.all(np.diff(keep) > 0)
+        assert _max_linear_error(x, y, keep) <= tol
+    assert len(importer.rdp_indices(x, y, 1e-1)) < len(importer.rdp_indices(x, y, 1e-3)) < len(x) / 4
+
+def test_rdp_collapses_constant_and_keeps_lines_minimal(importer):
+    x = np.arange(100)
+    assert importer.rdp_indices(x, np.full(100, 28.125), 1e-6).tolist() == [0]
+    assert importer.rdp_indices(x, 3.0 * x + 1.0, 1e-9).tolist() == [0, 99]
+    assert importer.rdp_indices(x[:2], [0.0, 1.0], 0.0).tolist() == [0, 1]
+
+def test_reduce_camera_keys_per_group(importer):
+    n = 500
+    frame = np.arange(n)
+    poses = {
+        "frame": frame,
+        "pos": np.column_stack([0.5 * frame, np.zeros(n), 10.0 * np.sin(0.02 * frame)]),
+        "hpb": np.column_stack([np.linspace(0, 4 * math.pi, n), np.zeros(n), np.zeros(n)]),
+        "focal": np.full(n, 35.0),
+    }
+    keep = importer.reduce_camera_keys(poses, 0.01, math.radians(0.05), 0.01)
+    assert keep["focal"].tolist() == [0]
+    assert keep["hpb"].tolist() == [0, n - 1]
+    assert 2 < len(keep["pos"]) < n
+    assert _max_linear_error(frame, poses["pos"], keep["pos"]) <= 0.01
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Point colours: packed uint8 from the parsers, one bulk Vertex Color write, tiles, previs effector.
+# MIT
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+OPTS = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": True, "cache": False, "point_filter": None,
+        "sor": None, "decimate": None, "reduce": None, "colors": True}
+
+def _tag_rgba(obj, importer):
+    tag = obj.GetTag(importer.c4d.Tvertexcolor)
+    return np.frombuffer(bytes(tag.GetLowlevelDataAddressR()), np.float32).reshape(-1, 4)
+
+def test_colours_follow_the_points(importer, synthetic, tmp_path):
+    m = synthetic.write_scene(str(tmp_path), fmt="txt", n_images=10, n_points=800, obs_per_image=100)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    pts = importer.load_sparse_model(sparse, fmt)[2]
+    assert pts["rgb"].dtype == np.uint8 and np.array_equal(pts["rgb"], m["rgb"])
+
+    doc = importer.c4d.documents.BaseDocument()
+    importer.build_scene(doc, importer.prepare_import(sparse, fmt, OPTS), OPTS)
+    cloud = doc.SearchObject("GLoMap_SparseCloud")
+    rgba = _tag_rgba(cloud, importer)
+    assert cloud.GetTag(importer.c4d.Tvertexcolor).IsPerPointColor()
+    assert np.allclose(rgba[:, :3] * 255.0, m["rgb"], atol=1e-3) and (rgba[:, 3] == 1.0).all()
+    effectors = doc.SearchObject("SparceCloud_Matrix_Previs")[importer.c4d.ID_MG_MOTIONGENERATOR_EFFECTORLIST]
+    eff = effectors.ObjectFromIndex(doc, 0)
+    assert eff.GetName() == "SparceCloud_Color_Effector"
+    assert eff[importer.c4d.OEPYTHON_MODE] == importer.c4d.OEPYTHON_MODE_FULL and eff[importer.c4d.ID_MG_BASEEFFECTOR_COLOR_ENABLE]
+
+    opts = dict(OPTS, tiles={"max_points": 100, "mode": "octree", "near": 0.0}, colors=True)
+    doc = importer.c4d.documents.BaseDocument()
+    importer.build_scene(doc, importer.prepare_import(sparse, fmt, opts), opts)
+    tiles = doc.SearchObject("GLoMap_SparseCloud").GetChildren()
+    got = np.vstack([_tag_rgba(t, importer)[:, :3] for t in tiles])
+    pos = np.array([[p.x + t.GetRelPos().x, p.y + t.GetRelPos().y, p.z + t.GetRelPos().z] for t in tiles for p in t.GetAllPoints()])
+    ref = {tuple(np.round(x * (100.0, -100.0, 100.0), 3)): c for x, c in zip(m["xyz"], m["rgb"].tolist())}
+    assert [ref[tuple(np.round(p, 3))] for p in pos] == np.rint(got * 255.0).astype(int).tolist()
+
+def test_per_point_fallback_and_opt_out(importer, monkeypatch):
+    c4d = importer.c4d
+    rgb = np.random.default_rng(0).integers(0, 256, (50, 3)).astype(np.uint8)
+    cloud = lambda: importer.import_point_cloud(c4d.documents.BaseDocument(), np.zeros((50, 3)))
+    fast = bytes(importer.add_vertex_colors(cloud(), rgb).GetDataAddressR())
+    monkeypatch.delattr(c4d.VertexColorTag, "GetLowlevelDataAddressW")  # builds without the low-level buffer
+    assert bytes(importer.add_vertex_colors(cloud(), rgb).GetDataAddressR()) == fast
+
+    levels, colors = importer._point_levels({"xyz": np.ones((5, 3)), "rgb": rgb[:5]}, dict(OPTS, colors=False))
+    assert colors == [None] and importer._point_levels({"xyz": np.ones((5, 3)), "rgb": rgb[:5]}, OPTS)[1][0] is not None
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Voxel-grid decimation: one point per occupied cell, budget search, LOD chain.
+# MIT
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def _cloud(n, seed=0):
+    rnd = np.random.default_rng(seed)
+    return {
+        "xyz": rnd.uniform(0.0, 10.0, (n, 3)),
+        "rgb": rnd.integers(0, 256, (n, 3)).astype(np.uint8),
+        "error": rnd.uniform(0.0, 2.0, n),
+        "id": np.arange(1, n + 1, dtype=np.uint64),
+    }
+
+def test_centroid_mode_averages_each_cell(importer):
+    pts = {"xyz": np.array([[0.1, 0.1, 0.1], [0.3, 0.5, 0.7], [1.5, 0.2, 0.2], [1.7, 0.4, 0.2]]),
+           "rgb": np.array([[0, 0, 0], [255, 255, 255], [10, 20, 30], [30, 40, 50]], dtype=np.uint8)}
+    out = importer.voxel_decimate(pts, 1.0, importer.DECIMATE_CENTROID)
+    order = np.argsort(out["xyz"][:, 0])
+    assert np.allclose(out["xyz"][order], [[0.2, 0.3, 0.4], [1.6, 0.3, 0.2]])
+    assert out["rgb"][order].tolist() == [[128, 128, 128], [20, 30, 40]]
+    assert out["rgb"].dtype == np.uint8
+
+def test_best_mode_keeps_lowest_error_record(importer):
+    pts = _cloud(20000)
+    out = importer.voxel_decimate(pts, 2.0, importer.DECIMATE_BEST)
+    assert set(out) == set(pts)
+    cells = np.floor((pts["xyz"] - pts["xyz"].min(axis=0)) / 2.0).astype(int).tolist()
+    best = {}
+    for c, e, i in zip(map(tuple, cells), pts["error"].tolist(), pts["id"].tolist()):
+        if c not in best or e < best[c][0]: best[c] = (e, i)
+    assert sorted(out["id"].tolist()) == sorted(i for _, i in best.values())
+
+def test_budget_and_lods(importer):
+    pts = _cloud(50000, seed=1)
+    levels = importer.decimate_points(pts, budget=5000, lods=3)
+    counts = [len(l["xyz"]) for l in levels]
+    assert 0.9 * 5000 <= counts[0] <= 5000
+    assert counts[0] > counts[1] > counts[2] >= 1
+    assert importer.decimate_points(pts, budget=10 ** 6)[0] is pts
+
+@pytest.mark.parametrize("colors", [False, True])
+def test_lowest_error_without_colours(importer, colors):
+    # one voxel: the kept point is the lowest-error one whether or not colours are imported
+    pts = {"xyz": np.array([[0.0, 0.0, 0.0], [0.1, 0.1, 0.1], [0.2, 0.2, 0.2]]),  # the centroid rule keeps the middle one
+           "rgb": np.zeros((3, 3), np.uint8), "error": np.array([0.1, 0.5, 0.9])}
+    opts = {"scale": 1.0, "colors": colors, "decimate": {"voxel": 1.0, "mode": importer.DECIMATE_BEST}}
+    levels, rgb = importer._point_levels(pts, opts)
+    assert levels[0].tolist() == [[0.0, 0.0, 0.0]] and (rgb[0] is not None) == colors
+
+def test_txt_points_carry_errors_for_lowest_error_mode(importer, synthetic, tmp_path):
+    m = synthetic.write_model(str(tmp_path), n_images=10, n_points=500, obs_per_image=50, fmt="txt")
+    pts = importer.load_sparse_model(str(tmp_path), "txt")[2]
+    assert np.allclose(pts["error"], m["error"])
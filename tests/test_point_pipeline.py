@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# Point pipeline: fused in-place scale + Y flip, chunked feed into the point object.
+# MIT
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def test_fused_transform_matches_axis_matrix(importer):
+    xyz = np.random.default_rng(0).uniform(-10, 10, (1000, 3))
+    ref = [importer.apply_B_to_vec(importer.c4d.Vector(*(p * 2.5)), importer.B_WORLD) for p in xyz]
+    out = importer.scale_flip_points(xyz, 2.5)
+    assert out is xyz  # in place
+    assert np.allclose(out, [(v.x, v.y, v.z) for v in ref])
+    ro = np.array(xyz); ro.setflags(write=False)
+    assert importer.scale_flip_points(ro, 1.0) is not ro
+
+def test_chunked_feed_matches_list(importer, monkeypatch):
+    monkeypatch.setattr(importer, "_POINT_CHUNK", 64)
+    xyz = np.random.default_rng(1).normal(size=(1000, 3))
+    doc = importer.c4d.documents.BaseDocument()
+    chunked = importer.import_point_cloud(doc, xyz)
+    listed = importer.import_point_cloud(doc, [tuple(p) for p in xyz.tolist()], name="list")
+    assert chunked.GetPointCount() == listed.GetPointCount() == 1000
+    got = np.array([(v.x, v.y, v.z) for v in chunked.GetAllPoints()])
+    assert np.array_equal(got, xyz)
+    assert np.array_equal(got, [(v.x, v.y, v.z) for v in listed.GetAllPoints()])
+    assert importer.import_point_cloud(doc, np.empty((0, 3))) is None
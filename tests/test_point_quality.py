@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Quality filtering: thresholds applied while parsing (TXT, BIN, legacy) and grid k-NN outlier removal.
+# MIT
+
+import struct
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def _points(n, seed=0):
+    rnd = np.random.default_rng(seed)
+    xyz = rnd.uniform(-5.0, 5.0, (n, 3))
+    err = rnd.uniform(0.0, 3.0, n)
+    track = [[(int(rnd.integers(1, 50)), int(rnd.integers(0, 999))) for _ in range(int(t))]
+             for t in rnd.integers(2, 9, n)]
+    return xyz, err, track
+
+def _write_txt(path, xyz, err, track):
+    with open(path, "w") as f:
+        f.write("# 3D point list\n")
+        for i, (p, e, tr) in enumerate(zip(xyz.tolist(), err.tolist(), track)):
+            f.write(f"{i + 1} {p[0]!r} {p[1]!r} {p[2]!r} 10 20 30 {e!r} " + " ".join(f"{a} {b}" for a, b in tr) + "\n")
+
+def _write_bin(path, xyz, err, track):
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(xyz)))
+        for i, (p, e, tr) in enumerate(zip(xyz.tolist(), err.tolist(), track)):
+            f.write(struct.pack("<Q3d3BdQ", i + 1, *p, 10, 20, 30, e, len(tr)))
+            f.write(b"".join(struct.pack("<ii", a, b) for a, b in tr))
+
+def test_thresholds_while_parsing(importer, tmp_path):
+    xyz, err, track = _points(3000)
+    tl = np.array([len(t) for t in track])
+    txt, bin_ = tmp_path / "points3D.txt", tmp_path / "points3D.bin"
+    _write_txt(txt, xyz, err, track); _write_bin(bin_, xyz, err, track)
+    want = (err <= 1.5) & (tl >= 4)
+
+    packed = importer.parse_points3D_txt_packed(str(txt), with_error=True, with_track_len=True, max_error=1.5, min_track_len=4)
+    assert np.array_equal(packed["xyz"], xyz[want])
+    assert np.array_equal(packed["track_len"], tl[want])
+    assert np.array_equal(packed["error"], err[want])
+
+    binary = importer.read_points3D_bin(str(bin_), max_error=1.5, min_track_len=4)
+    assert np.array_equal(binary["xyz"], xyz[want])
+    assert np.array_equal(binary["id"], np.flatnonzero(want) + 1)
+
+    legacy = importer.parse_points3D_txt(str(txt), max_error=1.5, min_track_len=4)
+    assert np.array_equal(np.array(legacy), xyz[want])
+
+    assert np.array_equal(importer.parse_points3D_txt_packed(str(txt), with_track_len=True)["track_len"], tl)
+
+def test_knn_mean_distance_is_exact(importer):
+    rnd = np.random.default_rng(1)
+    xyz = np.concatenate([rnd.normal(0.0, 1.0, (3000, 3)), rnd.uniform(-30.0, 30.0, (40, 3)),
+                          np.column_stack([rnd.uniform(-8, 8, 2000), rnd.normal(0, 0.01, 2000), rnd.uniform(-8, 8, 2000)])])
+    d = importer.knn_mean_distance(xyz, 6)
+    full = np.sqrt(((xyz[:, None, :] - xyz[None, :, :]) ** 2).sum(axis=2))
+    np.fill_diagonal(full, np.inf)
+    assert np.allclose(d, np.sort(full, axis=1)[:, :6].mean(axis=1), rtol=0, atol=1e-12)
+
+def test_statistical_outlier_mask_drops_floaters(importer):
+    rnd = np.random.default_rng(2)
+    xyz = np.concatenate([rnd.normal(0.0, 1.0, (5000, 3)), rnd.uniform(20.0, 60.0, (25, 3))])
+    keep = importer.statistical_outlier_mask(xyz, k=8, std_ratio=2.0)
+    assert not keep[5000:].any()
+    assert keep[:5000].mean() > 0.97
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Spatial tiling: bounded tiles covering every point once, tight bounds, previs on tiles near the camera.
+# MIT
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def _clustered(n, seed=0):
+    rnd = np.random.default_rng(seed)
+    dense = rnd.normal(0.0, 0.2, (n // 2, 3))  # skewed: half the points in one small blob
+    return np.vstack([dense, rnd.uniform(-10.0, 10.0, (n - len(dense), 3))])
+
+@pytest.mark.parametrize("mode", ["octree", "grid"])
+def test_tiles_are_bounded_and_cover_the_cloud(importer, mode):
+    xyz = np.vstack([_clustered(40000), np.zeros((3000, 3))])  # plus duplicates beyond the octree depth cap
+    order, starts = importer.tile_points(xyz, 2000, mode)
+    sizes = np.diff(starts)
+    assert sizes.sum() == len(xyz) and sizes.max() <= 2000 and sizes.min() > 0
+    assert np.array_equal(np.sort(order), np.arange(len(xyz)))
+
+    tiles = importer.build_tiles(xyz, 2000, mode)
+    for k in range(len(sizes)):
+        chunk = tiles["xyz"][tiles["starts"][k]:tiles["starts"][k + 1]]
+        assert np.array_equal(chunk.min(axis=0), tiles["lo"][k]) and np.array_equal(chunk.max(axis=0), tiles["hi"][k])
+    if mode == "octree":  # leaves do not overlap, so tile volumes sum to less than the whole box
+        vol = np.prod(tiles["hi"] - tiles["lo"], axis=1).sum()
+        assert vol < np.prod(xyz.max(axis=0) - xyz.min(axis=0))
+    assert importer.tile_points(xyz[:100], 2000)[1].tolist() == [0, 100]
+
+def test_near_path_and_scene(importer, synthetic, tmp_path):
+    xyz = np.random.default_rng(1).uniform(0.0, 100.0, (20000, 3))
+    tiles = importer.mark_tiles_near_path(importer.build_tiles(xyz, 500), [(0.0, 0.0, 0.0), (10.0, 0.0, 0.0)], 5.0)
+    lo, hi = tiles["lo"], tiles["hi"]
+    expect = (lo[:, 0] <= 15.0) & (lo[:, 1] <= 5.0) & (lo[:, 2] <= 5.0)  # box within 5 of the segment's ends
+    assert 0 < tiles["near"].sum() < len(lo) and not (tiles["near"] & ~expect).any()
+
+    synthetic.write_scene(str(tmp_path), fmt="bin", n_images=20, n_points=3000, obs_per_image=200)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    opts = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": True, "cache": False, "point_filter": None,
+            "sor": None, "decimate": None, "reduce": None, "tiles": {"max_points": 400, "mode": "octree", "near": 0.0}}
+    doc = importer.c4d.documents.BaseDocument()
+    importer.build_scene(doc, importer.prepare_import(sparse, fmt, opts), opts)
+    group = doc.SearchObject("GLoMap_SparseCloud")
+    chunks = group.GetChildren()
+    assert len(chunks) > 1 and sum(c.GetPointCount() for c in chunks) == 3000
+    assert all(0 < c.GetPointCount() <= 400 for c in chunks)
+    assert len(doc.SearchObject("SparceCloud_Matrix_Previs").GetChildren()) == len(chunks)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Batched NumPy pose engine vs the scalar per-frame path
+# (colmap_to_c4d_matrix -> utils.MatrixToHPB -> _unwrap_hpb).
+# MIT
+
+import os, math, random
+import pytest
+
+np = pytest.importorskip("numpy")
+import c4d
+from c4d import utils
+
+# tests/stubs' MatrixToHPB uses the same formula as matrices_to_hpb: comparing the two needs real c4d
+STUB_C4D = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(c4d.__file__)))) == "stubs"
+
+def _random_quats(n, rnd):
+    q = [[rnd.gauss(0.0, 1.0) for _ in range(4)] for _ in range(n)]
+    q[0] = [0.0, 0.0, 0.0, 0.0]      # degenerate -> identity
+    q[1] = [2.0, 0.0, 0.0, 0.0]      # not normalized
+    return np.array(q)
+
+def _smooth_path(n, rnd):
+    """Quaternions of a camera that keeps spinning, so HPB crosses +/-pi many times."""
+    q = []
+    for i in range(n):
+        h, p, b = 0.21 * i, 0.6 * math.sin(0.05 * i), 0.13 * i + rnd.uniform(-0.01, 0.01)
+        m = utils.HPBToMatrix(c4d.Vector(h, p, b))
+        q.append(_matrix_to_quat(m))
+    return np.array(q)
+
+def _matrix_to_quat(m):
+    r = [[m.v1.x, m.v2.x, m.v3.x], [m.v1.y, m.v2.y, m.v3.y], [m.v1.z, m.v2.z, m.v3.z]]
+    w = math.sqrt(max(0.0, 1.0 + r[0][0] + r[1][1] + r[2][2])) / 2.0
+    x = math.copysign(math.sqrt(max(0.0, 1.0 + r[0][0] - r[1][1] - r[2][2])) / 2.0, r[2][1] - r[1][2])
+    y = math.copysign(math.sqrt(max(0.0, 1.0 - r[0][0] + r[1][1] - r[2][2])) / 2.0, r[0][2] - r[2][0])
+    z = math.copysign(math.sqrt(max(0.0, 1.0 - r[0][0] - r[1][1] + r[2][2])) / 2.0, r[1][0] - r[0][1])
+    return [w, x, y, z]
+
+def _as_rows(m):
+    return [[m.v1.x, m.v2.x, m.v3.x], [m.v1.y, m.v2.y, m.v3.y], [m.v1.z, m.v2.z, m.v3.z]], [m.off.x, m.off.y, m.off.z]
+
+def test_matrices_match_scalar_path(importer):
+    rnd = random.Random(1)
+    q = _random_quats(200, rnd)
+    t = np.array([[rnd.uniform(-20, 20) for _ in range(3)] for _ in range(len(q))])
+    rot, pos = importer.colmap_to_c4d_arrays(q, t)
+    for i in range(len(q)):
+        R, off = _as_rows(importer.colmap_to_c4d_matrix(*q[i].tolist(), *t[i].tolist()))
+        assert np.allclose(rot[i], R, rtol=0, atol=1e-12)
+        assert np.allclose(pos[i], off, rtol=0, atol=1e-10)
+
+@pytest.mark.skipif(STUB_C4D, reason="stub MatrixToHPB mirrors matrices_to_hpb; needs c4dpy")
+def test_unwrapped_hpb_matches_scalar_path(importer):
+    rnd = random.Random(2)
+    q = _smooth_path(400, rnd)
+    t = np.zeros((len(q), 3))
+    rot, _ = importer.colmap_to_c4d_arrays(q, t)
+    hpb = importer.unwrap_angles(importer.matrices_to_hpb(rot))
+
+    prev = None
+    for i in range(len(q)):
+        mg = importer.colmap_to_c4d_matrix(*q[i].tolist(), 0.0, 0.0, 0.0)
+        cur, prev = importer._unwrap_hpb(prev, utils.MatrixToHPB(mg, c4d.ROTATIONORDER_DEFAULT))
+        assert np.allclose(hpb[i], [cur.x, cur.y, cur.z], rtol=0, atol=1e-9)
+    assert np.abs(np.diff(importer.matrices_to_hpb(rot), axis=0)).max() > math.pi  # raw angles wrap...
+    assert np.abs(np.diff(hpb, axis=0)).max() <= math.pi                          # ...unwrapped ones don't
+
+def test_unwrap_angles_matches_chained_scalar(importer):
+    """unwrap_angles == _unwrap_angle chained frame by frame, on raw HPB with +/-pi wraps (no MatrixToHPB needed)."""
+    rnd = np.random.default_rng(4)
+    cont = np.cumsum(rnd.uniform(-2.5, 2.5, (500, 3)), axis=0)  # steps up to 2.5 rad: raw values wrap often
+    raw = (cont + math.pi) % (2.0 * math.pi) - math.pi
+    raw[10] = (math.pi, -math.pi, math.pi)      # exactly on the wrap
+    raw[11] = (-math.pi, math.pi, 0.0)
+    hpb = importer.unwrap_angles(raw)
+    prev = [None, None, None]
+    for i, row in enumerate(raw.tolist()):
+        prev = [importer._unwrap_angle(p, c) for p, c in zip(prev, row)]
+        assert np.allclose(hpb[i], prev, rtol=0, atol=1e-9)
+    assert np.abs(np.diff(raw, axis=0)).max() > math.pi and np.abs(np.diff(hpb, axis=0)).max() <= math.pi
+
+@pytest.mark.parametrize("hpb", [(0.3, -0.4, 1.2), (math.pi, 0.2, -math.pi), (-math.pi, -0.7, math.pi / 2),
+                                 (0.5, math.pi / 2, 0.25), (-1.0, -math.pi / 2, 2.0), (2.5, 1.4, -3.0)])
+def test_hpb_rebuilds_the_matrix(importer, hpb):
+    """matrices_to_hpb inverts HPBToMatrix (Y, then X, then Z), gimbal lock and +/-pi included."""
+    m = utils.HPBToMatrix(c4d.Vector(*hpb), c4d.ROTATIONORDER_DEFAULT)
+    R, _ = _as_rows(m)
+    h, p, b = importer.matrices_to_hpb(np.array([R]))[0].tolist()
+    R2, _ = _as_rows(utils.HPBToMatrix(c4d.Vector(h, p, b), c4d.ROTATIONORDER_DEFAULT))
+    assert np.allclose(R2, R, rtol=0, atol=1e-9) and abs(p - hpb[1]) < 1e-9
+
+def test_compute_camera_poses_drops_unknown_cameras(importer):
+    rnd = random.Random(3)
+    q = _random_quats(6, rnd)
+    imgs = {
+        "image_id": np.arange(1, 7), "q": q, "t": np.ones((6, 3)),
+        "camera_id": np.array([1, 1, 2, 9, 1, 2]), "name": [f"{i}.jpg" for i in range(6)],
+    }
+    cams = {
+        1: {"model": "PINHOLE", "width": 1920.0, "height": 1080.0, "params": [1500.0, 1500.0, 960.0, 540.0]},
+        2: {"model": "SIMPLE_RADIAL", "width": 1920.0, "height": 1080.0, "params": [960.0, 960.0, 540.0, 0.01]},
+    }
+    poses = importer.compute_camera_poses(imgs, cams, 36.0, 100.0)
+    assert poses["frame"].tolist() == [0, 1, 2, 4, 5]
+    assert np.allclose(poses["focal"], [28.125, 28.125, 18.0, 28.125, 18.0])
+    _, off = _as_rows(importer.colmap_to_c4d_matrix(*q[4].tolist(), 100.0, 100.0, 100.0))
+    assert np.allclose(poses["pos"][3], off)
+
+def test_stub_hpb_round_trip():
+    rnd = random.Random(4)
+    for _ in range(100):
+        hpb = c4d.Vector(rnd.uniform(-3, 3), rnd.uniform(-1.5, 1.5), rnd.uniform(-3, 3))
+        back = utils.MatrixToHPB(utils.HPBToMatrix(hpb))
+        assert abs(back.x - hpb.x) < 1e-9 and abs(back.y - hpb.y) < 1e-9 and abs(back.z - hpb.z) < 1e-9
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Resolved-ID registry: scanned IDs kept per Cinema 4D / Redshift build, validated cheaply, rescanned on failure.
+# MIT
+
+import json
+import pytest
+
+@pytest.fixture
+def registry(importer, tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "cache_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(importer, "_resolved_ids", {})
+    monkeypatch.setattr(importer, "_resolved_for", None)
+    return tmp_path / importer.RESOLVED_IDS_FILE
+
+def _new_session(importer, monkeypatch):
+    monkeypatch.setattr(importer, "_resolved_for", None)
+
+def test_rs_camera_id_stored_and_validated(importer, registry, monkeypatch):
+    plugins = importer.c4d.plugins
+    assert importer.find_rs_camera_object_id() == 1057516
+    key = importer.build_key()
+    assert key.startswith("c4d 2024400 ") and json.load(open(registry))[key] == {"rs_camera": 1057516}
+
+    # next session: FindPlugin confirms the stored ID, no plugin list scan
+    _new_session(importer, monkeypatch)
+    scan = plugins.FilterPluginList
+    monkeypatch.setattr(plugins, "FilterPluginList", lambda *a: pytest.fail("stored ID rescanned"))
+    assert importer.find_rs_camera_object_id() == 1057516
+    monkeypatch.setattr(plugins, "FilterPluginList", scan)
+
+    # the plugin moved: the stored ID fails validation, the rescan result replaces it
+    monkeypatch.setattr(plugins, "REGISTERED", [plugins.BasePlugin(1099999, "Redshift Camera", importer.c4d.PLUGINTYPE_OBJECT)])
+    assert importer.find_rs_camera_object_id() == 1099999
+    assert json.load(open(registry))[key] == {"rs_camera": 1099999}
+
+    # another build keeps its own entry
+    monkeypatch.setattr(importer.c4d, "GetC4DVersion", lambda: 2025000)
+    assert importer.resolved_ids() == {}
+    assert importer.find_rs_camera_object_id() == 1099999 and sorted(json.load(open(registry))) == sorted([key, importer.build_key()])
+
+def test_matrix_vertex_and_constraint(importer, registry, monkeypatch):
+    c4d, scans = importer.c4d, []
+    monkeypatch.setattr(importer, "_scan_matrix_vertex", lambda mtx: scans.append(mtx) or 3)
+    doc = c4d.documents.BaseDocument()
+    cloud = c4d.PolygonObject(1, 0)
+    for _ in range(2):
+        mtx = importer.add_matrix_on_sparse_vertices(doc, cloud)
+    assert len(scans) == 1 and mtx[c4d.DescID(c4d.DescLevel(1100, c4d.DTYPE_LONG, 1018571))] == 3
+
+    src, dup = c4d.BaseObject(c4d.Ocamera), c4d.BaseObject(c4d.Ocamera)
+    importer.setup_constraint_follow(dup, src)
+    assert importer.resolved_ids() == {"matrix_vertex": 3, "constraint": {"mode": "transform", "weight": 1.0}}
+    _new_session(importer, monkeypatch)
+    monkeypatch.setattr(importer, "_scan_constraint_family", lambda tag: pytest.fail("stored family rescanned"))
+    tag = importer.setup_constraint_follow(dup, src)
+    assert tag[importer._desc(importer.ID_TARGET_LINK_B)] is src
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Per-frame solve quality: observation / track statistics per image, pose jumps, User Data tracks on the camera.
+# MIT
+
+import copy
+import pytest
+
+np = pytest.importorskip("numpy")
+
+OPTS = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": True, "cache": False, "point_filter": None,
+        "sor": None, "decimate": None, "reduce": None, "quality": True}
+
+@pytest.mark.parametrize("fmt", ["bin", "txt"])
+def test_image_statistics(importer, synthetic, tmp_path, fmt):
+    m = synthetic.write_model(str(tmp_path), n_images=30, n_points=2000, obs_per_image=200, fmt=fmt)
+    _, imgs, pts = importer.load_sparse_model(str(tmp_path), fmt, with_tracks=True)
+    assert imgs["points2d"].tolist() == np.diff(m["kp_start"]).tolist()
+
+    stats = importer.image_statistics(imgs, pts["track_len"], pts["track_image"], pts["error"])
+    frame = m["track_img"] - 1
+    tri = np.bincount(frame, minlength=30)
+    err = np.bincount(frame, weights=np.repeat(m["error"], np.diff(m["track_start"])), minlength=30) / tri
+    assert stats["triangulated"].tolist() == tri.tolist() and np.allclose(stats["error"], err)
+
+def test_pose_jump_and_worst_frames(importer):
+    pos = np.stack([np.arange(10.0), np.zeros(10), np.zeros(10)], axis=1)
+    pos[6, 1] = 4.0
+    jump = importer.pose_jump(pos)
+    assert jump[6] == 4.0 and jump[5] == jump[7] == 2.0 and jump[0] == jump[1] == 0.0
+
+    quality = {"frame": np.arange(10), "observed": np.full(10, 100.0), "triangulated": np.full(10, 60.0),
+               "error": np.full(10, 0.5), "jump": jump, "pos": pos}
+    quality["triangulated"][2] = 12.0
+    worst = importer.worst_frames(quality, 2)
+    assert [w["frame"] for w in worst] == [2, 6] and worst[0]["triangulated"] == 12.0
+
+def test_channels_baked_on_animated_camera(importer, synthetic, tmp_path):
+    c4d = importer.c4d
+    synthetic.write_scene(str(tmp_path), fmt="bin", n_images=20, n_points=1500, obs_per_image=150)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    prep = importer.prepare_import(sparse, fmt, OPTS)
+    quality = prep["quality"]
+    assert quality["frame"].tolist() == list(range(20)) and quality["observed"].dtype == np.float32
+
+    doc = c4d.documents.BaseDocument()
+    summary = importer.build_scene(doc, copy.deepcopy(prep), OPTS)
+    assert len(summary["quality_worst"]) == importer.QUALITY_WORST
+    cam = doc.SearchObject("RS_GLoMap_Animated_Camera")
+    user = cam.GetUserDataContainer()
+    assert [bc[c4d.DESC_NAME] for _, bc in user] == [label for _, label in importer.QUALITY_CHANNELS]
+    assert not doc.SearchObject("RS_GLoMap_Render_Camera").GetUserDataContainer()
+    for (key, _), (did, _) in zip(importer.QUALITY_CHANNELS, user):
+        curve = cam.FindCTrack(did).GetCurve()
+        assert curve.GetKeyCount() == 20 and curve.GetKey(7).GetValue() == pytest.approx(float(quality[key][7]))
+
+    # an update rewrites the channels on the same User Data entries
+    prep["quality"]["error"][:] = 9.0
+    importer.build_scene(doc, prep, dict(OPTS, update=True))
+    assert len(cam.GetUserDataContainer()) == 4
+    assert cam.FindCTrack(user[2][0]).GetCurve().GetKey(3).GetValue() == 9.0
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Lens ST-maps: distortion models round-trip, EXR / raw layout, maps cached by intrinsics hash.
+# MIT
+
+import os, json, struct
+import pytest
+
+np = pytest.importorskip("numpy")
+
+CAMERAS = {
+    "SIMPLE_RADIAL":  [400.0, 160.0, 90.0, -0.08],
+    "OPENCV":         [400.0, 395.0, 160.0, 90.0, -0.12, 0.05, 1e-3, -5e-4],
+    "FULL_OPENCV":    [400.0, 395.0, 160.0, 90.0, -0.12, 0.05, 1e-3, -5e-4, 0.01, 0.02, 3e-3, 1e-3],
+    "OPENCV_FISHEYE": [250.0, 250.0, 160.0, 90.0, 0.05, -0.01, 2e-3, -3e-4],
+}
+
+def _cam(model):
+    return {"model": model, "width": 320, "height": 180, "params": CAMERAS[model]}
+
+def _read_exr(path):
+    """Minimal reader for the uncompressed float scanline files write_exr produces."""
+    data = open(path, "rb").read()
+    assert struct.unpack("<ii", data[:8]) == (20000630, 2)
+    pos, attrs = 8, {}
+    while data[pos] != 0:
+        name, kind, rest = data[pos:].split(b"\0", 2)
+        size = struct.unpack("<i", rest[:4])[0]
+        pos += len(name) + len(kind) + 6
+        attrs[name.decode()] = data[pos:pos + size]
+        pos += size
+    x0, y0, x1, y1 = struct.unpack("<4i", attrs["dataWindow"])
+    chlist, names = attrs["channels"], []
+    while chlist[0] != 0:
+        name, chlist = chlist.split(b"\0", 1)
+        assert struct.unpack("<i", chlist[:4])[0] == 2  # FLOAT
+        names.append(name.decode())
+        chlist = chlist[16:]
+    w, h = x1 - x0 + 1, y1 - y0 + 1
+    offsets = np.frombuffer(data, "<u8", h, pos + 1)
+    lines = np.frombuffer(data, [("y", "<i4"), ("size", "<i4"), ("data", "<f4", (len(names), w))], h, int(offsets[0]))
+    assert lines["y"].tolist() == list(range(h)) and attrs["compression"] == b"\0"
+    return {n: lines["data"][:, c] for c, n in enumerate(names)}
+
+@pytest.mark.parametrize("model", sorted(CAMERAS))
+def test_undistort_inverts_distort(importer, model):
+    lens = importer.lens_from_camera(_cam(model))
+    x, y = np.meshgrid(np.linspace(-0.4, 0.4, 41), np.linspace(-0.22, 0.22, 23))
+    xd, yd = importer.distort_points(x, y, lens)
+    assert np.abs(xd - x).max() > 1e-3  # the lens actually distorts
+    ux, uy = importer.undistort_points(xd, yd, lens)
+    assert np.abs(ux - x).max() < 1e-9 and np.abs(uy - y).max() < 1e-9
+
+    und, red = importer.stmap(lens, 320, 180, "undistort"), importer.stmap(lens, 320, 180, "redistort")
+    assert und.shape == red.shape == (180, 320, 2) and und.dtype == np.float32
+    # redistort map: undistorted pixel of each plate pixel; distorting it lands back on the pixel centre
+    px, py = red[..., 0] * 320, (1.0 - red[..., 1]) * 180
+    bx, by = importer.distort_points((px - lens["cx"]) / lens["fx"], (py - lens["cy"]) / lens["fy"], lens)
+    assert np.abs(bx * lens["fx"] + lens["cx"] - (np.arange(320) + 0.5)).max() < 2e-3
+    assert np.abs(by * lens["fy"] + lens["cy"] - (np.arange(180) + 0.5)[:, None]).max() < 2e-3
+
+def test_files_index_and_cache(importer, synthetic, tmp_path, monkeypatch):
+    cams = {1: _cam("OPENCV"), 2: _cam("OPENCV_FISHEYE"), 3: {"model": "PINHOLE", "width": 320, "height": 180,
+                                                              "params": [400.0, 400.0, 160.0, 90.0]}}
+    out = str(tmp_path / "stmaps")
+    index = importer.write_stmaps(cams, out)
+    assert sorted(index) == [1, 2] and index[1]["hash"] != index[2]["hash"]
+    exr = _read_exr(index[1]["undistort"])
+    ref = importer.stmap(importer.lens_from_camera(cams[1]), 320, 180)
+    assert sorted(exr) == ["G", "R"] and np.array_equal(exr["R"], ref[..., 0]) and np.array_equal(exr["G"], ref[..., 1])
+    assert json.load(open(os.path.join(out, importer.STMAP_INDEX)))["2"]["model"] == "OPENCV_FISHEYE"
+
+    raw = importer.write_stmaps(cams, out, "raw", camera_ids=[1])[1]["redistort"]
+    shape = json.load(open(raw[:-4] + ".json"))
+    st = np.fromfile(raw, "<f4").reshape(shape["height"], shape["width"], 2)
+    assert np.array_equal(st, importer.stmap(importer.lens_from_camera(cams[1]), 320, 180, "redistort"))
+
+    monkeypatch.setattr(importer, "stmap", lambda *a: pytest.fail("cached map recomputed"))
+    assert importer.write_stmaps(cams, out) == index
+    cams[1] = dict(cams[1], params=cams[1]["params"][:4] + [-0.1, 0.05, 1e-3, -5e-4])  # new calibration, new files
+    with pytest.raises(pytest.fail.Exception):
+        importer.write_stmaps(cams, out)
+    monkeypatch.undo()
+
+    synthetic.write_scene(str(tmp_path), fmt="bin", n_images=5, n_points=100, obs_per_image=20)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    opts = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": False, "cache": False, "point_filter": None,
+            "sor": None, "decimate": None, "reduce": None, "stmaps": "exr"}
+    prep = importer.prepare_import(sparse, fmt, opts)
+    assert list(prep["stmaps"]) == [1] and os.path.dirname(prep["stmaps"][1]["undistort"]) == out
+
+def test_strong_distortion_reports_pixels_without_inverse(importer, tmp_path, monkeypatch):
+    cams = {1: {"model": "SIMPLE_RADIAL", "width": 320, "height": 180, "params": [240.0, 160.0, 90.0, -0.3]}}
+    lens = importer.lens_from_camera(cams[1])
+    # r (1 - 0.3 r^2) peaks at r^2 = 1 / 0.9: plate pixels past that distorted radius have no undistorted position
+    y, x = np.mgrid[0:180, 0:320] + 0.5
+    past = np.hypot(x - 160, y - 90) / 240 > np.sqrt(1 / 0.9) * (1 - 0.3 / 0.9)
+    info = {}
+    red = importer.stmap(lens, 320, 180, "redistort", info)
+    assert info["unresolved"] == np.count_nonzero(past) > 0
+    px, py = red[..., 0] * 320, (1.0 - red[..., 1]) * 180
+    bx, by = importer.distort_points((px - 160) / 240, (py - 90) / 240, lens)
+    assert np.abs(bx * 240 + 160 - x)[~past].max() < 2e-3 and np.abs(by * 240 + 90 - y)[~past].max() < 2e-3
+
+    index = importer.write_stmaps(cams, str(tmp_path))
+    monkeypatch.setattr(importer, "stmap", lambda *a: pytest.fail("cached map recomputed"))
+    assert index[1]["unresolved"] == importer.write_stmaps(cams, str(tmp_path))[1]["unresolved"] == info["unresolved"]
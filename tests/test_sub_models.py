@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Several sub-models under sparse/: header-only ranking, parallel prepare, one object group per model.
+# MIT
+
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+
+OPTS = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": True, "cache": False, "point_filter": None,
+        "sor": None, "decimate": None, "reduce": None}
+
+@pytest.fixture
+def scene(synthetic, tmp_path):
+    sparse = tmp_path / "sparse"
+    synthetic.write_model(str(sparse / "0"), n_images=10, n_points=400, obs_per_image=50, fmt="bin", seed=1)
+    synthetic.write_model(str(sparse / "1"), n_images=25, n_points=1500, obs_per_image=80, fmt="txt", seed=2)
+    synthetic.write_model(str(sparse / "2"), n_images=25, n_points=800, obs_per_image=80, fmt="bin", seed=3)
+    return str(tmp_path)
+
+def test_headers_rank_models(importer, scene):
+    ranked = importer.scan_sparse_models(scene)
+    assert [(m["id"], m["fmt"], m["images"], m["points"], m["cameras"]) for m in ranked] == [
+        ("1", "txt", 25, 1500, [1]), ("2", "bin", 25, 800, [1]), ("0", "bin", 10, 400, [1])]
+    assert importer.find_sparse_model(scene) == (os.path.join(scene, "sparse", "1"), "txt")
+
+    images = os.path.join(scene, "sparse", "1", "images.txt")  # no "# Number of images" comment: unknown, ranked last
+    lines = open(images).read().splitlines(True)
+    open(images, "w").write("".join(l for l in lines if not l.startswith("# Number")))
+    assert importer.scan_model_header(os.path.dirname(images), "txt")["images"] is None
+    assert [m["id"] for m in importer.scan_sparse_models(scene)] == ["2", "0", "1"]
+    assert [model for model, _ in importer.select_models(scene, "0,2")] == [os.path.join(scene, "sparse", n) for n in ("2", "0")]
+
+def test_all_models_import_side_by_side(importer, scene):
+    models = importer.select_models(scene, "all")
+    stats = importer.ImportStats(trace_memory=True)
+    with stats:
+        preps = importer.prepare_models(models, OPTS)
+    assert [(mid, prep["frames"]) for mid, prep in preps] == [("1", 25), ("2", 25), ("0", 10)]
+    # the per-thread stages carry no peak; the parallel block has the process-wide one
+    peaks = {r["name"]: r.get("peak_mb") for r in stats.stages}
+    assert peaks["models"] > 0.0 and peaks["parse"] is None
+
+    doc = importer.c4d.documents.BaseDocument()
+    summaries = importer.build_models(doc, preps, OPTS)
+    assert [s["model_id"] for s in summaries] == ["1", "2", "0"]
+    names = sorted(o.GetName() for o in doc.GetObjects())
+    assert names == sorted(n + sfx for n in importer.MODEL_TOP_OBJECTS for sfx in ("", "_2", "_0"))
+    cam0 = doc.SearchObject("RS_GLoMap_Animated_Camera_0")
+    assert cam0.FindCTrack(importer._id_pos_x()).GetCurve().GetKeyCount() == 10
+    assert doc.SearchObject("GLoMap_SparseCloud_2").GetPointCount() == 800
+    assert doc.GetMaxTime().GetFrame(24) == 25
+
+    # updating every model finds each one's own objects again
+    summaries = importer.build_models(doc, importer.prepare_models(models, OPTS), dict(OPTS, update=True))
+    assert all(s["updated"] and s["keys_written"] == 0 and s["points_written"] == 0 for s in summaries)
+    assert sorted(o.GetName() for o in doc.GetObjects()) == names
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Synthetic models end to end: TXT and BIN writers agree, tracks and POINTS2D cross-reference, and the
+# whole pipeline (prepare_import + build_scene, batch save) runs on the c4d stand-in.
+# MIT
+
+import json, os
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def _stub_only(importer):
+    if "stubs" not in os.path.abspath(getattr(importer.c4d, "__file__", "")):
+        pytest.skip("checks the c4d stand-in's document outline")
+
+def test_txt_and_bin_agree(importer, synthetic, tmp_path):
+    m = synthetic.write_model(str(tmp_path), n_images=30, n_points=2000, obs_per_image=200, seed=3)
+    p = lambda name: str(tmp_path / name)
+    assert importer.parse_cameras_txt(p("cameras.txt")) == importer.read_cameras_bin(p("cameras.bin"))
+    txt, binary = importer.parse_images_txt_packed(p("images.txt")), importer.read_images_bin(p("images.bin"))
+    assert np.array_equal(txt["q"], binary["q"]) and np.array_equal(txt["t"], binary["t"]) and txt["name"] == binary["name"]
+    pts_txt = importer.parse_points3D_txt_packed(p("points3D.txt"), with_rgb=True, with_error=True, with_track_len=True)
+    pts_bin = importer.read_points3D_bin(p("points3D.bin"))
+    for key in ("xyz", "rgb", "error", "track_len"):
+        assert np.array_equal(pts_txt[key], pts_bin[key])
+
+    # every track entry points at a POINTS2D slot that names the point back
+    owner = np.repeat(np.arange(1, len(m["xyz"]) + 1), np.diff(m["track_start"]))
+    assert np.array_equal(m["kp_pid"][m["kp_start"][m["track_img"] - 1] + m["track_idx"]], owner)
+    assert (np.diff(m["track_start"]) >= 2).all()
+
+def test_build_scene_on_stub(importer, synthetic, tmp_path):
+    synthetic.write_scene(str(tmp_path), fmt="bin", n_images=40, n_points=3000, obs_per_image=300)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    opts = {"sensor_mm": 36.0, "fps": 25, "scale": 100.0, "points": True, "cache": False, "point_filter": None,
+            "sor": None, "decimate": {"budget": 1000, "lods": 2}, "reduce": None}
+    doc = importer.c4d.documents.BaseDocument()
+    summary = importer.build_scene(doc, importer.prepare_import(sparse, fmt, opts), opts)
+    assert summary["frames"] == 40 and summary["keys_written"] == 7 * 40 and not summary["warnings"]
+    assert summary["resolution"] == "1920 x 1080" and summary["points_total"] == 3000
+
+    root = doc.SearchObject("GLoMap_Scene_Orient")
+    cam = doc.SearchObject("RS_GLoMap_Animated_Camera")
+    assert cam.GetUp() is root and doc.SearchObject("RS_GLoMap_Render_Camera").GetTags()
+    assert [tr.GetCurve().GetKeyCount() for tr in cam.GetCTracks()] == [40] * 7
+    assert doc.SearchObject("GLoMap_SparseCloud_LOD1").GetPointCount() <= doc.SearchObject("GLoMap_SparseCloud").GetPointCount()
+    assert doc.GetFps() == 25 and doc.GetActiveRenderData()[importer.c4d.RDATA_XRES] == 1920
+
+def test_batch_saves_each_shot(importer, synthetic, tmp_path):
+    _stub_only(importer)
+    for name in ("shot_a", "shot_b"):
+        synthetic.write_scene(str(tmp_path / name), fmt="txt", n_images=10, n_points=500, obs_per_image=80)
+    out = tmp_path / "out"
+    assert importer.batch_main([str(tmp_path / "shot_*"), "--out", str(out), "--jobs", "1", "--no-cache"]) == 0
+    report = json.loads((out / importer.BATCH_SUMMARY).read_text())
+    assert report["ok"] == 2 and [s["frames"] for s in report["shots"]] == [10, 10]
+    saved = json.loads((out / "shot_a.c4d").read_text())
+    assert [o["name"] for o in saved["objects"]] == ["GLoMap_Scene_Orient", "SparceCloud_Matrix_Previs", "RS_GLoMap_Render_Camera"]
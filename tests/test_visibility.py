@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Per-frame visible points: tracks decoded from BIN / TXT / cache, CSR index by frame, previs Python tag.
+# MIT
+
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+
+OPTS = {"sensor_mm": 36.0, "fps": 24, "scale": 100.0, "points": True, "cache": False, "point_filter": None,
+        "sor": None, "decimate": None, "reduce": None, "visibility": True}
+
+def _expected(m, keep):
+    """frame -> sorted ids (among the kept points) of the points whose track has that frame."""
+    owner = np.repeat(np.arange(len(m["xyz"])), np.diff(m["track_start"]))
+    new_id = np.cumsum(keep) - 1
+    sel = keep[owner]
+    frames = m["track_img"][sel] - 1
+    return {f: sorted(new_id[owner[sel][frames == f]].tolist()) for f in range(len(m["names"]))}
+
+@pytest.mark.parametrize("fmt", ["bin", "txt"])
+def test_tracks_index_by_frame(importer, synthetic, tmp_path, fmt):
+    m = synthetic.write_model(str(tmp_path), n_images=40, n_points=3000, obs_per_image=300, fmt=fmt)
+    _, imgs, pts = importer.load_sparse_model(str(tmp_path), fmt, point_filter={"max_error": 0.6}, with_tracks=True)
+    keep = m["error"] <= 0.6
+    assert len(pts["xyz"]) == keep.sum() and len(pts["track_image"]) == pts["track_len"].sum()
+
+    index = importer.visibility_index(pts["track_len"], pts["track_image"], imgs["image_id"])
+    assert index["offsets"].dtype == index["points"].dtype == np.int32
+    expect = _expected(m, keep)
+    off, ids = index["offsets"], index["points"]
+    assert all(ids[off[f]:off[f + 1]].tolist() == expect[f] for f in range(40))
+
+    # dropping points afterwards (outlier removal) renumbers the index like filter_points
+    sub = np.random.default_rng(0).random(len(pts["xyz"])) < 0.7
+    filtered = importer.filter_visibility(index, sub)
+    expect = _expected(m, keep & np.isin(np.arange(len(keep)), np.flatnonzero(keep)[sub]))
+    off, ids = filtered["offsets"], filtered["points"]
+    assert all(ids[off[f]:off[f + 1]].tolist() == expect[f] for f in range(40))
+
+def test_cache_keeps_one_entry_per_variant(importer, synthetic, tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "cache_dir", lambda: str(tmp_path / "cache"))
+    synthetic.write_model(str(tmp_path), n_images=10, n_points=500, obs_per_image=50, fmt="bin")
+    for with_points, with_tracks in ((True, True), (False, False), (True, False)):
+        importer.load_sparse_model(str(tmp_path), "bin", with_points, use_cache=True, with_tracks=with_tracks)
+    # toggling points / visible points does not evict the other entries
+    monkeypatch.setattr(importer, "_parse_sparse_model", lambda *a, **k: pytest.fail("parsed again"))
+    _, _, pts = importer.load_sparse_model(str(tmp_path), "bin", True, use_cache=True, with_tracks=True)
+    assert len(pts["track_image"]) == pts["track_len"].sum()
+    assert importer.load_sparse_model(str(tmp_path), "bin", False, use_cache=True)[2] is None
+
+def test_previs_follows_the_timeline(importer, synthetic, tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "cache_dir", lambda: str(tmp_path / "cache"))
+    m = synthetic.write_scene(str(tmp_path), fmt="bin", n_images=30, n_points=2000, obs_per_image=200)
+    sparse, fmt = importer.find_sparse_model(str(tmp_path))
+    opts = dict(OPTS, cache=True)
+    prep = importer.prepare_import(sparse, fmt, opts)
+    path = prep["visibility"]["path"]
+    assert path == os.path.join(str(tmp_path), importer.VISIBILITY_DIR, "0.npz")
+    with np.load(path) as z:
+        offsets, points, xyz = z["offsets"], z["points"], z["xyz"]
+    assert xyz.dtype == np.float32 and np.allclose(xyz, m["xyz"] * (100.0, -100.0, 100.0), atol=1e-3)
+    # tracks come back from the cache with the same index
+    monkeypatch.setattr(importer, "_parse_sparse_model", lambda *a, **k: pytest.fail("parsed again"))
+    again = importer.prepare_import(sparse, fmt, opts)
+    assert again["visibility"] == prep["visibility"]
+    monkeypatch.undo()
+
+    doc = importer.c4d.documents.BaseDocument()
+    summary = importer.build_scene(doc, prep, opts)
+    assert summary["visible_mean"] == len(points) // 30
+    gen = doc.SearchObject("GLoMap_VisiblePoints")
+    assert gen.GetUp() is doc.SearchObject("GLoMap_Scene_Orient") and gen.GetType() == importer.c4d.Opython
+    assert importer.get_import_meta(gen) is None  # the path does not pose as an import stamp
+    code = compile(gen[importer.c4d.OPYTHON_CODE], "GLoMap_VisiblePoints", "exec")
+    scope = {"op": gen, "doc": doc}
+    exec(code, scope)
+    for frame in (7, 7, 29, 30):
+        doc.SetTime(importer.c4d.BaseTime(frame, 24))
+        obj = scope["main"]()
+        ids = points[offsets[frame]:offsets[frame + 1]] if frame < 30 else []
+        assert obj.GetPointCount() == len(ids)
+        if len(ids):
+            p = obj.GetPoint(len(ids) - 1)
+            assert np.allclose((p.x, p.y, p.z), xyz[ids[-1]])